@@ -0,0 +1,207 @@
+import os
+import re
+import time
+from itertools import combinations
+
+import pandas as pd
+from enrichment import BEVERAGE_SPEC, DISH_SPEC, Enricher, OllamaBackend, check_ollama_model_info, percentile
+from llm_cache import NullCache
+
+'''
+Benchmark several Ollama models on the same fill job.
+
+Runs the dish (or beverage) fill pipeline over the same sample once per model
+and compares throughput, latency, JSON-parse failures and how often the
+models agree on each filled field. Results go to ../data/model-comparison/:
+  - <entity>_filled_top<N>_<model>.csv   filled sample per model
+  - <entity>_metrics_top<N>.csv           one row of speed/quality metrics per model
+  - <entity>_agreement_top<N>.csv         per-field agreement for every model pair
+  - <entity>_report_top<N>.md             the same as a readable report
+The response cache is disabled so every model is actually timed.
+'''
+
+# === CONFIG ===
+OLLAMA_URL = os.environ.get("OLLAMA_URL", "http://localhost:11434")
+MODELS = os.environ.get("COMPARE_MODELS", "gemma3:12b,llama3:8b,mistral:7b").split(",")
+ENTITY = os.environ.get("COMPARE_ENTITY", "dish")  # "dish" or "beverage"
+INPUTS = {
+    "dish": (DISH_SPEC, "../data/dishes_extracols.csv"),
+    "beverage": (BEVERAGE_SPEC, "../data/beverages_enriched.csv"),
+}
+SAMPLE_SIZE = int(os.environ.get("COMPARE_SAMPLE_SIZE", "10"))  # Top N rows of the input
+SAMPLE_SEED = None  # Set to an int to draw a random sample instead of the top N rows
+OUTPUT_DIR = "../data/model-comparison"
+MAX_IN_FLIGHT = int(os.environ.get("OLLAMA_NUM_PARALLEL", "4"))
+BATCH_SIZE = int(os.environ.get("FILL_BATCH_SIZE", "1"))
+PROMPT_MODE = os.environ.get("FILL_PROMPT_MODE", "generate")
+STRUCTURED_OUTPUT = os.environ.get("FILL_STRUCTURED_OUTPUT", "0") == "1"
+NUMERIC_TOLERANCE = 0.10  # Numbers within 10% of each other count as agreeing
+
+
+def model_slug(model):
+    return re.sub(r"[^a-z0-9]+", "_", model.lower()).strip("_")
+
+
+def load_sample(input_path):
+    df = pd.read_csv(input_path)
+    if SAMPLE_SEED is not None:
+        return df.sample(n=min(SAMPLE_SIZE, len(df)), random_state=SAMPLE_SEED).reset_index(drop=True)
+    return df.head(SAMPLE_SIZE).reset_index(drop=True)
+
+
+def run_model(model, spec, sample):
+    """Fill a copy of the sample with one model and return (filled_df, metrics)."""
+    print(f"\n🚀 Running {model} on {len(sample)} {spec.plural}")
+    enricher = Enricher(
+        spec=spec,
+        backend=OllamaBackend(base_url=OLLAMA_URL, pool_size=MAX_IN_FLIGHT),
+        model=model,
+        cache=NullCache(),
+        max_in_flight=MAX_IN_FLIGHT,
+        batch_size=BATCH_SIZE,
+        prompt_mode=PROMPT_MODE,
+        structured=STRUCTURED_OUTPUT
+    )
+    start = time.perf_counter()
+    filled = enricher.fill_dataframe(sample.copy())
+    elapsed = time.perf_counter() - start
+    enricher.print_stats()
+
+    stats = enricher.stats
+    missing_before = int(missing_mask(spec, sample).values.sum())
+    missing_after = sum(len(enricher.missing_fields_of(row)) for _, row in filled.iterrows())
+    metrics = {
+        "model": model,
+        "rows": len(filled),
+        "wall_time_s": round(elapsed, 2),
+        "rows_per_s": round(len(filled) / elapsed, 3) if elapsed > 0 else 0.0,
+        "requests": stats["requests"],
+        "generated_tokens": stats["eval_count"],
+        "tokens_per_s": round(stats["eval_count"] / (stats["eval_duration"] / 1e9), 1) if stats["eval_duration"] else 0.0,
+        "prompt_tokens_per_row": round(stats["prompt_eval_count"] / len(filled), 1) if len(filled) else 0.0,
+        "latency_p50_ms": round(percentile(enricher.latencies, 50) * 1000) if enricher.latencies else None,
+        "latency_p95_ms": round(percentile(enricher.latencies, 95) * 1000) if enricher.latencies else None,
+        "latency_p99_ms": round(percentile(enricher.latencies, 99) * 1000) if enricher.latencies else None,
+        "parse_failures": stats["parse_failures"],
+        "parse_failure_rate": round(stats["parse_failures"] / stats["requests"], 3) if stats["requests"] else 0.0,
+        "fields_filled_rate": round(1 - missing_after / missing_before, 3) if missing_before else 1.0,
+    }
+    return filled, metrics
+
+
+def _as_number(value):
+    match = re.search(r"-?\d+(?:[.,]\d+)?", value)
+    return float(match.group().replace(",", ".")) if match else None
+
+
+def value_agreement(a, b):
+    """Score in [0, 1]: numeric closeness, or Jaccard overlap of the comma-separated terms."""
+    a, b = str(a).strip().lower(), str(b).strip().lower()
+    if not a or not b or a in ("nan", "<na>") or b in ("nan", "<na>"):
+        return None
+    num_a, num_b = _as_number(a), _as_number(b)
+    if num_a is not None and num_b is not None:
+        scale = max(abs(num_a), abs(num_b)) or 1.0
+        return 1.0 if abs(num_a - num_b) / scale <= NUMERIC_TOLERANCE else 0.0
+    terms_a = {t.strip() for t in a.split(",") if t.strip()}
+    terms_b = {t.strip() for t in b.split(",") if t.strip()}
+    return len(terms_a & terms_b) / len(terms_a | terms_b)
+
+
+def missing_mask(spec, sample):
+    """Boolean frame: True where a spec column is empty in the input sample."""
+    return pd.DataFrame({
+        col: (sample[col].isna() | (sample[col].astype(str).str.strip() == "")) if col in sample.columns
+        else pd.Series(True, index=sample.index)
+        for col in spec.columns
+    })
+
+
+def field_agreement(spec, sample, outputs):
+    """Mean agreement per (model pair, field), only over cells the models had to fill themselves."""
+    rows = []
+    was_missing = missing_mask(spec, sample)
+    for model_a, model_b in combinations(outputs, 2):
+        df_a, df_b = outputs[model_a], outputs[model_b]
+        for col in spec.columns:
+            scores = [value_agreement(df_a.at[idx, col], df_b.at[idx, col]) for idx in sample.index[was_missing[col]]]
+            scores = [s for s in scores if s is not None]
+            rows.append({
+                "model_a": model_a,
+                "model_b": model_b,
+                "field": col,
+                "compared": len(scores),
+                "agreement": round(sum(scores) / len(scores), 3) if scores else None,
+            })
+    return pd.DataFrame(rows)
+
+
+def markdown_table(df, index=False):
+    if index:
+        df = df.reset_index()
+    header = [str(c) for c in df.columns]
+    lines = ["| " + " | ".join(header) + " |", "|" + "|".join("---" for _ in header) + "|"]
+    for values in df.itertuples(index=False):
+        lines.append("| " + " | ".join("" if pd.isna(v) else str(v) for v in values) + " |")
+    return "\n".join(lines)
+
+
+def write_report(path, spec, metrics_df, agreement_df):
+    lines = [
+        f"# Model comparison: {spec.plural} (top {SAMPLE_SIZE})",
+        "",
+        f"Batch size {BATCH_SIZE}, prompt mode {PROMPT_MODE}, structured output {STRUCTURED_OUTPUT}, "
+        f"max in flight {MAX_IN_FLIGHT}. Response cache disabled.",
+        "",
+        "## Speed and parse quality",
+        "",
+        markdown_table(metrics_df),
+        "",
+    ]
+    if not agreement_df.empty:
+        pivot = agreement_df.assign(pair=agreement_df["model_a"] + " vs " + agreement_df["model_b"]) \
+            .pivot(index="field", columns="pair", values="agreement")
+        lines += [
+            "## Per-field agreement between models",
+            "",
+            "1.0 = same value (numbers within 10%, lists by term overlap). Only fields missing in the input are compared.",
+            "",
+            markdown_table(pivot.round(3), index=True),
+            "",
+            "Mean agreement per pair: " + ", ".join(
+                f"{pair} {score:.2f}" for pair, score in pivot.mean().items()
+            ),
+            "",
+        ]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+
+
+def main():
+    spec, input_path = INPUTS[ENTITY]
+    sample = load_sample(input_path)
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    tag = f"{spec.plural}_filled_top{len(sample)}"
+
+    outputs = {}
+    metrics = []
+    for model in MODELS:
+        check_ollama_model_info(model=model, base_url=OLLAMA_URL)
+        filled, model_metrics = run_model(model, spec, sample)
+        filled.to_csv(os.path.join(OUTPUT_DIR, f"{tag}_{model_slug(model)}.csv"), index=False)
+        outputs[model] = filled
+        metrics.append(model_metrics)
+
+    metrics_df = pd.DataFrame(metrics).sort_values("rows_per_s", ascending=False)
+    agreement_df = field_agreement(spec, sample, outputs)
+    metrics_df.to_csv(os.path.join(OUTPUT_DIR, f"{spec.plural}_metrics_top{len(sample)}.csv"), index=False)
+    agreement_df.to_csv(os.path.join(OUTPUT_DIR, f"{spec.plural}_agreement_top{len(sample)}.csv"), index=False)
+    report_path = os.path.join(OUTPUT_DIR, f"{spec.plural}_report_top{len(sample)}.md")
+    write_report(report_path, spec, metrics_df, agreement_df)
+
+    print(metrics_df.to_string(index=False))
+    print(f"📝 Report written to {report_path}")
+
+
+if __name__ == "__main__":
+    main()
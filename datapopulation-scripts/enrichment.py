@@ -0,0 +1,763 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+import json5
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from llm_cache import LLMCache
+from llm_schema import build_object_schema, build_array_schema, get_validator
+
+'''
+Shared LLM enrichment engine.
+
+Every script that asks Ollama to fill in or classify dishes and beverages goes
+through an Enricher: it owns the backend, the response cache, the checkpoint
+journal, bounded concurrency, batched prompts, the chat-mode system prefix and
+structured output. Which columns to fill and how to describe them lives in an
+EntitySpec (DISH_SPEC, BEVERAGE_SPEC).
+
+Importing this module does no work - nothing talks to the network until an
+Enricher is used.
+'''
+
+# === CONFIG ===
+OLLAMA_URL = os.environ.get("OLLAMA_URL", "http://localhost:11434")  # point at a fake server for testing
+KEEP_ALIVE = os.environ.get("OLLAMA_KEEP_ALIVE", "30m")  # keep the model (and its prefix cache) loaded between requests
+# Max requests in flight - keep in line with the server's OLLAMA_NUM_PARALLEL
+MAX_IN_FLIGHT = int(os.environ.get("OLLAMA_NUM_PARALLEL", "4"))
+MAX_FIELD_RETRIES = 2  # How often fields that fail schema validation are asked again
+
+
+def clean_ollama_json(raw_output):
+    """
+    Clean LLM-generated JSON string and parse it safely.
+    """
+    try:
+        # Remove markdown-style code block if present
+        if raw_output.startswith("```json"):
+            raw_output = raw_output.strip("`")  # remove backticks
+            raw_output = raw_output.replace("json", "", 1).strip()
+        elif raw_output.startswith("```"):
+            raw_output = raw_output.strip("`").strip()
+
+        # Extract JSON portion
+        json_start = raw_output.find("{")
+        json_str = raw_output[json_start:]
+
+        # Fix common formatting issues
+        json_str = json_str.replace('";', '",')
+        json_str = json_str.replace(';', '')
+        json_str = json_str.replace(',}', '}')
+        json_str = json_str.replace(',]', ']')
+
+        return json5.loads(json_str)
+
+    except Exception as e:
+        print("Failed to clean/parse JSON:", e)
+        print("Raw possibly malformed JSON:", raw_output)
+        return {}
+
+
+def clean_ollama_json_array(raw_output):
+    """
+    Parse a batched answer into a list of JSON objects.
+    Returns None if no array of objects can be recovered.
+    """
+    try:
+        if raw_output.startswith("```"):
+            raw_output = raw_output.strip("`")
+            if raw_output.startswith("json"):
+                raw_output = raw_output[4:]
+            raw_output = raw_output.strip()
+
+        json_start = raw_output.find("[")
+        json_end = raw_output.rfind("]")
+        if json_start == -1 or json_end == -1:
+            raise ValueError("no JSON array in response")
+        json_str = raw_output[json_start:json_end + 1]
+
+        json_str = json_str.replace('";', '",')
+        json_str = json_str.replace(';', '')
+        json_str = json_str.replace(',}', '}')
+        json_str = json_str.replace(',]', ']')
+
+        items = json5.loads(json_str)
+        return [item for item in items if isinstance(item, dict)]
+
+    except Exception as e:
+        print("Failed to clean/parse JSON array:", e)
+        print("Raw possibly malformed JSON:", raw_output)
+        return None
+
+
+def clean_llm_response(content: str) -> dict | None:
+    """
+    Cleans and parses LLM output into JSON.
+    Returns a dict if successful, else None.
+    """
+    content = content.strip()
+
+    # Remove code fences if model adds them
+    if content.startswith("```"):
+        content = content.strip("`")
+        if content.lower().startswith("json"):
+            content = content[4:].strip()
+
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError as e:
+        print("Parsing error:", e, "\nRaw content:", content)
+        return None
+
+
+def check_ollama_model_info(model="gemma3:12b", base_url=OLLAMA_URL):
+    try:
+        response = requests.post(
+            f"{base_url}/api/show",
+            json={"name": model}
+        )
+        if response.status_code == 200:
+            info = response.json()
+            print("Whole JSON response from Ollama:", json.dumps(info, indent=2))
+            gpu_enabled = info.get("details", {}).get("gpu", False)
+            model_size = info.get("details", {}).get("size", "Unknown")
+            print(f"✅ Ollama model '{model}' loaded.")
+            print(f"   • GPU Enabled: {gpu_enabled}")
+            print(f"   • Model Size: {model_size}")
+            if not gpu_enabled:
+                print("⚠️ Warning: GPU is NOT enabled for this model.")
+            return gpu_enabled
+        else:
+            print("❌ Failed to fetch model info:", response.text)
+            return False
+    except Exception as e:
+        print("❌ Exception during model info fetch:", e)
+        return False
+
+
+# === ENTITY SPECS ===
+
+@dataclass
+class EntitySpec:
+    """What to fill for one kind of entity and how to describe it to the model."""
+    name_column: str                # Column holding the entity name, e.g. "DishName"
+    noun: str                       # "dish"
+    plural: str                     # "dishes"
+    expert: str                     # "German cuisine" -> "You are an expert in German cuisine."
+    columns: list[str]              # Columns the LLM fills in
+    field_restrictions: str         # "Field Restrictions:" block appended to every prompt
+    field_schemas: dict = field(default_factory=dict)  # Per-column JSON schema for structured output (default: string)
+
+
+DISH_SPEC = EntitySpec(
+    name_column="DishName",
+    noun="dish",
+    plural="dishes",
+    expert="German cuisine",
+    columns=[
+        "Description",
+        "Region",
+        "MainIngredient",
+        "Ingredients",
+        "StateOfMainIngredient",
+        "DietType",
+        "MealEatenAtPartOfDay",
+        "Variations",
+        "FlavorProfiles",
+        "PreparationMethod",
+        "PreparationTimeMinutes",
+        "MeatCut"
+    ],
+    field_restrictions=(
+        "Field Restrictions:\n"
+        "- Description: Short dish description, don't mention the word 'german' - String.\n"
+        "- Region: Regions in Germany where the dish is popular - can be multiple, don't mention the word 'Germany' - String.\n"
+        "- MainIngredient: Single Main component - String.\n"
+        "- Ingredients: comma-separated list - String.\n"
+        "- StateOfMainIngredient: e.g. raw, boiled, sliced - String.\n"
+        "- DietType: comma-separated list from ['vegetarian', 'vegan', 'omnivore', 'halal', 'kosher'] Note: be accomodating to as many diets as possible - if a dish has no meat or fish - be sure to include atleast 'vegetarian'.\n"
+        "- MealEatenAtPartOfDay: comma-separated from ['breakfast', 'lunch', 'dinner', 'anytime'].\n"
+        "- Variations: comma-separated list - String.\n"
+        "- FlavorProfiles: comma-separated from ['sweet', 'sour', 'bitter', 'spicy', 'savory', 'umami', 'aromatic', 'nutty', 'smoky', 'cheesy', 'creamy', 'mild', 'earthy', 'fruity', 'tangy', 'buttery'].\n"
+        "- PreparationMethod: Preparation method regarding MainIngredient e.g. boiling, frying, engulfed in sauce - String.\n"
+        "- PreparationTimeMinutes: Estimated time a dish takes to be served in a restaurant - Integer.\n"
+        "- MeatCut: Cut of meat if applicable e.g. chicken breast or beef fillet or lamb loin etc. - String or empty."
+    ),
+    field_schemas={
+        "PreparationTimeMinutes": {"type": "integer"},
+    }
+)
+
+BEVERAGE_SPEC = EntitySpec(
+    name_column="BeverageName",
+    noun="beverage",
+    plural="beverages",
+    expert="German Beverages",
+    columns=[
+        "Description",                  # Short description of the beverage
+        "Region",                       # Regions in Germany where it's popular
+        "MainIngredient",              # Main component (e.g., barley, grapes, apple)
+        "Ingredients",                 # Comma-separated full ingredient list
+        "FlavorProfiles",             # e.g., fruity, bitter, sweet, herbal
+        "IsCarbonated",                # 'yes' or 'no'
+        "AlcoholContent",              # Percentage value or 'non-alcoholic'
+        "BeverageType",                # e.g., beer, wine, soda, juice
+        "ServingTemperature",          # e.g., chilled, room temperature, hot
+        "IsGermanStaple",              # 'yes' if culturally significant
+    ],
+    field_restrictions=(
+        "Field Restrictions:\n"
+        "- Description: Short beverage description, don't mention the word 'german' - String.\n"
+        "- Region: Regions in Germany where the beverage is popular - can be multiple, can even include neighboring countries, don't mention the word 'Germany' - String.\n"
+        "- MainIngredient: Single Main component - String.\n"
+        "- Ingredients: comma-separated list - String.\n"
+        "- FlavorProfiles: String list, comma-separated from ['sweet', 'bitter', 'sour', 'fruity', 'malty', 'hoppy', 'herbal', 'citrusy', 'spiced', 'floral', 'nutty', 'chocolaty', 'caramel-like', 'yeasty', 'creamy', 'smooth', 'dry', 'refreshing', 'earthy'].\n"
+        "- IsCarbonated: 'yes' or 'no' - String.\n"
+        "- AlcoholContent: Alcohol by volume percentage - Float.\n"
+        "- BeverageType: Type of beverage e.g. beer, wine, soda, juice, coffee - String.\n"
+        "- ServingTemperature: Serving temperature, e.g., 'chilled', 'room temperature', 'hot' - String.\n"
+        "- IsGermanStaple: 'yes' if culturally significant, otherwise 'no' - String.\n"
+    ),
+    field_schemas={
+        "IsCarbonated": {"type": "string", "enum": ["yes", "no"]},
+        "AlcoholContent": {"type": "number"},
+        "IsGermanStaple": {"type": "string", "enum": ["yes", "no"]},
+    }
+)
+
+
+# === BACKENDS ===
+
+class JsonCompletionScanner:
+    """
+    Watches streamed text and reports when the first top-level JSON object or array is closed.
+    Anything before the first "{" or "[" (e.g. a ```json fence) is ignored.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, chunk):
+        """Return True once the JSON value is complete."""
+        for char in chunk:
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char in "{[":
+                self.started = True
+                self.depth += 1
+            elif not self.started:
+                continue
+            elif char == '"':
+                self.in_string = True
+            elif char in "}]":
+                self.depth -= 1
+                if self.depth == 0:
+                    return True
+        return False
+
+
+class OllamaBackend:
+    """
+    Talks to an Ollama server over HTTP through one pooled keep-alive session.
+    With stream=True the NDJSON stream is consumed incrementally and closed as soon as a
+    complete JSON object/array has arrived, so trailing fences or commentary are never generated.
+    Any object with the same complete() signature can be passed to an Enricher instead.
+    """
+
+    def __init__(self, base_url=OLLAMA_URL, api="generate", keep_alive=KEEP_ALIVE, pool_size=MAX_IN_FLIGHT, stream=False):
+        self.base_url = base_url
+        self.api = api  # "generate" or "chat"; a system message always goes through chat
+        self.keep_alive = keep_alive
+        self.stream = stream
+        # One connection per request in flight, reused across requests instead of a new TCP setup per row
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def complete(self, prompt, model, system=None, fmt=None, options=None):
+        """
+        Send one prompt and return the Ollama response dict with the answer text under "text",
+        "ttft" (seconds to first token, streaming only) and "latency" (seconds), or None if the request failed.
+        """
+        payload = {"model": model, "stream": self.stream, "keep_alive": self.keep_alive}
+        if fmt:
+            payload["format"] = fmt
+        if options:
+            payload["options"] = options
+
+        if system is not None or self.api == "chat":
+            messages = [{"role": "system", "content": system}] if system is not None else []
+            messages.append({"role": "user", "content": prompt})
+            payload["messages"] = messages
+            url = f"{self.base_url}/api/chat"
+        else:
+            payload["prompt"] = prompt
+            url = f"{self.base_url}/api/generate"
+
+        start = time.perf_counter()
+        try:
+            response = self.session.post(url, json=payload, stream=self.stream)
+            if response.status_code != 200:
+                print("Ollama request failed:", response.text)
+                return None
+
+            if not self.stream:
+                result = response.json()
+                result["text"] = (result["message"]["content"] if "message" in result else result["response"]).strip()
+                result["ttft"] = None
+                result["latency"] = time.perf_counter() - start
+                return result
+
+            return self._consume_stream(response, start)
+        except requests.RequestException as e:
+            # Connection refused/reset, timeouts, truncated bodies: the row counts as failed and the run goes on
+            print("Ollama request failed:", e)
+            return None
+
+    def _consume_stream(self, response, start):
+        text = ""
+        result = {"ttft": None}
+        scanner = JsonCompletionScanner()
+        chunks = 0
+        try:
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                piece = chunk["message"]["content"] if "message" in chunk else chunk.get("response", "")
+                if piece and result["ttft"] is None:
+                    result["ttft"] = time.perf_counter() - start
+                text += piece
+                chunks += 1
+                if chunk.get("done"):
+                    # Final chunk carries prompt_eval_count, eval_count and durations
+                    result.update(chunk)
+                    break
+                if scanner.feed(piece):
+                    # Complete JSON received - closing the connection stops generation on the server
+                    result["eval_count"] = chunks
+                    result["stopped_early"] = True
+                    break
+        finally:
+            response.close()
+        result["text"] = text.strip()
+        result["latency"] = time.perf_counter() - start
+        return result
+
+
+# === ENGINE ===
+
+class Enricher:
+    """
+    Fills in entity attributes (or answers free-form prompts) with an LLM.
+
+    prompt_mode "generate" sends one self-contained prompt per request; "chat" sends the
+    static instructions as an identical system message so the server can reuse that prefix.
+    batch_size packs several rows into one prompt, structured sends a JSON schema as "format".
+    """
+
+    def __init__(self, spec=None, backend=None, model="gemma3:12b", cache=None,
+                 max_in_flight=MAX_IN_FLIGHT, batch_size=1, prompt_mode="generate", structured=False):
+        self.spec = spec
+        self.backend = backend or OllamaBackend()
+        self.model = model
+        self.cache = cache if cache is not None else LLMCache()
+        self.max_in_flight = max_in_flight
+        self.batch_size = batch_size
+        self.prompt_mode = prompt_mode
+        self.structured = structured
+        self.stats = {"requests": 0, "prompt_eval_count": 0, "eval_count": 0,
+                      "prompt_eval_duration": 0, "eval_duration": 0, "field_retries": 0, "parse_failures": 0}
+        self.items_processed = 0  # Items actually sent to the model by the last map() call
+        self.failed_rows = []  # Row indices the last fill_dataframe() call could not fill
+        self.latencies = []  # Seconds per request that reached the backend
+        self.ttfts = []  # Seconds to first token per streamed request
+        self._stats_lock = threading.Lock()
+
+    # --- prompts ---
+
+    def system_prompt(self):
+        # Static part of every chat-mode request - never put row data in here, or the prefix stops being shared
+        spec = self.spec
+        return (
+            f"You are an expert in {spec.expert}. You will receive the names of one or more {spec.plural}, "
+            "and your task is to fill in their missing fields. Respond in English and don't use special german characters such as ä, ö, ü, ß. \n DO NOT add any additional information or context or comment.\n"
+            "Fill in ONLY the missing fields with realistic and concise values.\n\n"
+            + spec.field_restrictions
+        )
+
+    def known_fields_of(self, row):
+        return {col: row[col] for col in self.spec.columns if pd.notna(row[col]) and row[col].strip() != ""}
+
+    def missing_fields_of(self, row):
+        known_fields = self.known_fields_of(row)
+        return [col for col in self.spec.columns if col not in known_fields]
+
+    def row_prompt(self, row, fields=None):
+        """Prompt (generate mode) or user message (chat mode) asking for the missing fields of one row."""
+        spec = self.spec
+        known_fields = self.known_fields_of(row)
+        missing_fields = fields if fields is not None else self.missing_fields_of(row)
+
+        if self.prompt_mode == "chat":
+            message = f"{spec.name_column}: {row[spec.name_column]}\n"
+            for key, value in known_fields.items():
+                message += f"{key}: {value}\n"
+            message += "\nReturn your answer as a valid JSON object with keys ONLY from this list:\n"
+            message += f"{missing_fields}"
+            return message
+
+        prompt = (
+            f"You are an expert in {spec.expert}. You will receive only the name of a {spec.noun}, "
+            f"and your task is to fill in the missing fields. Respond in English and don't use special german characters such as ä, ö, ü, ß. \n DO NOT add any additional information or context or comment.\n\n"
+            f"{spec.name_column}: {row[spec.name_column]}\n"
+        )
+        for key, value in known_fields.items():
+            prompt += f"{key}: {value}\n"
+
+        prompt += "\nNow fill in ONLY the missing fields with realistic and concise values. "
+        prompt += "Return your answer as a valid JSON object with keys ONLY from this list:\n"
+        prompt += f"{missing_fields}\n\n"
+        prompt += spec.field_restrictions
+        print("Prompt for LLM:", prompt)  # Debugging line to see the generated prompt
+        return prompt
+
+    def batch_prompt(self, rows):
+        """One prompt for several rows, so the restrictions are only sent once."""
+        spec = self.spec
+        rows_part = ""
+        for row in rows:
+            rows_part += f"{spec.name_column}: {row[spec.name_column]}\n"
+            for key, value in self.known_fields_of(row).items():
+                rows_part += f"{key}: {value}\n"
+            rows_part += f"Missing fields: {self.missing_fields_of(row)}\n\n"
+
+        if self.prompt_mode == "chat":
+            message = rows_part
+            message += f"Return your answer as a valid JSON array with exactly {len(rows)} objects, one per {spec.noun}, in the same order. "
+            message += f"Each object must contain the key '{spec.name_column}' with the {spec.noun} name exactly as given, plus that {spec.noun}'s missing fields."
+            return message
+
+        prompt = (
+            f"You are an expert in {spec.expert}. You will receive a list of {spec.plural}, "
+            f"and your task is to fill in the missing fields of each {spec.noun}. Respond in English and don't use special german characters such as ä, ö, ü, ß. \n DO NOT add any additional information or context or comment.\n\n"
+        )
+        prompt += rows_part
+        prompt += f"Now fill in ONLY the missing fields of every {spec.noun} with realistic and concise values. "
+        prompt += f"Return your answer as a valid JSON array with exactly {len(rows)} objects, one per {spec.noun}, in the same order. "
+        prompt += f"Each object must contain the key '{spec.name_column}' with the {spec.noun} name exactly as given, plus that {spec.noun}'s missing fields.\n\n"
+        prompt += spec.field_restrictions
+        print("Batch prompt for LLM:", prompt)  # Debugging line to see the generated prompt
+        return prompt
+
+    # --- requests ---
+
+    def _record_stats(self, result):
+        """Add the counters of one Ollama response (durations are in nanoseconds) to self.stats."""
+        with self._stats_lock:
+            self.stats["requests"] += 1
+            for key in ("prompt_eval_count", "eval_count", "prompt_eval_duration", "eval_duration"):
+                self.stats[key] += result.get(key, 0)
+            if result.get("latency") is not None:
+                self.latencies.append(result["latency"])
+            if result.get("ttft") is not None:
+                self.ttfts.append(result["ttft"])
+        ttft = f"{result['ttft'] * 1000:.0f}ms" if result.get("ttft") is not None else "-"
+        latency = f"{result['latency'] * 1000:.0f}ms" if result.get("latency") is not None else "-"
+        print(
+            f"   prompt_eval_count={result.get('prompt_eval_count', 0)} "
+            f"prompt_eval_duration={result.get('prompt_eval_duration', 0) / 1e6:.0f}ms "
+            f"eval_count={result.get('eval_count', 0)} "
+            f"eval_duration={result.get('eval_duration', 0) / 1e6:.0f}ms "
+            f"ttft={ttft} latency={latency}"
+            + (" (stopped early)" if result.get("stopped_early") else "")
+        )
+
+    def _system(self):
+        return self.system_prompt() if self.spec is not None and self.prompt_mode == "chat" else None
+
+    def _cache_options(self, system=None, fmt=None):
+        # Chat answers depend on the system message too, so it is part of their cache key
+        options = {"api": "chat", "system": system} if system is not None else {}
+        if fmt:
+            options["format"] = fmt
+        return options or None
+
+    def ask(self, prompt, parse=None, system=None, fmt=None):
+        """
+        Send one prompt through the cache and return parse(raw_text) (the raw text if parse is None),
+        or None if the request failed.
+        Only answers that parse to something truthy are cached, so bad ones are re-queried next run.
+        """
+        options = self._cache_options(system, fmt)
+        raw_output = self.cache.get(self.model, prompt, options)
+        if raw_output is not None:
+            print("Ollama response (cached):", raw_output)
+            return parse(raw_output) if parse else raw_output
+
+        result = self.backend.complete(prompt, self.model, system=system, fmt=fmt)
+        if result is None:
+            return None
+        self._record_stats(result)
+        raw_output = result["text"]
+        print("Ollama response:", raw_output)
+        parsed = parse(raw_output) if parse else raw_output
+        if parsed:
+            self.cache.put(self.model, prompt, raw_output, options)
+        else:
+            with self._stats_lock:
+                self.stats["parse_failures"] += 1
+        return parsed
+
+    def ask_structured(self, make_prompt, fields, field_schemas, system=None, attempt=0, label=""):
+        """
+        Ask for the given fields with a JSON schema as "format" and validate the answer.
+        make_prompt(fields) builds the prompt; only fields that fail validation are asked again.
+        """
+        if not fields:
+            return {}
+        schema = build_object_schema(fields, field_schemas)
+        validator = get_validator(schema)
+        prompt = make_prompt(fields)
+
+        answer = {"filled_values": {}, "failed": list(fields)}
+
+        def parse(raw_output):
+            # Validate before ask() caches: an answer with any invalid field is not stored, so it is re-asked next run
+            answer["filled_values"], answer["failed"] = validator.validate_json(raw_output)
+            return None if answer["failed"] else answer["filled_values"]
+
+        self.ask(prompt, parse=parse, system=system, fmt=schema)
+        filled_values, failed = answer["filled_values"], answer["failed"]
+
+        if failed and attempt < MAX_FIELD_RETRIES:
+            print(f"⚠️ {label}: retrying fields that failed validation: {failed}")
+            with self._stats_lock:
+                self.stats["field_retries"] += 1
+            filled_values.update(self.ask_structured(make_prompt, failed, field_schemas, system, attempt + 1, label))
+        return filled_values
+
+    def warm_up_prefix(self):
+        """
+        Load the model and evaluate the system prompt once before the real requests start,
+        so later requests only pay prompt-eval for their row-specific part.
+        """
+        print("🔥 Warming up system prompt prefix...")
+        result = self.backend.complete("Reply with OK.", self.model, system=self.system_prompt(), options={"num_predict": 1})
+        if result is not None:
+            self._record_stats(result)
+
+    # --- rows ---
+
+    def fill_row(self, row):
+        """Return {field: value} for the missing fields of one row."""
+        system = self._system()
+        if self.structured:
+            return self.ask_structured(
+                lambda fields: self.row_prompt(row, fields),
+                self.missing_fields_of(row),
+                self.spec.field_schemas,
+                system=system,
+                label=row[self.spec.name_column]
+            )
+        return self.ask(self.row_prompt(row), parse=clean_ollama_json, system=system) or {}
+
+    def fill_batch(self, batch):
+        """
+        Fill a list of (idx, row) pairs with a single request and return {idx: filled_values}.
+        Rows the model dropped or garbled are retried in halves, down to the one-row prompt.
+        """
+        if len(batch) == 1:
+            idx, row = batch[0]
+            return {idx: self.fill_row(row)}
+
+        spec = self.spec
+        system = self._system()
+        schema = None
+        if self.structured:
+            batch_fields = sorted({f for _, row in batch for f in self.missing_fields_of(row)}, key=spec.columns.index)
+            schema = build_array_schema(build_object_schema(batch_fields, spec.field_schemas, name_key=spec.name_column), len(batch))
+
+        def parse(raw_output):
+            if not self.structured:
+                return clean_ollama_json_array(raw_output)
+            try:
+                return [item for item in json.loads(raw_output) if isinstance(item, dict)]
+            except (TypeError, json.JSONDecodeError) as e:
+                print("Structured batch output is not valid JSON:", e)
+                return None
+
+        items = self.ask(self.batch_prompt([row for _, row in batch]), parse=parse, system=system, fmt=schema)
+
+        results = {}
+        if items:
+            by_name = {normalize_name(item.get(spec.name_column, "")): item for item in items}
+            for idx, row in batch:
+                item = by_name.get(normalize_name(row[spec.name_column]))
+                if item and self.structured:
+                    fields = self.missing_fields_of(row)
+                    filled_values, failed = get_validator(build_object_schema(fields, spec.field_schemas)).validate(
+                        {k: v for k, v in item.items() if k in fields}
+                    )
+                    if failed:
+                        # Keep the valid part of the object and only re-ask the broken fields
+                        with self._stats_lock:
+                            self.stats["field_retries"] += 1
+                        filled_values.update(self.ask_structured(
+                            lambda fields: self.row_prompt(row, fields), failed, spec.field_schemas,
+                            system=system, attempt=1, label=row[spec.name_column]
+                        ))
+                    results[idx] = filled_values
+                elif item:
+                    results[idx] = {k: v for k, v in item.items() if k != spec.name_column}
+
+        missing = [(idx, row) for idx, row in batch if idx not in results]
+        if missing:
+            print(f"⚠️ Batch answer covered {len(results)}/{len(batch)} {spec.plural} - retrying {len(missing)}")
+            if len(missing) == len(batch):
+                # No progress at this size: split in half
+                half = len(batch) // 2
+                results.update(self.fill_batch(batch[:half]))
+                results.update(self.fill_batch(batch[half:]))
+            else:
+                results.update(self.fill_batch(missing))
+        return results
+
+    # --- running ---
+
+    def map(self, items, work, key, journal=None, batch_size=1):
+        """
+        Run work(batch) over items with up to max_in_flight batches in flight and return {key: result}.
+        work gets a list of up to batch_size items and returns {key: result}.
+        Items whose key is already in the journal are not re-run; new non-empty results are appended to it.
+        A batch whose request raises requests.RequestException maps its items to None (failed, retried next run).
+        Prints throughput in items/second.
+        """
+        results = {}
+        pending = []
+        for item in items:
+            item_key = key(item)
+            if journal is not None and item_key in journal:
+                results[item_key] = journal.get(item_key)
+            else:
+                pending.append(item)
+        if results:
+            print(f"⏭️ Skipping {len(results)} items restored from the journal")
+
+        def record(batch_results):
+            for item_key, result in batch_results.items():
+                results[item_key] = result
+                # Failed items are not journaled, so the next run retries them
+                if journal is not None and result:
+                    journal.append(item_key, result)
+
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        start = time.perf_counter()
+        if self.max_in_flight > 1 and len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=self.max_in_flight) as pool:
+                futures = {pool.submit(work, batch): batch for batch in batches}
+                for done, future in enumerate(as_completed(futures), start=1):
+                    try:
+                        batch_results = future.result()
+                    except requests.RequestException as e:
+                        print(f"❌ Batch failed: {e}")
+                        batch_results = {key(item): None for item in futures[future]}
+                    record(batch_results)
+                    print(f"[{done}/{len(futures)}] Batch done")
+        else:
+            for batch in batches:
+                try:
+                    batch_results = work(batch)
+                except requests.RequestException as e:
+                    print(f"❌ Batch failed: {e}")
+                    batch_results = {key(item): None for item in batch}
+                record(batch_results)
+
+        elapsed = time.perf_counter() - start
+        self.items_processed = len(pending)
+        rate = len(pending) / elapsed if elapsed > 0 else 0.0
+        print(f"⏱️ Processed {len(pending)} items in {elapsed:.1f}s ({rate:.2f} items/s, max in flight: {self.max_in_flight}, batch size: {batch_size})")
+        return results
+
+    def fill_dataframe(self, df, journal=None):
+        """
+        Fill the missing spec.columns of every row of df in place and return it.
+        Rows are keyed by their integer index in the journal. Rows that had missing fields but got
+        no answer are left in self.failed_rows.
+        """
+        for col in self.spec.columns:
+            if col not in df.columns:
+                df[col] = ""
+            df[col] = df[col].astype("string")
+
+        rows = [(int(idx), row) for idx, row in df.iterrows()]
+        if self.prompt_mode == "chat" and not all(journal is not None and idx in journal for idx, _ in rows):
+            self.warm_up_prefix()
+
+        def work(batch):
+            return {
+                idx: {f: str(v).strip() for f, v in filled_values.items()}
+                for idx, filled_values in self.fill_batch(batch).items()
+            }
+
+        results = self.map(rows, work, key=lambda item: item[0], journal=journal, batch_size=self.batch_size)
+        self.failed_rows = [idx for idx, row in rows if not results.get(idx) and self.missing_fields_of(row)]
+        if self.failed_rows:
+            print(f"❌ {len(self.failed_rows)} {self.spec.plural} failed and will be retried on the next run")
+        for idx, filled_values in results.items():
+            for f, value in (filled_values or {}).items():
+                df.at[idx, f] = value
+        return df
+
+    def print_stats(self, n_items=None):
+        stats = self.stats
+        n_items = n_items if n_items is not None else self.items_processed
+        if stats["requests"]:
+            line = f"🔢 {stats['requests']} requests"
+            if n_items:
+                # Compare between batch sizes / prompt modes (cached answers count no tokens)
+                line += (
+                    f", {stats['prompt_eval_count'] / n_items:.1f} prompt tokens/row"
+                    f", {stats['eval_count'] / n_items:.1f} generated tokens/row"
+                )
+            line += (
+                f", prompt eval {stats['prompt_eval_duration'] / 1e9:.1f}s"
+                f", generation {stats['eval_duration'] / 1e9:.1f}s (prompt mode: {self.prompt_mode})"
+            )
+            print(line)
+        if self.latencies:
+            line = f"⏱️ Latency per request: mean {sum(self.latencies) / len(self.latencies) * 1000:.0f}ms, p50 {percentile(self.latencies, 50) * 1000:.0f}ms, p95 {percentile(self.latencies, 95) * 1000:.0f}ms"
+            if self.ttfts:
+                line += f"; time to first token: mean {sum(self.ttfts) / len(self.ttfts) * 1000:.0f}ms, p50 {percentile(self.ttfts, 50) * 1000:.0f}ms"
+            print(line)
+        if self.structured:
+            print(f"🧩 Structured output: {stats['field_retries']} field retries")
+        if stats["parse_failures"]:
+            print(f"❌ {stats['parse_failures']} answers could not be parsed")
+        self.cache.print_stats()
+
+
+def normalize_name(name):
+    return str(name).strip().lower()
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
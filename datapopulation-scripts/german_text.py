@@ -0,0 +1,154 @@
+import re
+import time
+
+'''
+German text normalization shared by the scraping, enrichment and ontology scripts.
+
+  - fold_umlauts("Käsespätzle")             -> "Kaesespaetzle"
+  - normalize_german_chars("Süß\\nund sauer") -> "Suess und sauer"  (also flattens newlines)
+  - repair_mojibake("WÃ¼rttemberg")          -> "Württemberg"  (UTF-8 read as cp1252/latin-1)
+
+One replacement table for every script. Most strings in our data are already
+ASCII and are returned after a single isascii() check; the others only get the
+replacements for characters they actually contain. (A str.translate table is
+the obvious tool, but with two-character replacements CPython takes its slow
+path - see the benchmark below.) For pandas columns use normalize_series /
+repair_series / repair_frame: each distinct value is converted once and
+mapped back onto the column. Run this file for the benchmark.
+'''
+
+UMLAUTS = {"ä": "ae", "ö": "oe", "ü": "ue", "Ä": "Ae", "Ö": "Oe", "Ü": "Ue", "ß": "ss"}
+UMLAUT_ITEMS = tuple(UMLAUTS.items())
+TEXT_ITEMS = UMLAUT_ITEMS + (("\n", " "),)
+TEXT_TABLE = str.maketrans(dict(TEXT_ITEMS))  # Only for the benchmark comparison
+# Lead bytes of UTF-8 sequences as they look after a wrong cp1252/latin-1 decode
+MOJIBAKE_PATTERN = r"[ÃÂÅâ][\x80-\xbfŒœŠšŸŽžƒˆ˜–-™]"
+MOJIBAKE = re.compile(MOJIBAKE_PATTERN)
+# What a decode may leave behind when the text was damaged beyond a wrong decode: control
+# characters, the replacement character, stray spacing diacritics ("BÇ¸chamelkartoffeln") and
+# letters from outside Latin-1 / Latin Extended-A ("BǸchamelkartoffeln")
+DEBRIS = re.compile(r"[^\t\n\r\x20-\x7e\xa0-\u017f\u2010-\u205f\u20ac]|[¤¦¨¯´¸]")
+
+
+def _replace(text, items):
+    if text.isascii():
+        return text.replace("\n", " ") if items is TEXT_ITEMS else text
+    for char, replacement in items:
+        if char in text:
+            text = text.replace(char, replacement)
+    return text
+
+
+def fold_umlauts(text):
+    return _replace(text, UMLAUT_ITEMS)
+
+
+def normalize_german_chars(text: str) -> str:
+    """Replace German special characters with neutral forms and newlines with spaces."""
+    return _replace(text, TEXT_ITEMS)
+
+
+def repair_mojibake(text):
+    """
+    Undo UTF-8 text that was decoded as cp1252/latin-1 (possibly twice). A decode is only
+    accepted if its result is clean (no mojibake, no DEBRIS); unrepairable text is returned as is.
+    """
+    if not isinstance(text, str) or not MOJIBAKE.search(text):
+        return text
+    candidates = [text]
+    for _ in range(3):
+        decoded = []
+        for candidate in candidates:
+            for encoding in ("cp1252", "latin-1"):
+                try:
+                    repaired = candidate.encode(encoding).decode("utf-8")
+                except UnicodeError:
+                    continue
+                if not MOJIBAKE.search(repaired) and not DEBRIS.search(repaired):
+                    return repaired
+                if repaired not in decoded:
+                    decoded.append(repaired)
+        candidates = decoded
+    return text
+
+
+def _map_distinct(series, convert):
+    """Apply convert once per distinct string of a column (NaN and non-strings stay as they are)."""
+    mapping = {value: convert(value) for value in series.dropna().unique() if isinstance(value, str)}
+    converted = series.map(mapping)
+    return converted.where(converted.notna(), series)
+
+
+def normalize_series(series, newlines=True):
+    """normalize_german_chars (or fold_umlauts with newlines=False) for a whole pandas column."""
+    return _map_distinct(series, normalize_german_chars if newlines else fold_umlauts)
+
+
+def repair_series(series):
+    """repair_mojibake for a pandas column; only cells that look broken are touched."""
+    suspect = series.str.contains(MOJIBAKE_PATTERN, regex=True, na=False)
+    if not suspect.any():
+        return series
+    series = series.copy()
+    series[suspect] = series[suspect].map(repair_mojibake)
+    return series
+
+
+def repair_frame(df):
+    """
+    Repair mojibake in every text column of a DataFrame in place at ingest; returns the number of changed
+    cells. Cells that still look broken afterwards are reported and left as they were.
+    """
+    changed = 0
+    unrepairable = []
+    for column in df.select_dtypes(include=["object", "string"]).columns:
+        original = df[column]
+        repaired = repair_series(original)
+        if repaired is not original:
+            # NaN != NaN, and pd.NA comparisons are NA - count only cells whose value really changed
+            same = repaired.eq(original).fillna(False) | (repaired.isna() & original.isna())
+            changed += int((~same).sum())
+            df[column] = repaired
+            unrepairable += repaired[repaired.str.contains(MOJIBAKE_PATTERN, regex=True, na=False)].tolist()
+    if changed:
+        print(f"🔧 Repaired mojibake in {changed} cells")
+    if unrepairable:
+        print(f"⚠️ {len(unrepairable)} cells look like mojibake but could not be repaired, "
+              f"e.g. {unrepairable[0][:60]!r}")
+    return changed
+
+
+def _chained_replace(text):
+    # The per-script implementation this module replaces
+    return (
+        text.replace("ä", "ae").replace("Ä", "Ae").replace("ö", "oe").replace("Ö", "Oe")
+        .replace("ü", "ue").replace("Ü", "Ue").replace("ß", "ss").replace("\n", " ")
+    )
+
+
+def benchmark(runs=3):
+    import pandas as pd
+
+    df = pd.read_csv("../data/dishes.csv", dtype=str, keep_default_na=False)
+    column = pd.concat([df[c] for c in df.columns], ignore_index=True)
+    column = pd.concat([column] * max(1, 200_000 // len(column)), ignore_index=True)
+    values = column.tolist()
+    print(f"📏 {len(values)} strings, {sum(map(len, values)) / 1e6:.1f}M characters")
+
+    for label, run in (
+        ("chained str.replace", lambda: [_chained_replace(v) for v in values]),
+        ("str.translate", lambda: [v.translate(TEXT_TABLE) for v in values]),
+        ("normalize_german_chars", lambda: [normalize_german_chars(v) for v in values]),
+        ("Series.apply(chained)", lambda: column.apply(_chained_replace)),
+        ("normalize_series", lambda: normalize_series(column)),
+        ("repair_series", lambda: repair_series(column)),
+    ):
+        start = time.perf_counter()
+        for _ in range(runs):
+            run()
+        print(f"⏱️ {label:<24} {(time.perf_counter() - start) / runs * 1000:8.1f}ms")
+    assert [_chained_replace(v) for v in values] == [normalize_german_chars(v) for v in values]
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+'''
+Shared on-disk cache for LLM responses.
+
+Every script that talks to Ollama stores the raw model output here, keyed by
+(model, prompt hash, options). Rerunning a script after a crash or after a
+change that does not touch the prompt costs no model time.
+Only the raw text is cached, so changes to the JSON cleaning code still apply.
+'''
+
+# === CONFIG ===
+DEFAULT_CACHE_PATH = os.environ.get(
+    "LLM_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".llm_cache.sqlite")
+)
+DEFAULT_MAX_BYTES = int(os.environ.get("LLM_CACHE_MAX_BYTES", 256 * 1024 * 1024))  # 256 MB
+
+
+def make_key(model, prompt, options=None):
+    """Content address of a request: sha256 over model, prompt and options."""
+    payload = json.dumps(
+        {"model": model, "prompt": prompt, "options": options or {}},
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    SQLite-backed response cache with least-recently-used eviction once the
+    stored responses exceed max_bytes. Safe to share between threads.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON responses(last_used)")
+        self._conn.commit()
+
+    def get(self, model, prompt, options=None):
+        """Return the cached response text or None."""
+        key = make_key(model, prompt, options)
+        with self._lock:
+            row = self._conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            return row[0]
+
+    def put(self, model, prompt, response, options=None):
+        """Store a response and evict the oldest entries if the cache grew past max_bytes."""
+        key = make_key(model, prompt, options)
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, size, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, model, response, size, time.time())
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY last_used ASC").fetchall()
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        print(f"🧹 Evicted {len(evicted)} cached LLM responses (cache size now {total} bytes)")
+
+    def get_or_call(self, model, prompt, call, options=None):
+        """Return the cached response, or run call() and cache its (string) result."""
+        cached = self.get(model, prompt, options)
+        if cached is not None:
+            return cached
+        response = call()
+        if response is not None:
+            self.put(model, prompt, response, options)
+        return response
+
+    def print_stats(self):
+        total = self.hits + self.misses
+        rate = (self.hits / total * 100) if total else 0.0
+        print(f"📦 LLM cache: {self.hits} hits, {self.misses} misses ({rate:.1f}% hit rate) - {self.path}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class NullCache:
+    """Drop-in for LLMCache that never hits - for benchmarks that must measure real model time."""
+
+    hits = 0
+    misses = 0
+
+    def get(self, model, prompt, options=None):
+        return None
+
+    def put(self, model, prompt, response, options=None):
+        pass
+
+    def get_or_call(self, model, prompt, call, options=None):
+        return call()
+
+    def print_stats(self):
+        print("📦 LLM cache: disabled")
+
+    def close(self):
+        pass
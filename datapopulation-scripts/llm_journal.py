@@ -0,0 +1,86 @@
+import json
+import os
+import threading
+
+'''
+Append-only checkpoint journal for LLM enrichment runs.
+
+Each completed row is written as one JSON line {"key": ..., "values": {...}}
+and flushed to disk immediately, so a crash at row 700 keeps rows 0-699.
+On restart the scripts skip every key already in the journal. At the end the
+rows are written to the final CSV; the journal is removed only if every row
+succeeded, otherwise it is kept so the rerun skips the finished rows again.
+'''
+
+
+class RowJournal:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._needs_newline = False
+        self._rows = self._read()
+        if self._rows:
+            print(f"♻️ Resuming from journal {path}: {len(self._rows)} rows already done")
+
+    def _read(self):
+        rows = {}
+        if not os.path.exists(self.path):
+            return rows
+        with open(self.path, encoding="utf-8") as f:
+            for line_no, line in enumerate(f, start=1):
+                self._needs_newline = not line.endswith("\n")
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-write can leave a truncated last line - that row is simply redone
+                    print(f"⚠️ Skipping unreadable journal line {line_no}")
+                    continue
+                rows[entry["key"]] = entry["values"]
+        return rows
+
+    def __contains__(self, key):
+        return key in self._rows
+
+    def __len__(self):
+        return len(self._rows)
+
+    def get(self, key):
+        return self._rows.get(key)
+
+    def items(self):
+        return self._rows.items()
+
+    def append(self, key, values):
+        """Record a finished row and force it to disk before returning."""
+        line = json.dumps({"key": key, "values": values}, ensure_ascii=False)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                if self._needs_newline:
+                    # Terminate a truncated line left by a crash so it doesn't swallow this row
+                    f.write("\n")
+                    self._needs_newline = False
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._rows[key] = values
+
+    def compact(self, df, output_path, complete=True, **to_csv_kwargs):
+        """
+        Write df to output_path atomically, then drop the journal it was built from - unless the run
+        is not complete (rows failed), in which case the journal stays for the rerun.
+        """
+        tmp_path = output_path + ".tmp"
+        df.to_csv(tmp_path, **to_csv_kwargs)
+        os.replace(tmp_path, output_path)
+        if not complete:
+            print(f"📒 Wrote {output_path}, keeping journal {self.path} ({len(self)} rows done) - "
+                  f"rerun to retry the failed rows")
+            return
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self._rows = {}
+        print(f"🗜️ Journal compacted into {output_path}")
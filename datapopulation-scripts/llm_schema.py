@@ -0,0 +1,110 @@
+import json
+
+'''
+JSON schemas for structured LLM output.
+
+The schema is sent as Ollama's "format" parameter so the model can only
+produce matching JSON, and the same schema is compiled once into a validator
+that checks every answer field by field. Fields that fail are the only ones
+that get asked again - there is no second repair/parse pass.
+'''
+
+DEFAULT_FIELD_SCHEMA = {"type": "string"}
+
+
+def build_object_schema(fields, field_schemas=None, name_key=None):
+    """
+    Object schema requiring exactly the given fields.
+    field_schemas maps a field to its own schema (default: string).
+    name_key adds an identifying string key, used to match objects of a batch back to their rows.
+    """
+    field_schemas = field_schemas or {}
+    properties = {}
+    if name_key:
+        properties[name_key] = {"type": "string"}
+    for field in fields:
+        properties[field] = field_schemas.get(field, DEFAULT_FIELD_SCHEMA)
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False
+    }
+
+
+def build_array_schema(item_schema, length):
+    return {
+        "type": "array",
+        "items": item_schema,
+        "minItems": length,
+        "maxItems": length
+    }
+
+
+def _type_check(field_schema):
+    """Turn one property schema into a predicate."""
+    if "enum" in field_schema:
+        allowed = set(field_schema["enum"])
+        return lambda value: value in allowed
+    expected = field_schema.get("type", "string")
+    if isinstance(expected, list):
+        # e.g. ["string", "null"]: any of the listed types
+        alternatives = [_type_check({**field_schema, "type": t}) for t in expected]
+        return lambda value: any(check(value) for check in alternatives)
+    if expected == "null":
+        return lambda value: value is None
+    if expected == "string":
+        return lambda value: isinstance(value, str)
+    if expected == "integer":
+        return lambda value: isinstance(value, int) and not isinstance(value, bool)
+    if expected == "number":
+        return lambda value: isinstance(value, (int, float)) and not isinstance(value, bool)
+    if expected == "boolean":
+        return lambda value: isinstance(value, bool)
+    if expected == "array":
+        item_check = _type_check(field_schema.get("items", DEFAULT_FIELD_SCHEMA))
+        return lambda value: isinstance(value, list) and all(item_check(v) for v in value)
+    raise ValueError(f"Unsupported schema type: {expected}")
+
+
+class CompiledValidator:
+    """Validator for a flat object schema; property checks are built once in __init__."""
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.checks = {field: _type_check(prop) for field, prop in schema["properties"].items()}
+        self.required = list(schema.get("required", []))
+
+    def validate(self, obj):
+        """Return (valid_values, failed_fields) for an already parsed object."""
+        if not isinstance(obj, dict):
+            return {}, list(self.required)
+        valid = {}
+        failed = []
+        for field, check in self.checks.items():
+            if field in obj and check(obj[field]):
+                valid[field] = obj[field]
+            elif field in self.required:
+                failed.append(field)
+        return valid, failed
+
+    def validate_json(self, raw_output):
+        """Parse raw model output as strict JSON and validate it."""
+        try:
+            obj = json.loads(raw_output)
+        except (TypeError, json.JSONDecodeError) as e:
+            print("Structured output is not valid JSON:", e)
+            return {}, list(self.required)
+        return self.validate(obj)
+
+
+_validators = {}
+
+
+def get_validator(schema):
+    """Compile a validator once per distinct schema and reuse it."""
+    key = json.dumps(schema, sort_keys=True)
+    validator = _validators.get(key)
+    if validator is None:
+        validator = _validators[key] = CompiledValidator(schema)
+    return validator
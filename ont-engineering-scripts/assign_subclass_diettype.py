@@ -1,63 +1,73 @@
+import types
 from owlready2 import *
+from ontology_pipeline import OntologyPass, register_pass, run_pipeline
 
-# Load ontology
-onto = get_ontology("../ontology-owl/test.owl").load()
-
-# Ensure DietType and subclasses exist in ontology
-with onto:
-    class DietType(Thing): pass
-    class Omnivore(DietType): pass
-    class Vegetarian(DietType): pass
-    class Vegan(DietType): pass
-    class Halal(DietType): pass
-    class Kosher(DietType): pass
-    class Anytime(DietType): pass
-
-# Keyword mapping (lowercase)
-keyword_to_class = {
-    "omnivore": Omnivore,
-    "vegetarian": Vegetarian,
-    "vegan": Vegan,
-    "halal": Halal,
-    "kosher": Kosher,
-    "anytime": Anytime
-}
-
-# Get Dish class
-Dish = onto.search_one(iri="*#Dish")
-if not Dish:
-    raise Exception("❌ Dish class not found in ontology.")
-
-# Process all Dish instances
-for dish in Dish.instances():
-    print(f"\n🍽️ Processing dish: {dish.name}")
-
-    if not hasattr(dish, "hasDietType") or not dish.hasDietType:
-        print("⚠️ No diet type found.")
-        continue
-
-    for dt in dish.hasDietType:
-        label = dt.name
-        if not label:
-            print("⚠️ Diet type has no label.")
-            continue
-
-        print(f"🔍 Detected diet label: {label}")
-
-        # Normalize and split by comma/underscore/whitespace
-        raw_labels = label.lower().replace("_", ",").replace(" ", ",").split(",")
-        parsed_labels = [d for d in raw_labels if d]
-
-        for diet_name in parsed_labels:
-            if diet_name in keyword_to_class:
-                subclass = keyword_to_class[diet_name]
-                if subclass not in dish.is_a:
-                    dish.is_a.append(subclass)
-                    print(f"✅ Assigned {dish.name} to subclass {subclass.name}")
-            else:
-                print(f"⚠️ Unknown diet type label: {diet_name}")
-
-# Save the modified ontology
-output_file = "dietsubclasses.owl"
-onto.save(file=output_file, format="rdfxml")
-print(f"\n✅ Ontology saved to {output_file}")
+# === CONFIG ===
+ONTOLOGY_PATH = "../ontology-owl/test.owl"
+OUTPUT_PATH = "dietsubclasses.owl"
+
+
+@register_pass
+class DietTypePass(OntologyPass):
+    """Make every dish an instance of the DietType subclasses named in hasDietType."""
+    name = "diettype"
+    target = "Dish"
+
+    def __init__(self, anytime_class="Anytime"):
+        # normalize_ontology.py renames it when the meal-time pass, which also defines an Anytime class, runs too
+        self.anytime_class = anytime_class
+
+    def setup(self, onto, index):
+        # Ensure DietType and subclasses exist in ontology
+        with onto:
+            class DietType(Thing): pass
+            class Omnivore(DietType): pass
+            class Vegetarian(DietType): pass
+            class Vegan(DietType): pass
+            class Halal(DietType): pass
+            class Kosher(DietType): pass
+            Anytime = types.new_class(self.anytime_class, (DietType,))
+
+        # Keyword mapping (lowercase)
+        self.keyword_to_class = {
+            "omnivore": Omnivore,
+            "vegetarian": Vegetarian,
+            "vegan": Vegan,
+            "halal": Halal,
+            "kosher": Kosher,
+            "anytime": Anytime
+        }
+        for cls in self.keyword_to_class.values():
+            index.add(cls)
+
+    def visit(self, dish):
+        print(f"\n🍽️ Processing dish: {dish.name}")
+
+        if not hasattr(dish, "hasDietType") or not dish.hasDietType:
+            print("⚠️ No diet type found.")
+            return
+
+        for dt in dish.hasDietType:
+            label = dt.name
+            if not label:
+                print("⚠️ Diet type has no label.")
+                continue
+
+            print(f"🔍 Detected diet label: {label}")
+
+            # Normalize and split by comma/underscore/whitespace
+            raw_labels = label.lower().replace("_", ",").replace(" ", ",").split(",")
+            parsed_labels = [d for d in raw_labels if d]
+
+            for diet_name in parsed_labels:
+                if diet_name in self.keyword_to_class:
+                    subclass = self.keyword_to_class[diet_name]
+                    if subclass not in dish.is_a:
+                        dish.is_a.append(subclass)
+                        print(f"✅ Assigned {dish.name} to subclass {subclass.name}")
+                else:
+                    print(f"⚠️ Unknown diet type label: {diet_name}")
+
+
+if __name__ == "__main__":
+    run_pipeline(ONTOLOGY_PATH, OUTPUT_PATH, [DietTypePass()])
@@ -1,5 +1,11 @@
+import os
+import sys
 import rdflib
-import ollama
+from ontology_snapshot import load_graph
+from ntriples_io import save_graph
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "datapopulation-scripts"))
+from enrichment import Enricher, OllamaBackend
 
 '''
 BEFORE RUNNING: delete Subclasses of Dish from .owl file
@@ -13,6 +19,7 @@ OUTPUT_PATH = "classified_dishes.owl"             # Output file with classificat
 DISH_CLASS_URI = "http://example.org/german-cuisine#Dish"
 DISH_SUBCLASS_BASE = "http://example.org/german-cuisine#"  # Base for subclass URIs
 MODEL_NAME = "gemma3:1b"  # Ollama model name
+MAX_IN_FLIGHT = int(os.environ.get("OLLAMA_NUM_PARALLEL", "4"))  # Dishes classified concurrently
 
 # === SUBCLASSES ===
 DISH_SUBCLASSES = [
@@ -26,8 +33,7 @@ DISH_SUBCLASSES = [
 
 def load_ontology(path):
     print("[INFO] Loading ontology...")
-    g = rdflib.Graph()
-    g.parse(path)
+    g = load_graph(path)
     print(f"[INFO] Ontology loaded. Total triples: {len(g)}")
     return g
 
@@ -48,7 +54,7 @@ def get_dish_instances(graph):
     print(f"[INFO] Found {len(dishes)} dishes.")
     return dishes
 
-def classify_dish_with_llm(dish_name):
+def classify_dish_with_llm(enricher, dish_name):
     print(f"[INFO] Classifying dish: {dish_name}")
     prompt = f"""
     You are a domain expert in German cuisine.
@@ -59,11 +65,7 @@ def classify_dish_with_llm(dish_name):
 
     Respond with only the category name.
     """
-    response = ollama.chat(
-        model=MODEL_NAME,
-        messages=[{"role": "user", "content": prompt}]
-    )
-    category = response["message"]["content"].strip()
+    category = enricher.ask(prompt, parse=str.strip)
     print(f"[RESULT] '{dish_name}' classified as '{category}'\n")
     return category
 
@@ -74,13 +76,21 @@ def main():
     # Limit to first 5 dishes for testing
     dishes = dishes[:5]
 
-    results = {}
+    enricher = Enricher(backend=OllamaBackend(api="chat", pool_size=MAX_IN_FLIGHT), model=MODEL_NAME, max_in_flight=MAX_IN_FLIGHT)
+    results = enricher.map(
+        dishes,
+        lambda batch: {uri: classify_dish_with_llm(enricher, uri_to_label(uri)) for uri in batch},
+        key=lambda uri: uri
+    )
+
     for dish_uri in dishes:
         dish_name = uri_to_label(dish_uri)
         print(f"[INFO] Processing dish: {dish_name}")
-        
-        category = classify_dish_with_llm(dish_name)
-        results[dish_uri] = category
+
+        category = results.get(dish_uri)
+        if not category:
+            print(f"[WARN] No classification for '{dish_name}', keeping it as Dish")
+            continue
 
         # Remove ONLY the rdf:type Dish triple
         g.remove((
@@ -104,13 +114,14 @@ def main():
         ))
 
     # Save updated ontology
-    g.serialize(destination=OUTPUT_PATH, format="xml")
+    save_graph(g, OUTPUT_PATH)
     print(f"[INFO] Ontology saved to {OUTPUT_PATH}")
 
     # Print summary
     print("[SUMMARY] Final classification results:")
     for uri, category in results.items():
         print(f"{uri} -> {category}")
+    enricher.print_stats()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,33 @@
+import os
+from ontology_pipeline import PASSES, run_pipeline
+
+# Importing the scripts registers their passes, in this order
+import assign_meatcut  # noqa: F401
+import assign_subclass_mealeatenatpartofday  # noqa: F401
+import assign_subclass_diettype  # noqa: F401
+import assign_subclass_beverages  # noqa: F401
+
+'''
+Run all ontology fix-ups in one go: one load, one traversal of the dishes and
+beverages, one save. Replaces running the assign_*.py scripts one after the
+other through updated_ontology2.owl / dietsubclasses.owl / beveragetypes-merged.owl.
+
+The meal-time and diet-type passes each define an Anytime class. Run on their
+own they keep gc:Anytime; when both run here they would merge into one class
+under two parents, so they get AnytimeMeal and AnytimeDiet instead.
+'''
+
+# === CONFIG ===
+ONTOLOGY_PATH = "../ontology-owl/v2-ontology.owl"
+OUTPUT_PATH = "normalized_ontology.owl"
+# Comma-separated pass names to run, e.g. "meatcut,beverages" - empty runs all registered passes
+PASS_NAMES = [name for name in os.environ.get("ONTOLOGY_PASSES", "").split(",") if name]
+# Pass options when both Anytime passes share the graph
+SHARED_ANYTIME = {"mealeatenatpartofday": {"anytime_class": "AnytimeMeal"},
+                  "diettype": {"anytime_class": "AnytimeDiet"}}
+
+
+if __name__ == "__main__":
+    names = PASS_NAMES or list(PASSES)
+    options = SHARED_ANYTIME if set(SHARED_ANYTIME) <= set(names) else {}
+    run_pipeline(ONTOLOGY_PATH, OUTPUT_PATH, [PASSES[name](**options.get(name, {})) for name in names])
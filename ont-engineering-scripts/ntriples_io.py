@@ -0,0 +1,178 @@
+import gzip
+import heapq
+import os
+import tempfile
+import time
+
+from rdflib import Literal
+
+'''
+Streaming N-Triples / N-Quads export and import.
+
+RDF/XML serialization builds the whole document in memory and is the slowest
+writer rdflib has. export_graph streams one line per triple instead: lines are
+sorted in chunks of CHUNK_SIZE, spilled to temporary run files and merged, so
+memory stays bounded and the output is in a stable sorted order (two versions
+of the ontology diff line by line). A ".gz" suffix writes gzip.
+
+save_graph / save_ontology are drop-in replacements for g.serialize(xml) and
+onto.save(rdfxml): they write N-Triples when the path ends in .nt/.nq(.gz)
+or when ONTOLOGY_EXPORT_FORMAT is "nt" / "nt.gz", and RDF/XML otherwise.
+'''
+
+# === CONFIG ===
+CHUNK_SIZE = 200_000  # Lines sorted in memory at once
+EXPORT_FORMAT = os.environ.get("ONTOLOGY_EXPORT_FORMAT", "rdfxml")  # "rdfxml", "nt" or "nt.gz"
+LINE_FORMATS = (".nt", ".nq", ".nt.gz", ".nq.gz")
+
+
+def _open(path, mode):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8", compresslevel=6)
+    return open(path, mode, encoding="utf-8")
+
+
+def _literal(o):
+    # Literal.n3() writes multi-line values as """...""", which N-Triples does not allow
+    text = str(o).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n").replace("\r", "\\r")
+    if o.language:
+        return f'"{text}"@{o.language}'
+    if o.datatype:
+        return f'"{text}"^^<{o.datatype}>'
+    return f'"{text}"'
+
+
+def triple_line(s, p, o, context=""):
+    """One N-Triples line (N-Quads with a " <graph>" context); literals always fit on the line."""
+    obj = _literal(o) if isinstance(o, Literal) else o.n3()
+    return f"{s.n3()} {p.n3()} {obj}{context} .\n"
+
+
+def triple_lines(graph, graph_name=None):
+    """N-Triples lines of an rdflib graph (N-Quads when graph_name is given)."""
+    context = f" <{graph_name}>" if graph_name else ""
+    for s, p, o in graph:
+        yield triple_line(s, p, o, context)
+
+
+def write_sorted(lines, path, chunk_size=CHUNK_SIZE):
+    """External sort: sorted runs of chunk_size lines on disk, merged into path. Duplicates are dropped."""
+    runs = []
+    tmp_dir = tempfile.mkdtemp(prefix="nt-runs-")
+    chunk = []
+    count = 0
+
+    def spill():
+        run_path = os.path.join(tmp_dir, f"run{len(runs)}.nt")
+        with open(run_path, "w", encoding="utf-8") as f:
+            f.writelines(sorted(chunk))
+        runs.append(run_path)
+        chunk.clear()
+
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= chunk_size:
+            spill()
+    if chunk or not runs:
+        spill()
+
+    files = [open(run_path, encoding="utf-8") for run_path in runs]
+    try:
+        with _open(path, "w") as out:
+            previous = None
+            for line in heapq.merge(*files):
+                if line != previous:
+                    out.write(line)
+                    count += 1
+                previous = line
+    finally:
+        for f in files:
+            f.close()
+        for run_path in runs:
+            os.remove(run_path)
+        os.rmdir(tmp_dir)
+    return count
+
+
+def export_graph(graph, path, graph_name=None, chunk_size=CHUNK_SIZE):
+    """Stream an rdflib graph to sorted N-Triples (or N-Quads with graph_name)."""
+    start = time.perf_counter()
+    count = write_sorted(triple_lines(graph, graph_name), path, chunk_size)
+    print(f"📤 Exported {count} triples to {path} in {time.perf_counter() - start:.2f}s")
+    return count
+
+
+def export_ontology(onto, path, chunk_size=CHUNK_SIZE):
+    """Stream an owlready2 ontology to sorted N-Triples via owlready2's own line writer."""
+    start = time.perf_counter()
+    tmp_fd, tmp_path = tempfile.mkstemp(suffix=".nt")
+    os.close(tmp_fd)
+    try:
+        onto.save(file=tmp_path, format="ntriples")
+        with open(tmp_path, encoding="utf-8") as f:
+            count = write_sorted((line if line.endswith("\n") else line + "\n" for line in f if line.strip()),
+                                 path, chunk_size)
+    finally:
+        os.remove(tmp_path)
+    print(f"📤 Exported {count} triples to {path} in {time.perf_counter() - start:.2f}s")
+    return count
+
+
+def read_lines(path, chunk_size=CHUNK_SIZE):
+    """Yield the lines of an .nt/.nq(.gz) file in chunks of up to chunk_size lines."""
+    chunk = []
+    with _open(path, "r") as f:
+        for line in f:
+            if line.strip() and not line.startswith("#"):
+                chunk.append(line)
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+    if chunk:
+        yield chunk
+
+
+def load_ntriples(path, graph=None, chunk_size=CHUNK_SIZE):
+    """
+    Streaming loader for files written by export_graph: parses chunk_size lines at a time.
+    N-Quads (.nq) are loaded into an rdflib Dataset, N-Triples into a Graph.
+    """
+    from rdflib import Dataset, Graph
+
+    start = time.perf_counter()
+    quads = ".nq" in os.path.basename(path)
+    if graph is None:
+        graph = Dataset() if quads else Graph()
+    for chunk in read_lines(path, chunk_size):
+        graph.parse(data="".join(chunk), format="nquads" if quads else "nt")
+    print(f"📥 Loaded {path} in {time.perf_counter() - start:.2f}s")
+    return graph
+
+
+def _line_path(path):
+    """Where to write when EXPORT_FORMAT asks for N-Triples but path is an RDF/XML name."""
+    if path.endswith(LINE_FORMATS):
+        return path
+    if EXPORT_FORMAT in ("nt", "nt.gz"):
+        return os.path.splitext(path)[0] + "." + EXPORT_FORMAT
+    return None
+
+
+def save_graph(graph, path):
+    """g.serialize(destination=path, format="xml"), or a streamed N-Triples export (see module doc)."""
+    line_path = _line_path(path)
+    if line_path:
+        export_graph(graph, line_path)
+        return line_path
+    graph.serialize(destination=path, format="xml")
+    return path
+
+
+def save_ontology(onto, path, format="rdfxml"):
+    """onto.save(file=path, format=format), or a streamed N-Triples export (see module doc)."""
+    line_path = _line_path(path)
+    if line_path:
+        export_ontology(onto, line_path)
+        return line_path
+    onto.save(file=path, format=format)
+    return path
@@ -0,0 +1,63 @@
+import types
+
+'''
+Local name -> entity index for an owlready2 ontology.
+
+onto.search_one(iri="*" + name) is a leading-wildcard scan over the whole
+quadstore, so calling it once per dish is O(dishes x entities). EntityIndex
+reads every class and individual once and answers lookups from dicts.
+Names are matched case-insensitively with spaces, hyphens and underscores
+treated alike ("Pork Belly" == "pork_belly"). Classes and individuals are
+indexed separately because the ontology reuses names across both.
+
+Create new entities through new_class / new_individual (or register them with
+add) so the index stays in sync with the ontology.
+'''
+
+
+def normalize_key(name):
+    return str(name).strip(" '\"").lower().replace(" ", "_").replace("-", "_")
+
+
+class EntityIndex:
+    def __init__(self, onto):
+        self.onto = onto
+        self.classes = {}
+        self.individuals = {}
+        for cls in onto.classes():
+            self._put(self.classes, cls)
+        for indiv in onto.individuals():
+            self._put(self.individuals, indiv)
+        print(f"🗂️ Indexed {len(self.classes)} classes and {len(self.individuals)} individuals")
+
+    @staticmethod
+    def _put(table, entity):
+        # First entity wins, like search_one
+        table.setdefault(normalize_key(entity.name), entity)
+
+    def add(self, entity):
+        """Register an entity created outside this index."""
+        from owlready2 import ThingClass
+        self._put(self.classes if isinstance(entity, ThingClass) else self.individuals, entity)
+        return entity
+
+    def cls(self, name):
+        return self.classes.get(normalize_key(name))
+
+    def individual(self, name):
+        return self.individuals.get(normalize_key(name))
+
+    def find(self, name):
+        """Individual or class with this local name, individuals first."""
+        return self.individual(name) or self.cls(name)
+
+    def new_class(self, name, bases):
+        with self.onto:
+            return self.add(types.new_class(name, tuple(bases)))
+
+    def new_individual(self, cls, name):
+        with self.onto:
+            return self.add(cls(name))
+
+    def get_or_create_class(self, name, bases):
+        return self.cls(name) or self.new_class(name, bases)
@@ -0,0 +1,73 @@
+import time
+
+from ontology_snapshot import load_ontology
+from ontology_index import EntityIndex
+from ntriples_io import save_ontology
+
+'''
+Single-pass runner for the ontology fix-up scripts.
+
+Every fix (meat cuts, meal times, diet types, beverage subclasses) is an
+OntologyPass registered with @register_pass. run_pipeline loads the ontology
+once, lets each pass set up its classes, then walks the instances of each
+target class ONCE and hands every individual to all passes interested in it,
+and saves a single output file - instead of one load / traversal / RDF/XML
+save per script chained through intermediate .owl files.
+
+Run all registered passes:
+    python normalize_ontology.py
+Each assign_*.py script still runs on its own through the same runner.
+'''
+
+PASSES = {}  # name -> pass class, in registration order
+
+
+def register_pass(cls):
+    PASSES[cls.name] = cls
+    return cls
+
+
+class OntologyPass:
+    name = None
+    target = None  # Local name of the class whose instances visit() gets, e.g. "Dish"
+
+    def setup(self, onto, index):
+        """Create/look up the classes and individuals the pass needs."""
+
+    def visit(self, individual):
+        """Fix one instance of the target class."""
+
+    def finish(self):
+        """Print a summary after the traversal."""
+
+
+def run_pipeline(input_path, output_path, passes=None, format="rdfxml"):
+    """Apply passes (instances, default: one of every registered pass) in a single traversal and save once."""
+    passes = passes if passes is not None else [cls() for cls in PASSES.values()]
+    start = time.perf_counter()
+    onto = load_ontology(input_path)
+    index = EntityIndex(onto)
+
+    by_target = {}
+    for p in passes:
+        p.setup(onto, index)
+        by_target.setdefault(p.target, []).append(p)
+    print(f"🔧 Passes: {', '.join(p.name for p in passes)}")
+
+    for target, target_passes in by_target.items():
+        target_class = index.cls(target)
+        if not target_class:
+            raise ValueError(f"❌ Could not find {target} class in ontology")
+        # Materialize first: passes change is_a, which would disturb a live instances() iterator
+        individuals = list(target_class.instances())
+        print(f"🚶 Visiting {len(individuals)} {target} instances for {len(target_passes)} passes")
+        for individual in individuals:
+            for p in target_passes:
+                p.visit(individual)
+
+    for p in passes:
+        p.finish()
+
+    output_path = save_ontology(onto, output_path, format=format)
+    print(f"\n✅ Ontology saved to {output_path} ({time.perf_counter() - start:.1f}s)")
+    return onto
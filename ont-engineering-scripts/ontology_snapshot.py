@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import time
+
+from ntriples_io import LINE_FORMATS, load_ntriples
+
+'''
+Compiled snapshots of the ontology files.
+
+Parsing a 3 MB RDF/XML ontology takes seconds on every run. The first load of
+a file parses it once and stores a snapshot next to this module:
+  - owlready2: the World's SQLite quadstore (<name>.<hash>.sqlite3)
+  - rdflib:    the pickled Graph (<name>.<hash>.graph.pickle)
+Later loads open the snapshot directly. Snapshots are keyed by the sha256 of
+the source file, so editing the .owl/.rdf invalidates them automatically and
+stale snapshots of the same file are removed.
+
+Usage:
+    onto = load_ontology("../ontology-owl/v2-ontology.owl")   # owlready2 Ontology
+    g = load_graph("v8-ontology.rdf", format="xml")            # rdflib Graph
+'''
+
+# === CONFIG ===
+SNAPSHOT_DIR = os.environ.get(
+    "ONTOLOGY_SNAPSHOT_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".ontology-snapshots")
+)
+SNAPSHOTS_ENABLED = os.environ.get("ONTOLOGY_SNAPSHOTS", "1") == "1"
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _snapshot_path(source_path, suffix):
+    """Snapshot file for the current content of source_path; older snapshots of it are deleted."""
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    name = os.path.basename(source_path)
+    current = os.path.join(SNAPSHOT_DIR, f"{name}.{file_hash(source_path)[:16]}{suffix}")
+    for existing in os.listdir(SNAPSHOT_DIR):
+        stale = os.path.join(SNAPSHOT_DIR, existing)
+        # Also catches the .json metadata written next to a quadstore snapshot
+        if existing.startswith(name + ".") and suffix in existing and not stale.startswith(current):
+            os.remove(stale)
+            print(f"🧹 Removed stale snapshot {existing}")
+    return current
+
+
+def load_ontology(path, format=None):
+    """
+    owlready2 equivalent of get_ontology(path).load(format=...), served from a quadstore snapshot.
+    The snapshot itself is never modified: every run works on a throwaway copy in a temporary
+    directory that lives as long as the World, so scripts can change the ontology and save it
+    to a new file as before.
+    """
+    from owlready2 import World, get_ontology
+
+    start = time.perf_counter()
+    path = os.path.abspath(path)
+    load_kwargs = {"format": format} if format else {}
+    if not SNAPSHOTS_ENABLED:
+        onto = get_ontology(path).load(**load_kwargs)
+        print(f"📖 Parsed {os.path.basename(path)} in {time.perf_counter() - start:.2f}s (snapshots disabled)")
+        return onto
+
+    snapshot = _snapshot_path(path, ".sqlite3")
+    meta_path = snapshot + ".json"
+    if not (os.path.exists(snapshot) and os.path.exists(meta_path)):
+        tmp_snapshot = snapshot + ".tmp"
+        if os.path.exists(tmp_snapshot):
+            os.remove(tmp_snapshot)
+        world = World(filename=tmp_snapshot)
+        onto = world.get_ontology(path).load(**load_kwargs)
+        world.save()
+        base_iri = onto.base_iri
+        world.close()
+        os.replace(tmp_snapshot, snapshot)
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump({"source": path, "base_iri": base_iri}, f)
+        print(f"📦 Compiled snapshot of {os.path.basename(path)} in {time.perf_counter() - start:.2f}s")
+        start = time.perf_counter()
+
+    with open(meta_path, encoding="utf-8") as f:
+        meta = json.load(f)
+    # Removed when the World is garbage collected, at the latest when the interpreter exits
+    working_dir = tempfile.TemporaryDirectory(prefix="onto-")
+    working_copy = os.path.join(working_dir.name, os.path.basename(snapshot))
+    shutil.copyfile(snapshot, working_copy)
+    world = World(filename=working_copy)
+    world.working_dir = working_dir
+    onto = world.get_ontology(meta["base_iri"]).load()
+    print(f"⚡ Loaded {os.path.basename(path)} from snapshot in {time.perf_counter() - start:.3f}s")
+    return onto
+
+
+def _parse_graph(path, format=None):
+    from rdflib import Graph
+
+    if path.endswith(LINE_FORMATS):
+        return load_ntriples(path)
+    g = Graph()
+    g.parse(path, format=format)
+    return g
+
+
+def load_graph(path, format=None):
+    """rdflib equivalent of Graph().parse(path, format=...), served from a pickled snapshot."""
+    start = time.perf_counter()
+    if not SNAPSHOTS_ENABLED:
+        g = _parse_graph(path, format)
+        print(f"📖 Parsed {os.path.basename(path)} in {time.perf_counter() - start:.2f}s (snapshots disabled)")
+        return g
+
+    snapshot = _snapshot_path(path, ".graph.pickle")
+    if os.path.exists(snapshot):
+        with open(snapshot, "rb") as f:
+            g = pickle.load(f)
+        print(f"⚡ Loaded {os.path.basename(path)} from snapshot in {time.perf_counter() - start:.3f}s")
+        return g
+
+    g = _parse_graph(path, format)
+    tmp_snapshot = snapshot + ".tmp"
+    with open(tmp_snapshot, "wb") as f:
+        pickle.dump(g, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_snapshot, snapshot)
+    print(f"📦 Compiled snapshot of {os.path.basename(path)} in {time.perf_counter() - start:.2f}s")
+    return g
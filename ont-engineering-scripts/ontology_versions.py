@@ -0,0 +1,227 @@
+import argparse
+import gzip
+import json
+import os
+import time
+
+from ntriples_io import read_lines, triple_line, triple_lines, write_sorted
+
+'''
+Versioned ontology store: one base snapshot plus a triple-level delta per version.
+
+Instead of a full 3 MB copy per version (v8 -> v9 -> v10), the store keeps
+  <store>/base.nt.gz                sorted N-Triples of the first version
+  <store>/deltas/<version>.delta.gz lines "+ <triple>" / "- <triple>" against the parent
+  <store>/manifest.json             version -> parent, delta file, counts
+so writing a version costs as much as its change. Any version can be
+materialized (base + deltas along its chain) and any two versions diffed.
+
+Scripts record what they change with a ChangeRecorder and commit only that:
+    changes = ChangeRecorder(g)
+    changes.remove((s, p, None)); changes.add((s, p, o))
+    VersionStore(STORE).commit("v9", changes, parent="v8")
+
+Importing existing full copies (each one is diffed against the previous):
+    python ontology_versions.py import v8 ../ontology-update-scripts/v8-ontology.rdf v9 ../ontology-update-scripts/v9-ontology.rdf
+    python ontology_versions.py log
+    python ontology_versions.py diff v8 v10
+    python ontology_versions.py materialize v10 v10-ontology.nt.gz
+
+Blank nodes get new labels on every parse, so triples with blank nodes show up
+as changed when whole files are diffed; recorded changes are not affected.
+'''
+
+# === CONFIG ===
+DEFAULT_STORE = os.environ.get(
+    "ONTOLOGY_VERSION_STORE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ontology-versions")
+)
+
+
+class ChangeRecorder:
+    """Wraps an rdflib graph, applies add/remove to it and remembers the net triple-level change."""
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.added = set()  # N-Triples lines
+        self.removed = set()
+
+    def add(self, triple):
+        if triple not in self.graph:
+            line = triple_line(*triple)
+            if line in self.removed:
+                self.removed.discard(line)
+            else:
+                self.added.add(line)
+        self.graph.add(triple)
+
+    def addN(self, quads):
+        for s, p, o, _ in quads:
+            self.add((s, p, o))
+
+    def remove(self, pattern):
+        for triple in list(self.graph.triples(pattern)):
+            line = triple_line(*triple)
+            if line in self.added:
+                self.added.discard(line)
+            else:
+                self.removed.add(line)
+            self.graph.remove(triple)
+
+    def __len__(self):
+        return len(self.added) + len(self.removed)
+
+
+class VersionStore:
+    def __init__(self, path=DEFAULT_STORE):
+        self.path = path
+        self.manifest_path = os.path.join(path, "manifest.json")
+        self.base_path = os.path.join(path, "base.nt.gz")
+        os.makedirs(os.path.join(path, "deltas"), exist_ok=True)
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        else:
+            self.manifest = {"base": None, "versions": {}}
+
+    def __contains__(self, version):
+        return version == self.manifest["base"] or version in self.manifest["versions"]
+
+    def _save_manifest(self):
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    # --- writing ---
+
+    def init_base(self, version, graph):
+        """Store graph as the base snapshot everything else is a delta against."""
+        if self.manifest["base"]:
+            raise ValueError(f"Store {self.path} already has base version {self.manifest['base']}")
+        count = write_sorted(triple_lines(graph), self.base_path)
+        self.manifest["base"] = version
+        self.manifest["base_triples"] = count
+        self._save_manifest()
+        print(f"🧱 Base version {version}: {count} triples")
+
+    def commit(self, version, changes, parent):
+        """Store a version as the recorded changes (ChangeRecorder or (added, removed) line sets) to parent."""
+        if parent not in self:
+            raise ValueError(f"Unknown parent version {parent}")
+        if version in self:
+            raise ValueError(f"Version {version} already exists")
+        start = time.perf_counter()
+        added, removed = (changes.added, changes.removed) if isinstance(changes, ChangeRecorder) else changes
+        delta_file = os.path.join("deltas", f"{version}.delta.gz")
+        with gzip.open(os.path.join(self.path, delta_file), "wt", encoding="utf-8") as f:
+            f.writelines("- " + line for line in sorted(removed))
+            f.writelines("+ " + line for line in sorted(added))
+        self.manifest["versions"][version] = {
+            "parent": parent, "delta": delta_file, "added": len(added), "removed": len(removed),
+            "created": time.strftime("%Y-%m-%d %H:%M:%S")
+        }
+        self._save_manifest()
+        print(f"🏷️ Version {version}: +{len(added)} / -{len(removed)} triples vs {parent} "
+              f"({time.perf_counter() - start:.2f}s)")
+
+    def commit_graph(self, version, graph, parent):
+        """Store a full graph as a version by diffing it against its parent (costs a full comparison)."""
+        if not self.manifest["base"]:
+            self.init_base(version, graph)
+            return
+        old = self.lines(parent)
+        new = set(triple_lines(graph))
+        self.commit(version, (new - old, old - new), parent)
+
+    # --- reading ---
+
+    def chain(self, version):
+        """Versions from the base up to and including version."""
+        chain = []
+        while version != self.manifest["base"]:
+            if version not in self.manifest["versions"]:
+                raise ValueError(f"Unknown version {version}")
+            chain.append(version)
+            version = self.manifest["versions"][version]["parent"]
+        return [version] + chain[::-1]
+
+    def lines(self, version):
+        """Set of N-Triples lines of a version."""
+        lines = set()
+        for chunk in read_lines(self.base_path):
+            lines.update(chunk)
+        for v in self.chain(version)[1:]:
+            with gzip.open(os.path.join(self.path, self.manifest["versions"][v]["delta"]), "rt", encoding="utf-8") as f:
+                for entry in f:
+                    if entry.startswith("- "):
+                        lines.discard(entry[2:])
+                    elif entry.startswith("+ "):
+                        lines.add(entry[2:])
+        return lines
+
+    def materialize(self, version, path=None):
+        """Write a version to an N-Triples file (path given) or return it as an rdflib Graph."""
+        start = time.perf_counter()
+        lines = self.lines(version)
+        if path:
+            count = write_sorted(iter(lines), path)
+            print(f"📦 Materialized {version} ({count} triples) to {path} in {time.perf_counter() - start:.2f}s")
+            return path
+        from rdflib import Graph
+        g = Graph()
+        g.parse(data="".join(lines), format="nt")
+        print(f"📦 Materialized {version} ({len(g)} triples) in {time.perf_counter() - start:.2f}s")
+        return g
+
+    def diff(self, old_version, new_version):
+        """(added, removed) N-Triples lines going from old_version to new_version."""
+        old, new = self.lines(old_version), self.lines(new_version)
+        return new - old, old - new
+
+    def log(self):
+        print(f"{self.manifest['base']} (base, {self.manifest.get('base_triples', '?')} triples)")
+        for version, info in self.manifest["versions"].items():
+            print(f"{version} <- {info['parent']}: +{info['added']} / -{info['removed']} ({info['created']})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Delta-based ontology version store")
+    parser.add_argument("--store", default=DEFAULT_STORE)
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="import full ontology files as consecutive versions")
+    imp.add_argument("pairs", nargs="+", help="version file [version file ...]")
+    sub.add_parser("log")
+    dif = sub.add_parser("diff")
+    dif.add_argument("old")
+    dif.add_argument("new")
+    mat = sub.add_parser("materialize")
+    mat.add_argument("version")
+    mat.add_argument("output")
+    args = parser.parse_args()
+
+    store = VersionStore(args.store)
+    if args.command == "import":
+        from ontology_snapshot import load_graph
+        parent = None
+        versions = store.manifest["versions"]
+        if versions or store.manifest["base"]:
+            parent = list(versions)[-1] if versions else store.manifest["base"]
+        for version, path in zip(args.pairs[::2], args.pairs[1::2]):
+            store.commit_graph(version, load_graph(path), parent)
+            parent = version
+    elif args.command == "log":
+        store.log()
+    elif args.command == "diff":
+        added, removed = store.diff(args.old, args.new)
+        for line in sorted(removed):
+            print("-", line, end="")
+        for line in sorted(added):
+            print("+", line, end="")
+        print(f"\n{args.old} -> {args.new}: +{len(added)} / -{len(removed)} triples")
+    elif args.command == "materialize":
+        store.materialize(args.version, args.output)
+
+
+if __name__ == "__main__":
+    main()
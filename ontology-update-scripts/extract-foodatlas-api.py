@@ -1,10 +1,44 @@
+import csv
 import html
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
-import pandas as pd
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 
-BASE_URL = "https://www.tasteatlas.com/api/v3/regions/55/data"
-LOGIN_URL = "https://www.tasteatlas.com/account/LoginAjax"
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "datapopulation-scripts"))
+from german_text import normalize_german_chars
+
+'''
+TasteAtlas (region 55, Germany) dishes and drinks -> dishes.csv / drinks.csv.
+
+Pages are fetched concurrently (at most MAX_WORKERS requests in flight, one
+pooled session) and the dish and drink streams run side by side. Rows are
+appended to the CSVs as pages arrive, in page order (a page that arrives
+early waits for the ones before it). Failed requests are retried MAX_RETRIES
+times with exponential backoff; pages that still fail are reported at the end
+and do not end the stream - only an empty page does. Every raw page is kept as JSON in
+PAGE_CACHE_DIR, so changing the parsing only needs a rerun without network
+(TASTEATLAS_REFRESH=1 refetches). Point TASTEATLAS_URL at a local mock server
+to run the script offline.
+'''
+
+# === CONFIG ===
+SITE_URL = os.environ.get("TASTEATLAS_URL", "https://www.tasteatlas.com")
+MAX_WORKERS = int(os.environ.get("TASTEATLAS_WORKERS", "6"))
+PAGE_CACHE_DIR = os.environ.get(
+    "TASTEATLAS_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".tasteatlas-pages")
+)
+REFRESH = os.environ.get("TASTEATLAS_REFRESH", "0") == "1"
+TIMEOUT_S = 30
+MAX_RETRIES = 3
+BACKOFF_S = 1.0  # Wait before retry n is BACKOFF_S * 2**n
+
+BASE_URL = f"{SITE_URL}/api/v3/regions/55/data"
+LOGIN_URL = f"{SITE_URL}/account/LoginAjax"
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36 Edg/139.0.0.0",
@@ -30,118 +64,205 @@ LOGIN_HEADERS = {
 
 
 
-def normalize_german_chars(text: str) -> str:
-    """Replace German special characters with neutral forms."""
-    return (
-        text.replace("ä", "ae")
-        .replace("Ä", "Ae")
-        .replace("ö", "oe")
-        .replace("Ö", "Oe")
-        .replace("ü", "ue")
-        .replace("Ü", "Ue")
-        .replace("ß", "ss")
-        .replace("\n", " ")
-    )
+STREAMS = {  # kind -> (filters query value, EntityType of the items we keep, label)
+    "dishes": (1, 1, "dish"),
+    "drinks": (2, 2, "drink"),
+}
+TOTAL_KEYS = ("TotalCount", "Total", "Count", "TotalItems")  # Page-count hints, if the API sends one
 
 
 def login_session():
-    """Start a logged-in session with TasteAtlas."""
+    """Start a logged-in session with TasteAtlas, pooled for MAX_WORKERS parallel requests."""
     session = requests.Session()
-    resp = session.post(LOGIN_URL, data=login_payload, headers=LOGIN_HEADERS)
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS))
+    session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS))
+    resp = session.post(LOGIN_URL, data=login_payload, headers=LOGIN_HEADERS, timeout=TIMEOUT_S)
     print("Login response:", resp.text[:200], "...")
     return session
 
 
-def fetch_dishes(session):
-    print("Starting to fetch dishes...")
-    dishes = []
-    page = 0
-
-    while True:
-        url = f"{BASE_URL}?filters=1&page={page}&pageSize={PAGE_SIZE}&regionWhatToEatSortEnum=1&userViewpointRegionId=55"
-        print(f"Fetching page {page} (dishes)...")
-        response = session.get(url, headers=HEADERS)
-
-        if response.status_code != 200:
-            print("Error fetching dishes:", response.status_code)
-            break
-
-        data = response.json()
-        items = data.get("Data", [])
-        if not items:
-            print("No more dishes.")
-            break
-
-        for item in items:
-            if item.get("EntityType") == 1:  # dish
-                name = normalize_german_chars(item.get("Name", ""))
-                desc = normalize_german_chars(item.get("Description", ""))
-
-                
-                desc = html.unescape(desc)
-            
-                # strip tags if needed
-                desc = BeautifulSoup(desc, "html.parser").get_text()
-            
-                # strip tags if needed
-
-                print(f"Found dish: {name}")
-                dishes.append({"Name": name, "Description": desc})
-
-        page += 1
-
-    return dishes
-
-
-def fetch_drinks(session):
-    print("Starting to fetch drinks...")
-    drinks = []
-    page = 0
-
-    while True:
-        url = f"{BASE_URL}?filters=2&page={page}&pageSize={PAGE_SIZE}&regionWhatToEatSortEnum=1&userViewpointRegionId=55"
-        print(f"Fetching page {page} (drinks)...")
-        response = session.get(url, headers=HEADERS)
-
-        if response.status_code != 200:
-            print("Error fetching drinks:", response.status_code)
-            break
-
-        data = response.json()
-        items = data.get("Data", [])
-        if not items:
-            print("No more drinks.")
-            break
-
-        for item in items:
-            if item.get("EntityType") == 2:  # beverage
-                name = normalize_german_chars(item.get("Name", ""))
-                desc = normalize_german_chars(item.get("Description", ""))
-
-                desc = html.unescape(desc)
-            
-                # strip tags if needed
-                desc = BeautifulSoup(desc, "html.parser").get_text()
-
-                print(f"Found drink: {name}")
-                drinks.append({"Name": name, "Description": desc})
-
-        page += 1
-
-    return drinks
+def page_url(kind, page):
+    filters, _, _ = STREAMS[kind]
+    return f"{BASE_URL}?filters={filters}&page={page}&pageSize={PAGE_SIZE}&regionWhatToEatSortEnum=1&userViewpointRegionId=55"
+
+
+def fetch_page(session, kind, page):
+    """Raw JSON of one page, from the page cache when present; None if it still fails after MAX_RETRIES."""
+    cache_path = os.path.join(PAGE_CACHE_DIR, f"{kind}_{PAGE_SIZE}_{page}.json")
+    if not REFRESH and os.path.exists(cache_path):
+        with open(cache_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    print(f"Fetching page {page} ({kind})...")
+    data = None
+    for attempt in range(MAX_RETRIES + 1):
+        if attempt:
+            time.sleep(BACKOFF_S * 2 ** (attempt - 1))
+        try:
+            response = session.get(page_url(kind, page), headers=HEADERS, timeout=TIMEOUT_S)
+            if response.status_code == 200:
+                data = response.json()
+                break
+            print(f"Error fetching {kind} page {page} (attempt {attempt + 1}):", response.status_code)
+            if response.status_code != 429 and response.status_code < 500:
+                break  # Retrying will not change a client error
+        except (requests.RequestException, ValueError) as e:  # ValueError: the body is not JSON
+            print(f"Error fetching {kind} page {page} (attempt {attempt + 1}):", e)
+    if data is None:
+        return None
+    if data.get("Data"):  # Empty pages mark the end and may fill up later - not cached
+        os.makedirs(PAGE_CACHE_DIR, exist_ok=True)
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    return data
+
+
+def parse_items(data, kind):
+    _, entity_type, label = STREAMS[kind]
+    rows = []
+    for item in data.get("Data", []):
+        if item.get("EntityType") == entity_type:
+            name = normalize_german_chars(item.get("Name", ""))
+            desc = normalize_german_chars(item.get("Description", ""))
+            desc = html.unescape(desc)
+            # strip tags if needed
+            desc = BeautifulSoup(desc, "html.parser").get_text()
+            print(f"Found {label}: {name}")
+            rows.append({"Name": name, "Description": desc})
+    return rows
+
+
+def page_count(data):
+    for key in TOTAL_KEYS:
+        if isinstance(data.get(key), int):
+            return -(-data[key] // PAGE_SIZE)
+    return None
+
+
+class PageBuffer:
+    """Hands page rows to on_rows in page order, holding back pages that arrive before their predecessors."""
+
+    def __init__(self, on_rows=None):
+        self.on_rows = on_rows
+        self.rows = []
+        self.pending = {}  # page -> rows of pages that arrived before an earlier one
+        self.next_page = 0
+
+    def add(self, page, rows):
+        self.pending[page] = rows
+        while self.next_page in self.pending:
+            self._emit(self.pending.pop(self.next_page))
+            self.next_page += 1
+
+    def _emit(self, rows):
+        self.rows.extend(rows)
+        if self.on_rows and rows:
+            self.on_rows(rows)
+
+
+def fetch_stream(session, pool, kind, on_rows=None):
+    """
+    (rows, missing pages) of one kind. Pages run on pool; on_rows(rows) is called with each
+    page's rows in page order. A failed page counts as done without rows and is reported as missing.
+    """
+    print(f"Starting to fetch {kind}...")
+    buffer = PageBuffer(on_rows)
+    failed = set()
+    end = None  # First empty page, when the page count is not known up front
+
+    def collect(page, data):
+        nonlocal end
+        if data is None:
+            failed.add(page)
+        elif not data.get("Data"):
+            end = page if end is None else min(end, page)
+        else:
+            buffer.add(page, parse_items(data, kind))
+            return
+        buffer.add(page, [])
+
+    first = fetch_page(session, kind, 0)
+    if first is None:
+        print(f"❌ Could not fetch the first {kind} page.")
+        return [], [0]
+    if not first.get("Data"):
+        print(f"No {kind} found.")
+        return [], []
+    collect(0, first)
+
+    total = page_count(first)
+    if total is not None:
+        futures = {pool.submit(fetch_page, session, kind, page): page for page in range(1, total)}
+        for future in as_completed(futures):
+            collect(futures[future], future.result())
+    else:
+        # No page count in the response: probe MAX_WORKERS pages at a time until one comes back empty.
+        # A failed page is not the end - the probe goes on past it.
+        next_page = 1
+        while end is None:
+            futures = {pool.submit(fetch_page, session, kind, page): page
+                       for page in range(next_page, next_page + MAX_WORKERS)}
+            for future in as_completed(futures):
+                collect(futures[future], future.result())
+            if failed.issuperset(futures.values()):
+                print(f"❌ A whole batch of {kind} pages failed, stopping at page {next_page}.")
+                break
+            next_page += MAX_WORKERS
+
+    missing = sorted(page for page in failed if end is None or page < end)
+    print(f"No more {kind}: {len(buffer.rows)} rows.")
+    if missing:
+        print(f"⚠️ {len(missing)} {kind} pages could not be fetched and are missing: {missing}"
+              f" - rerun to fetch them (cached pages are not refetched)")
+    return buffer.rows, missing
+
+
+def fetch_dishes(session, pool=None, on_rows=None):
+    return _fetch(session, "dishes", pool, on_rows)
+
+
+def fetch_drinks(session, pool=None, on_rows=None):
+    return _fetch(session, "drinks", pool, on_rows)
+
+
+def _fetch(session, kind, pool, on_rows):
+    if pool is not None:
+        return fetch_stream(session, pool, kind, on_rows)[0]
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        return fetch_stream(session, pool, kind, on_rows)[0]
+
+
+class CsvSink:
+    """Append rows to a CSV as they arrive."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "w", newline="", encoding="utf-8-sig")
+        self.writer = csv.DictWriter(self.file, fieldnames=["Name", "Description"])
+        self.writer.writeheader()
+
+    def __call__(self, rows):
+        self.writer.writerows(rows)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
 
 
 if __name__ == "__main__":
     session = login_session()
-
-    # fetch dishes
-    dish_list = fetch_dishes(session)
-    df = pd.DataFrame(dish_list)
-    df.to_csv("dishes.csv", index=False, encoding="utf-8-sig")
-    print("Saved to dishes.csv")
-
-    # fetch drinks
-    drink_list = fetch_drinks(session)
-    df = pd.DataFrame(drink_list)
-    df.to_csv("drinks.csv", index=False, encoding="utf-8-sig")
-    print("Saved to drinks.csv")
+    sinks = {"dishes": CsvSink("dishes.csv"), "drinks": CsvSink("drinks.csv")}
+
+    # One request pool (the concurrency cap) shared by both streams, which run side by side
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool, ThreadPoolExecutor(max_workers=2) as streams:
+        results = {
+            kind: streams.submit(fetch_stream, session, pool, kind, sinks[kind])
+            for kind in STREAMS
+        }
+        for kind, future in results.items():
+            rows, missing = future.result()
+            sinks[kind].close()
+            print(f"Saved {len(rows)} {kind} to {sinks[kind].path}"
+                  + (f" ({len(missing)} pages missing: {missing})" if missing else ""))
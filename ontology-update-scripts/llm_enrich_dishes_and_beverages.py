@@ -1,42 +1,40 @@
+import os
+import sys
 import pandas as pd
-import ollama
-import json
 from rdflib import Graph, Namespace, URIRef, Literal
 from rdflib.namespace import RDF, OWL, XSD
 import ast
 
-
-def normalize_german_chars(text: str) -> str:
-    """Replace German special characters with neutral forms."""
-    return (
-        text.replace("ä", "ae")
-        .replace("Ä", "Ae")
-        .replace("ö", "oe")
-        .replace("Ö", "Oe")
-        .replace("ü", "ue")
-        .replace("Ü", "Ue")
-        .replace("ß", "ss")
-        .replace("\n", " ")
-    )
-
-def clean_llm_response(content: str) -> dict | None:
-    """
-    Cleans and parses LLM output into JSON.
-    Returns a dict if successful, else None.
-    """
-    content = content.strip()
-
-    # Remove code fences if model adds them
-    if content.startswith("```"):
-        content = content.strip("`")
-        if content.lower().startswith("json"):
-            content = content[4:].strip()
-
-    try:
-        return json.loads(content)
-    except json.JSONDecodeError as e:
-        print("Parsing error:", e, "\nRaw content:", content)
-        return None
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "datapopulation-scripts"))
+from enrichment import Enricher, OllamaBackend, clean_llm_response
+from german_text import normalize_series
+from llm_journal import RowJournal
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ontologycreation-scripts"))
+from bulk_loader import entity_names
+from edge_tables import build_edge_tables
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ont-engineering-scripts"))
+from ntriples_io import save_graph
+from ontology_versions import ChangeRecorder, VersionStore
+
+ENRICH_MODEL = "gemma3:4b"
+MAX_IN_FLIGHT = int(os.environ.get("OLLAMA_NUM_PARALLEL", "4"))  # Drinks enriched concurrently
+
+# Schema of the drink enrichment answer, sent as Ollama's "format" in structured mode
+DRINK_FIELD_SCHEMAS = {
+    "class": {"type": "string", "enum": ["Alcoholic", "NonAlcoholic"]},
+    "subclass": {"type": "string", "enum": [
+        "Beer", "Brandy", "Cocktail", "Digestif", "FermentedAlcoholic", "Liquor", "Malt_beverage", "Spirit", "Spritzer", "Wine",
+        "Coffee", "Hot_Chocolate", "Icetea", "Juice", "NonAlcoholicBeer", "Soda", "Tea", "Water"
+    ]},
+    "HasMainIngredient": {"type": ["string", "null"]},
+    "HasIngredient": {"type": "array", "items": {"type": "string"}},
+    "HasRegion": {"type": ["string", "null"]},
+    "HasServingTemperature": {"enum": ["Chilled", "Frozen", "Hot", "RoomTemperature", None]},
+    "HasFlavorProfile": {"type": ["string", "null"]},
+    "HasAlcoholContent": {"type": "number"},
+    "IsCarbonated": {"type": "boolean"},
+    "IsGermanStaple": {"type": "boolean"},
+}
 
 
 def build_prompt_drink(name: str, description: str) -> str:
@@ -82,38 +80,69 @@ Only output pure JSON. Do not include code fences, markdown, or explanations.
 
 
 
-def enrich_drinks(csv_path: str, output_path: str, limit: int | None = None):
+def enrich_drinks(csv_path: str, output_path: str, limit: int | None = None, checkpoint: bool = True, structured: bool = False):
     """
     Enrich drinks dataset with ontology attributes.
+    With checkpoint=True every enriched drink is appended to <output_path>.journal.jsonl
+    as soon as it is done, and a rerun after a crash or with failed drinks only queries the
+    missing drinks. The journal is removed once every drink succeeded.
+    With structured=True the answer is constrained by DRINK_FIELD_SCHEMAS (needs Ollama >= 0.5)
+    instead of being cleaned up by clean_llm_response.
     """
     df = pd.read_csv(csv_path, encoding="utf-8-sig")
     if limit:
         df = df.head(limit)
 
-    enriched_rows = []
-    
-    df["Description"] = df["Description"].apply(normalize_german_chars)
-    for _, row in df.iterrows():
+    enricher = Enricher(backend=OllamaBackend(api="chat", pool_size=MAX_IN_FLIGHT), model=ENRICH_MODEL, max_in_flight=MAX_IN_FLIGHT)
+    journal = RowJournal(output_path + ".journal.jsonl") if checkpoint else None
+
+    df["Description"] = normalize_series(df["Description"])
+
+    def enrich_one(row) -> dict:
         name = row["Name"]
         description = row["Description"][:160]  # limit description length
 
         prompt = build_prompt_drink(name, description)
-        response = ollama.chat(model="gemma3:4b", messages=[{"role": "user", "content": prompt}])
-
-        attributes = clean_llm_response(response["message"]["content"])
+        if structured:
+            all_keys = list(DRINK_FIELD_SCHEMAS)
+            attributes = enricher.ask_structured(
+                lambda fields: prompt if fields == all_keys else prompt + f"\nOnly return these keys: {fields}",
+                all_keys,
+                DRINK_FIELD_SCHEMAS,
+                label=name
+            )
+        else:
+            attributes = enricher.ask(prompt, parse=clean_llm_response)
         if not attributes:
-            continue
+            return {}
 
-        enriched_rows.append({
+        return {
             "name": name,
             "description": row["Description"][:40],   # REMOVE SLICING LATTER
             "category": "Beverage",
             **attributes
-        })
+        }
+
+    rows = [row for _, row in df.iterrows()]
+    results = enricher.map(
+        rows,
+        lambda batch: {row["Name"]: enrich_one(row) for row in batch},
+        key=lambda row: row["Name"],
+        journal=journal
+    )
+    enriched_rows = [results[row["Name"]] for row in rows if results.get(row["Name"])]
+
+    failed = len(rows) - len(enriched_rows)
+    if failed:
+        print(f"❌ {failed} drinks failed and will be retried on the next run")
 
     enriched_df = pd.DataFrame(enriched_rows)
-    enriched_df.to_csv(output_path, index=False, encoding="utf-8-sig")
+    if journal is not None:
+        journal.compact(enriched_df, output_path, complete=not failed, index=False, encoding="utf-8-sig")
+    else:
+        enriched_df.to_csv(output_path, index=False, encoding="utf-8-sig")
     print(f"✅ Enriched drinks saved to {output_path}")
+    enricher.print_stats()
 
 
 def sanitize_uri_value(value: str) -> str:
@@ -199,13 +228,15 @@ def update_onto_drinks(input_csv: str, input_ontology: str, output_ontology: str
                 g.add((inst, GC.hasFlavorProfile, GC[fl]))
 
     # Save new ontology
-    g.serialize(destination=output_ontology, format="xml")
+    output_ontology = save_graph(g, output_ontology)
     print(f"✅ Ontology updated and saved to {output_ontology}")
 
 
-def update_onto_drinks(input_csv: str, input_ontology: str, output_ontology: str):
+def update_onto_drinks(input_csv: str, input_ontology: str, output_ontology: str,
+                       version: str | None = None, parent: str | None = None):
     """
     Update ontology with enriched drinks from CSV.
+    With version/parent set, the change is also recorded as a delta in the version store.
     """
     # Load ontology
     g = Graph()
@@ -214,75 +245,82 @@ def update_onto_drinks(input_csv: str, input_ontology: str, output_ontology: str
     # Define namespace
     GC = Namespace("http://example.org/german-cuisine#")
     g.bind("gc", GC)
+    changes = ChangeRecorder(g)
 
     # Load CSV
     df = pd.read_csv(input_csv, encoding="utf-8-sig")
+    # Comma-separated columns are split once for the whole file
+    tables = build_edge_tables(df, "name", {"HasRegion": "hasRegion", "HasFlavorProfile": "hasFlavorProfile"})
 
-    for _, row in df.iterrows():
-        name = row["name"].strip().replace(" ", "_")
+    # One naming rule for the row loop and the edge tables, so both address the same individual
+    names = entity_names(df["name"])
+
+    for name, (_, row) in zip(names, df.iterrows()):
         inst = GC[name]
 
         # --- Types ---
-        g.add((inst, RDF.type, OWL.Thing))
-        g.add((inst, RDF.type, OWL.NamedIndividual))
-        g.add((inst, RDF.type, GC[row["category"]]))
-        g.add((inst, RDF.type, GC[row["class"]]))
+        changes.add((inst, RDF.type, OWL.Thing))
+        changes.add((inst, RDF.type, OWL.NamedIndividual))
+        changes.add((inst, RDF.type, GC[row["category"]]))
+        changes.add((inst, RDF.type, GC[row["class"]]))
         if pd.notna(row["subclass"]) and row["subclass"]:
-            g.add((inst, RDF.type, GC[row["subclass"]]))
+            changes.add((inst, RDF.type, GC[row["subclass"]]))
 
         # --- Data properties ---
         if pd.notna(row["description"]):
-            g.add((inst, GC.hasDescription, Literal(row["description"], datatype=XSD.string)))
+            changes.add((inst, GC.hasDescription, Literal(row["description"], datatype=XSD.string)))
 
         if pd.notna(row["HasAlcoholContent"]):
             try:
                 alc = float(row["HasAlcoholContent"])
-                g.add((inst, GC.hasAlcoholContent, Literal(alc, datatype=XSD.decimal)))
+                changes.add((inst, GC.hasAlcoholContent, Literal(alc, datatype=XSD.decimal)))
             except ValueError:
                 pass
 
         if pd.notna(row["IsCarbonated"]):
-            g.add((inst, GC.isCarbonated, Literal(str(row["IsCarbonated"]).lower() == "true", datatype=XSD.boolean)))
+            changes.add((inst, GC.isCarbonated, Literal(str(row["IsCarbonated"]).lower() == "true", datatype=XSD.boolean)))
 
         if pd.notna(row["IsGermanStaple"]):
-            g.add((inst, GC.isGermanStaple, Literal(str(row["IsGermanStaple"]).lower() == "true", datatype=XSD.boolean)))
+            changes.add((inst, GC.isGermanStaple, Literal(str(row["IsGermanStaple"]).lower() == "true", datatype=XSD.boolean)))
 
         # --- Object properties ---
         if pd.notna(row["HasMainIngredient"]):
-            g.add((inst, GC.hasMainIngredient, GC[row["HasMainIngredient"].strip()]))
+            changes.add((inst, GC.hasMainIngredient, GC[row["HasMainIngredient"].strip()]))
 
         if pd.notna(row["HasIngredient"]):
             try:
                 # Parse list string
                 ingredients = eval(row["HasIngredient"]) if isinstance(row["HasIngredient"], str) else []
                 for ing in ingredients:
-                    g.add((inst, GC.hasIngredient, GC[ing.strip()]))
+                    changes.add((inst, GC.hasIngredient, GC[ing.strip()]))
             except Exception:
                 pass
 
-        if pd.notna(row["HasRegion"]):
-            regions = [r.strip() for r in str(row["HasRegion"]).split(",")]
-            for reg in regions:
-            # normalize for URI safety
-                safe_reg = reg.replace(" ", "_")
-                print("Adding region:", safe_reg)
-                g.add((inst, GC.hasRegion, GC[safe_reg]))
-
-
         if pd.notna(row["HasServingTemperature"]):
-            g.add((inst, GC.hasServingTemperature, GC[row["HasServingTemperature"].strip()]))
+            changes.add((inst, GC.hasServingTemperature, GC[row["HasServingTemperature"].strip()]))
 
-        if pd.notna(row["HasFlavorProfile"]):
-            flavors = [f.strip() for f in row["HasFlavorProfile"].split(",")]
-            for fl in flavors:
-                g.add((inst, GC.hasFlavorProfile, GC[fl]))
+    # --- List-valued object properties, from the edge tables ---
+    for prop in ("hasRegion", "hasFlavorProfile"):
+        edges = tables.edges_for(prop)
+        subjects = entity_names(edges["name"])
+        objects = entity_names(edges["value"])
+        changes.addN((GC[s], GC[prop], GC[o], g) for s, o in zip(subjects, objects))
+        print(f"Added {len(edges)} {prop} links")
 
     # Save new ontology
-    g.serialize(destination=output_ontology, format="xml")
+    output_ontology = save_graph(g, output_ontology)
     print(f"✅ Ontology updated and saved to {output_ontology}")
 
+    if version:
+        store = VersionStore()  # Only opened (and its directory created) when a version is recorded
+        if parent not in store:
+            print(f"⚠️ Not recording {version} in the version store: parent version {parent} is missing")
+        elif version not in store:
+            store.commit(version, changes, parent=parent)
+
 
 
 if __name__ == "__main__":
     enrich_drinks(csv_path="drinks_new_unique.csv", output_path="enriched_beverages.csv", limit=4)
-    update_onto_drinks(input_csv="enriched_beverages.csv", input_ontology="v9-ontology.rdf", output_ontology="v10-ontology.rdf")
+    update_onto_drinks(input_csv="enriched_beverages.csv", input_ontology="v9-ontology.rdf", output_ontology="v10-ontology.rdf",
+                       version="v10", parent="v9")
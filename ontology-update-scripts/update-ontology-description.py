@@ -1,11 +1,18 @@
 import pandas as pd
-from rdflib import Graph, Namespace, Literal, RDF, URIRef
+from rdflib import Namespace, Literal, RDF, URIRef
 from rdflib.namespace import RDFS, OWL
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ont-engineering-scripts"))
+from ontology_snapshot import load_graph
+from ntriples_io import save_graph
+from ontology_versions import ChangeRecorder, VersionStore
 
 # === Load Ontology ===
-g = Graph()
-g.parse("v8-ontology.rdf", format="xml")
+g = load_graph("v8-ontology.rdf", format="xml")
 print("Ontology loaded")
+changes = ChangeRecorder(g)  # Applies the edits to g and records them for the version store
 
 # Define namespaces (adapt to your ontology!)
 EX = Namespace("http://example.org/german-cuisine#")
@@ -35,10 +42,10 @@ def update_descriptions(df, category, missing_list):
             print(f"Found in ontology: {name}")
 
             # Remove old description triples
-            g.remove((ind_uri, EX.hasDescription, None))
+            changes.remove((ind_uri, EX.hasDescription, None))
 
             # Add new description
-            g.add((ind_uri, EX.hasDescription, Literal(desc)))
+            changes.add((ind_uri, EX.hasDescription, Literal(desc)))
 
             print(f"✅ Updated {category} '{name}' with description: {desc}")
         else:
@@ -59,6 +66,13 @@ if missing_drinks:
     pd.DataFrame(missing_drinks).to_csv("drinks_new_unique.csv", index=False, encoding="utf-8-sig")
 
 # === Save updated ontology ===
-g.serialize(destination="v9-ontology.rdf", format="xml")
+saved_path = save_graph(g, "v9-ontology.rdf")
+
+print(f"🎉 Ontology update complete. Saved as {saved_path}")
 
-print("🎉 Ontology update complete. Saved as v9-ontology.rdf")
+# === Record v9 as a delta against v8 in the version store ===
+store = VersionStore()
+if "v8" in store and "v9" not in store:
+    store.commit("v9", changes, parent="v8")
+elif "v8" not in store:
+    print("ℹ️ v8 is not in the version store - import it with ontology_versions.py to record deltas")
@@ -3,19 +3,23 @@ import pandas as pd
 pd.set_option('display.max_colwidth', None)
 
 from pathlib import Path
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ont-engineering-scripts"))
+from ontology_snapshot import load_ontology
+from ntriples_io import save_ontology
+from bulk_loader import BuildReport, TripleBuilder, bulk_insert, to_float, yes_no
+from edge_tables import (BEVERAGE_LIST_COLUMNS, BEVERAGE_VALUE_COLUMNS, DISH_LIST_COLUMNS, DISH_VALUE_COLUMNS,
+                         Vocabulary, build_edge_tables, clean_values)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "datapopulation-scripts"))
+from german_text import repair_frame
 
 print("Loading ontology...")
 ttl_path = Path("../ontology-owl/ontology.ttl").resolve()
-onto = get_ontology(str(ttl_path)).load(format="turtle")
+onto = load_ontology(str(ttl_path), format="turtle")
 print("Ontology loaded.")
 
-def clean_value(val):
-    if pd.isna(val):
-        print("!!!! Value is NaN, returning empty string. !!!!")
-        print("Val considered NAN: ", val)
-        return ""
-    return str(val).strip().strip('"')
-
 print("Defining classes and properties...")
 with onto:
     class Beverage(Thing): pass
@@ -59,85 +63,53 @@ print("Classes and properties defined.")
 # Load Beverages CSV
 csv_bev = "../data/augmented_data/cleaned_beverages_augmented_gemma3_12b.csv"
 df_bev = pd.read_csv(csv_bev)
-df_bev.replace("WÃ¼rttemberg", "Wuerttemberg", inplace=True)
+repair_frame(df_bev)
 
 # Load Dishes CSV
 csv_dish = "../data/augmented_data/cleaned_dishes_augmented_gemma3_12b.csv"
 df_dish = pd.read_csv(csv_dish, quotechar='"', delimiter=',', skipinitialspace=True)
 df_dish["MeatCut"] = df_dish["MeatCut"].fillna("")
-
-df_dish.replace("WÃ¼rttemberg", "Wuerttemberg", inplace=True)
-
-def get_or_create(cls, name):
-    name = name.strip().replace(" ", "_")
-    return cls(name)
-
-print("\nProcessing beverages...")
-for idx, row in df_bev.iterrows():
-    bev_name = clean_value(row["BeverageName"]).replace(" ", "_")
-    bev = Beverage(bev_name)
-    bev.hasDescription = [clean_value(row["Description"])]
-    bev.isCarbonated = [clean_value(row["IsCarbonated"]).lower() == "yes"]
-    bev.isGermanStaple = [clean_value(row["IsGermanStaple"]).lower() == "yes"]
-    try:
-        bev.hasAlcoholContent = [float(clean_value(row["AlcoholContent"]))]
-    except:
-        bev.hasAlcoholContent = [0.0]
-
-    bev.hasRegion = [get_or_create(Region, r.strip()) for r in clean_value(row["Region"]).split(",") if r.strip()]
-    bev.hasMainIngredient = [get_or_create(Ingredient, clean_value(row["MainIngredient"]))]
-    bev.hasBeverageType = [get_or_create(BeverageType, clean_value(row["BeverageType"]))]
-    bev.hasServingTemperature = [get_or_create(ServingTemperature, clean_value(row["ServingTemperature"]))]
-
-    for ing in clean_value(row["Ingredient"]).split(","):
-        ing = ing.strip()
-        if ing:
-            bev.hasIngredient.append(get_or_create(Ingredient, ing))
-
-    for flavor in clean_value(row["FlavorProfile"]).split(","):
-        flavor = flavor.strip()
-        if flavor:
-            bev.hasFlavorProfile.append(get_or_create(FlavorProfile, flavor))
-
-    print(f"✅ Added beverage: {bev_name}")
-
-print("\nProcessing dishes...")
-print(df_dish.head())
-for idx, row in df_dish.iterrows():
-    dish_name = clean_value(row["DishName"]).replace(" ", "_")
-    dish = Dish(dish_name)
-    dish.hasDescription = [clean_value(row["Description"])]
-    #dish.isGermanStaple = [clean_value(row["IsGermanStaple"]).lower() == "yes"]
-    try:
-        dish.hasPreparationTimeMinutes = [float(clean_value(row["PreparationTimeMinutes"]))]
-    except:
-        dish.hasPreparationTimeMinutes = [0.0]
-
-    dish.hasRegion = [get_or_create(Region, r.strip()) for r in clean_value(row["Region"]).split(",") if r.strip()]
-    dish.hasMainIngredient = [get_or_create(MainIngredient, clean_value(row["MainIngredient"]))]
-    #dish.hasServingTemperature = [get_or_create(ServingTemperature, clean_value(row["ServingTemperature"]))]
-
-    for ing in clean_value(row["Ingredient"]).split(","):
-        ing = ing.strip()
-        if ing:
-            dish.hasIngredient.append(get_or_create(Ingredient, ing))
-
-    for flavor in clean_value(row["FlavorProfile"]).split(","):
-        flavor = flavor.strip()
-        if flavor:
-            dish.hasFlavorProfile.append(get_or_create(FlavorProfile, flavor))
-
-    for item, cls in [("DietType", DietType), ("MealEatenAtPartOfDay", MealEatenAtPartOfDay),
-                      ("MeatCut", MeatCut), ("PreparationMethod", PreparationMethod),
-                      ("StateOfMainIngredient", StateOfMainIngredient), ("Variation", Variation)]:
-        val = clean_value(row.get(item, ""))
-        if val:
-            dish.__getattr__(f"has{item}").append(get_or_create(cls, val))
-
-    print(f"✅ Added dish: {dish_name}")
+repair_frame(df_dish)
+
+# Build all instance triples column by column, then insert them in one batch
+with BuildReport("Instance triples built and inserted"):
+    vocabulary = Vocabulary()
+    bev_tables = build_edge_tables(df_bev, "BeverageName", BEVERAGE_LIST_COLUMNS, BEVERAGE_VALUE_COLUMNS, vocabulary)
+    dish_tables = build_edge_tables(df_dish, "DishName", DISH_LIST_COLUMNS, DISH_VALUE_COLUMNS, vocabulary)
+    builder = TripleBuilder(onto.base_iri)
+
+    print("\nProcessing beverages...")
+    bev_names = builder.add_individuals(df_bev["BeverageName"], "Beverage")
+    builder.add_data_values(bev_names, "hasDescription", clean_values(df_bev["Description"]))
+    builder.add_data_values(bev_names, "isCarbonated", yes_no(df_bev["IsCarbonated"]), "boolean")
+    builder.add_data_values(bev_names, "isGermanStaple", yes_no(df_bev["IsGermanStaple"]), "boolean")
+    builder.add_data_values(bev_names, "hasAlcoholContent", to_float(df_bev["AlcoholContent"]), "decimal")
+    builder.add_edges(bev_tables, "hasRegion", "Region")
+    builder.add_edges(bev_tables, "hasMainIngredient", "Ingredient")
+    builder.add_edges(bev_tables, "hasBeverageType", "BeverageType")
+    builder.add_edges(bev_tables, "hasServingTemperature", "ServingTemperature")
+    builder.add_edges(bev_tables, "hasIngredient", "Ingredient")
+    builder.add_edges(bev_tables, "hasFlavorProfile", "FlavorProfile")
+    print(f"✅ Added {bev_names.nunique()} beverages")
+
+    print("\nProcessing dishes...")
+    print(df_dish.head())
+    dish_names = builder.add_individuals(df_dish["DishName"], "Dish")
+    builder.add_data_values(dish_names, "hasDescription", clean_values(df_dish["Description"]))
+    builder.add_data_values(dish_names, "hasPreparationTimeMinutes", to_float(df_dish["PreparationTimeMinutes"]), "decimal")
+    builder.add_edges(dish_tables, "hasRegion", "Region")
+    builder.add_edges(dish_tables, "hasMainIngredient", "MainIngredient")
+    builder.add_edges(dish_tables, "hasIngredient", "Ingredient")
+    builder.add_edges(dish_tables, "hasFlavorProfile", "FlavorProfile")
+    # Kept as one value per dish (e.g. "lunch,_dinner"); the ont-engineering passes split them later
+    for item in ["DietType", "MealEatenAtPartOfDay", "MeatCut", "PreparationMethod", "StateOfMainIngredient", "Variation"]:
+        builder.add_edges(dish_tables, f"has{item}", item)
+    print(f"✅ Added {dish_names.nunique()} dishes")
+
+    bulk_insert(onto, builder)
 
 # Save ontology
 output_path = "../ontology-owl/german_beverages_dishes.rdf"
 print(f"\nSaving ontology to: {output_path} ...")
-onto.save(file=output_path, format="rdfxml")
+output_path = save_ontology(onto, output_path)
 print("Ontology saved.")
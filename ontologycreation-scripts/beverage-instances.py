@@ -1,19 +1,22 @@
 from owlready2 import *
 import pandas as pd
 from pathlib import Path
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ont-engineering-scripts"))
+from ontology_snapshot import load_ontology
+from ntriples_io import save_ontology
+from bulk_loader import BuildReport, TripleBuilder, bulk_insert, to_float, yes_no
+from edge_tables import BEVERAGE_LIST_COLUMNS, BEVERAGE_VALUE_COLUMNS, build_edge_tables, clean_values
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "datapopulation-scripts"))
+from german_text import repair_frame
 
 print("Loading ontology...")
 ttl_path = Path("../ontology-owl/ontology.ttl").resolve()
-onto = get_ontology(str(ttl_path)).load(format="turtle")
+onto = load_ontology(str(ttl_path), format="turtle")
 print("Ontology loaded.")
 
-def clean_value(val):
-    if pd.isna(val):
-        print("Value is NaN, returning empty string.")
-        return ""
-    print("Cleaned value about to return: ", str(val).strip().strip('"'))
-    return str(val).strip().strip('"')
-
 print("Defining classes and properties...")
 with onto:
     class Beverage(Thing): pass
@@ -43,74 +46,35 @@ print(f"Loading CSV from: {csv_path}")
 df = pd.read_csv(csv_path)
 print(f"CSV loaded with {len(df)} rows.")
 
-# Fix encoding issue
-print("Replacing 'WÃ¼rttemberg' with 'Wuerttemberg' in DataFrame...")
-df.replace("WÃ¼rttemberg", "Wuerttemberg", inplace=True)
-print("Replacement done.")
-
-def get_or_create(cls, name):
-    name = name.strip().replace(" ", "_")
-    print("Returning name as cls: ", name)
-    print("CLS: ", cls)
-    return cls(name)
-
+# Fix encoding issues (UTF-8 text that was read as latin-1, e.g. "WÃ¼rttemberg")
+repair_frame(df)
 
 print("Beginning beverage instance creation...\n")
-for idx, row in df.iterrows():
-    print(f"\n--- Row {idx+1}/{len(df)} ---")
-    bev_name = clean_value(row["BeverageName"]).replace(" ", "_")
-    bev = Beverage(bev_name)
-    print(f"Processing beverage: {bev_name}")
+with BuildReport("Beverage triples built and inserted"):
+    tables = build_edge_tables(df, "BeverageName", BEVERAGE_LIST_COLUMNS, BEVERAGE_VALUE_COLUMNS)
+    builder = TripleBuilder(onto.base_iri)
+    bev_names = builder.add_individuals(df["BeverageName"], "Beverage")
+    builder.add_data_values(bev_names, "hasDescription", clean_values(df["Description"]))
+    builder.add_data_values(bev_names, "isCarbonated", yes_no(df["IsCarbonated"]), "boolean")
+    builder.add_data_values(bev_names, "isGermanStaple", yes_no(df["IsGermanStaple"]), "boolean")
+    alcohol = to_float(df["AlcoholContent"], default=None)
+    if alcohol.isna().any():
+        print(f"⚠️ Could not convert AlcoholContent for {alcohol.isna().sum()} beverages, setting to 0.0")
+    builder.add_data_values(bev_names, "hasAlcoholContent", alcohol.fillna(0.0), "decimal")
 
-    bev.hasDescription = [clean_value(row["Description"])]
-    print("Description set: ", bev.hasDescription[0])
-    bev.isCarbonated = [clean_value(row["IsCarbonated"]).strip().lower() == "yes"]
-    print("isCarbonated set: ", bev.isCarbonated[0])
-    bev.isGermanStaple = [clean_value(row["IsGermanStaple"]).strip().lower() == "yes"]
-    print("isGermanStaple set: ", bev.isGermanStaple[0])
-    
-    try:
-        bev.hasAlcoholContent = [float(clean_value(row["AlcoholContent"]))]
-        print("hasAlcoholContent set: ", bev.hasAlcoholContent[0])
-    except ValueError:
-        print(f"⚠️ Could not convert AlcoholContent for {bev_name}, setting to 0.0")
-        bev.hasAlcoholContent = [0.0]
-    
     print("  Setting object properties...")
+    builder.add_edges(tables, "hasRegion", "Region")
+    builder.add_edges(tables, "hasMainIngredient", "Ingredient")
+    builder.add_edges(tables, "hasBeverageType", "BeverageType")
+    builder.add_edges(tables, "hasServingTemperature", "ServingTemperature")
+    builder.add_edges(tables, "hasIngredient", "Ingredient")
+    builder.add_edges(tables, "hasFlavorProfile", "FlavorProfile")
 
-    region_str = clean_value(row["Region"])
-    bev.hasRegion = []
-    for region in region_str.split(","):
-        region = region.strip()
-        print("Processing region:", repr(region))
-        if region:
-            print(f"Adding region: {repr(region)}")
-            bev.hasRegion.append(get_or_create(Region, region))
-        print("loop finished for region: ", region)
-    print("hasRegion set : ", [r.name for r in bev.hasRegion])
-
-
-    bev.hasMainIngredient = [get_or_create(Ingredient, clean_value(row["MainIngredient"]))]
-    print("hasMainIngredient set: ", bev.hasMainIngredient[0].name)
-    bev.hasBeverageType = [get_or_create(BeverageType, clean_value(row["BeverageType"]))]
-    bev.hasServingTemperature = [get_or_create(ServingTemperature, clean_value(row["ServingTemperature"]))]
-
-    print("  Setting ingredients...")
-    for ing in str(clean_value(row["Ingredient"])).split(","):
-        ing = ing.strip()
-        if ing:
-            bev.hasIngredient.append(get_or_create(Ingredient, ing))
-
-    print("  Setting flavor profiles...")
-    for flavor in str(clean_value(row["FlavorProfile"])).split(","):
-        flavor = flavor.strip()
-        if flavor:
-            bev.hasFlavorProfile.append(get_or_create(FlavorProfile, flavor))
-
-    print(f"✅ Added beverage: {bev_name}")
+    bulk_insert(onto, builder)
+    print(f"✅ Added {bev_names.nunique()} beverages")
 
 # Save ontology
 owl_output_path = "../ontology-owl/german_beverages.rdf"
 print(f"\nSaving ontology to: {owl_output_path} ...")
-onto.save(file=owl_output_path, format="rdfxml")
+owl_output_path = save_ontology(onto, owl_output_path)
 print("Ontology saved.")
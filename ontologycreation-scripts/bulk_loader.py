@@ -0,0 +1,170 @@
+import time
+import tracemalloc
+
+import pandas as pd
+
+from edge_tables import clean_values, normalize_values
+
+'''
+Bulk instance creation for the CSV -> ontology scripts.
+
+Setting owlready2 attributes row by row (bev.hasIngredient.append(get_or_create(...)))
+costs one quadstore write plus Python bookkeeping per value. Here all triples
+are computed column-wise with pandas: object properties come from the edge
+tables (see edge_tables.py), names are cleaned in one vectorized pass and every
+(class, individual) declared once. bulk_insert() then writes the rows straight
+into the World's quadstore in one SQLite transaction - no serialize / reparse
+of the ontology. to_ntriples() renders the same triples as text for inspection.
+
+Usage:
+    tables = build_edge_tables(df, "BeverageName", {"Ingredient": "hasIngredient"})
+    builder = TripleBuilder(onto.base_iri)
+    names = builder.add_individuals(df["BeverageName"], "Beverage")
+    builder.add_edges(tables, "hasIngredient", "Ingredient")
+    builder.add_data_values(names, "hasAlcoholContent", to_float(df["AlcoholContent"]), "decimal")
+    bulk_insert(onto, builder)
+'''
+
+RDF_TYPE = "http://www.w3.org/1999/02/22-rdf-syntax-ns#type"
+OWL_NAMED_INDIVIDUAL = "http://www.w3.org/2002/07/owl#NamedIndividual"
+XSD = "http://www.w3.org/2001/XMLSchema#"
+
+
+def entity_names(series):
+    """Local names as get_or_create() built them: cleaned, spaces -> underscores."""
+    return normalize_values(series).str.replace(" ", "_", regex=False)
+
+
+def yes_no(series):
+    return clean_values(series).str.strip().str.lower() == "yes"
+
+
+def to_float(series, default=0.0):
+    """Numbers that fail to parse become default (NaN if default is None)."""
+    values = pd.to_numeric(clean_values(series), errors="coerce")
+    return values if default is None else values.fillna(default)
+
+
+def _escape_literal(series):
+    return (
+        series.astype(str)
+        .str.replace("\\", "\\\\", regex=False)
+        .str.replace('"', '\\"', regex=False)
+        .str.replace("\n", "\\n", regex=False)
+        .str.replace("\r", "\\r", regex=False)
+    )
+
+
+def _escape_iri(series):
+    # Characters N-Triples does not allow inside <...>
+    for char in ['"', "<", ">", "{", "}", "|", "^", "`", "\\"]:
+        series = series.str.replace(char, f"%{ord(char):02X}", regex=False)
+    return series
+
+
+class TripleBuilder:
+    def __init__(self, base_iri):
+        self.base_iri = base_iri
+        # One DataFrame per add_* call with columns s, p, o (IRIs) - plus d (datatype IRI, "" for
+        # plain strings) when o holds the lexical form of a literal
+        self.chunks = []
+        self._declared = set()  # (class, name) pairs already typed
+
+    def iri(self, names):
+        return self.base_iri + _escape_iri(names)
+
+    def declare(self, names, class_name):
+        """rdf:type triples for every not yet declared individual of class_name."""
+        names = pd.Series(names.unique())
+        names = names[names != ""]
+        new = names[[(class_name, n) not in self._declared for n in names]]
+        self._declared.update((class_name, n) for n in new)
+        if new.empty:
+            return
+        iris = self.iri(new).values
+        self.chunks.append(pd.DataFrame({"s": iris, "p": RDF_TYPE, "o": self.base_iri + class_name}))
+        self.chunks.append(pd.DataFrame({"s": iris, "p": RDF_TYPE, "o": OWL_NAMED_INDIVIDUAL}))
+
+    def add_individuals(self, series, class_name):
+        """Declare one individual per row and return their local names (aligned with series)."""
+        names = entity_names(series)
+        self.declare(names, class_name)
+        return names
+
+    def add_edges(self, tables, prop, class_name):
+        """Link entities to the values of prop from an EdgeTables, declaring the values as class_name individuals."""
+        pairs = tables.edges_for(prop)
+        subjects = pairs["name"].str.replace(" ", "_", regex=False)
+        objects = pairs["value"].str.replace(" ", "_", regex=False)
+        self.declare(objects, class_name)
+        self.chunks.append(pd.DataFrame({"s": self.iri(subjects).values, "p": self.base_iri + prop,
+                                         "o": self.iri(objects).values}))
+
+    def add_data_values(self, subjects, prop, values, datatype=None):
+        """One literal per row; datatype is an xsd local name ("boolean", "decimal") or None for plain strings."""
+        if datatype == "boolean":
+            literals = values.map({True: "true", False: "false"})
+        else:
+            literals = values.astype(str)
+        # Functional like the old "bev.hasDescription = [...]": a repeated name keeps its last row
+        rows = pd.DataFrame({"s": subjects.values, "v": literals.values})
+        rows = rows[rows["s"] != ""].drop_duplicates("s", keep="last")
+        self.chunks.append(pd.DataFrame({"s": self.iri(rows["s"]).values, "p": self.base_iri + prop,
+                                         "o": rows["v"].values, "d": XSD + datatype if datatype else ""}))
+
+    def __len__(self):
+        return sum(len(chunk) for chunk in self.chunks)
+
+    def to_ntriples(self):
+        lines = []
+        for chunk in self.chunks:
+            if chunk.empty:
+                continue
+            head = "<" + chunk["s"] + "> <" + chunk["p"] + "> "
+            if "d" in chunk:
+                suffix = chunk["d"].map(lambda d: f"^^<{d}>" if d else "")
+                lines.append(head + '"' + _escape_literal(chunk["o"]) + '"' + suffix + " .")
+            else:
+                lines.append(head + "<" + chunk["o"] + "> .")
+        return "\n".join("\n".join(chunk) for chunk in lines) + "\n"
+
+
+def bulk_insert(onto, builder):
+    """Write all triples of builder into onto's quadstore in one transaction."""
+    graph = onto.world.graph
+    storids = {}
+
+    def storid(iri):
+        if iri not in storids:
+            storids[iri] = onto._abbreviate(iri)
+        return storids[iri]
+
+    string_type = storid(XSD + "string")  # What owlready2 stores for untyped literals
+    with graph.db:  # One SQLite transaction: commits at the end, rolls back if anything fails
+        for chunk in builder.chunks:
+            if "d" in chunk:
+                for s, p, o, d in zip(chunk["s"], chunk["p"], chunk["o"], chunk["d"]):
+                    onto._add_data_triple_spod(storid(s), storid(p), o, storid(d) if d else string_type)
+            else:
+                for s, p, o in zip(chunk["s"], chunk["p"], chunk["o"]):
+                    onto._add_obj_triple_spo(storid(s), storid(p), storid(o))
+    print(f"📥 Inserted {len(builder)} triples")
+
+
+class BuildReport:
+    """Context manager printing wall time and peak Python memory of the block."""
+
+    def __init__(self, label):
+        self.label = label
+
+    def __enter__(self):
+        tracemalloc.start()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"⏱️ {self.label}: {elapsed:.2f}s, peak memory {peak / 1024 / 1024:.1f} MB")
+        return False
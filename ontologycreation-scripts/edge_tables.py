@@ -0,0 +1,139 @@
+import os
+from dataclasses import dataclass
+
+import pandas as pd
+
+'''
+Vectorized parsing of the comma-list columns (Region, Ingredient, FlavorProfile, ...).
+
+Instead of str.split(",") per row inside Python loops, every list column is
+split and exploded once, whitespace is normalized in one vectorized pass, and
+each distinct value gets an integer ID. IDs are case-sensitive by default,
+like the IRIs get_or_create() used to mint ("Beer" and "beer" stay two
+individuals); Vocabulary(fold_case=True) merges them under the first spelling
+seen. The result is a set of long-format tables that loaders consume without
+re-parsing strings:
+  - entities: entity_id, name
+  - values:   value_id, value
+  - edges:    entity_id, property, value_id
+
+Run directly to write the tables for the augmented dish/beverage CSVs to ../data/edge-tables/.
+'''
+
+# === CONFIG ===
+DISH_CSV = "../data/augmented_data/cleaned_dishes_augmented_gemma3_12b.csv"
+BEVERAGE_CSV = "../data/augmented_data/cleaned_beverages_augmented_gemma3_12b.csv"
+OUTPUT_DIR = "../data/edge-tables"
+
+DISH_LIST_COLUMNS = {"Region": "hasRegion", "Ingredient": "hasIngredient", "FlavorProfile": "hasFlavorProfile"}
+DISH_VALUE_COLUMNS = {
+    "MainIngredient": "hasMainIngredient", "DietType": "hasDietType",
+    "MealEatenAtPartOfDay": "hasMealEatenAtPartOfDay", "MeatCut": "hasMeatCut",
+    "PreparationMethod": "hasPreparationMethod", "StateOfMainIngredient": "hasStateOfMainIngredient",
+    "Variation": "hasVariation"
+}
+BEVERAGE_LIST_COLUMNS = {"Region": "hasRegion", "Ingredient": "hasIngredient", "FlavorProfile": "hasFlavorProfile"}
+BEVERAGE_VALUE_COLUMNS = {
+    "MainIngredient": "hasMainIngredient", "BeverageType": "hasBeverageType",
+    "ServingTemperature": "hasServingTemperature"
+}
+
+
+def clean_values(series):
+    """Vectorized clean_value(): NaN -> "", surrounding whitespace and quotes removed."""
+    return series.fillna("").astype(str).str.strip().str.strip('"')
+
+
+def normalize_values(series):
+    """clean_values() plus runs of whitespace collapsed to one space."""
+    return clean_values(series).str.replace(r"\s+", " ", regex=True).str.strip()
+
+
+def explode_list(series, sep=","):
+    """One row per non-empty list item, indexed by the row it came from."""
+    values = normalize_values(series).str.split(sep).explode().str.strip()
+    return values[values.notna() & (values != "")]
+
+
+class Vocabulary:
+    """Integer IDs for distinct values; shared between properties and tables so equal values get equal IDs."""
+
+    def __init__(self, fold_case=False):
+        self.fold_case = fold_case
+        self.ids = {}  # normalized key -> id
+        self.values = []  # id -> canonical (first seen) spelling
+
+    def _keys(self, values):
+        return values.str.lower() if self.fold_case else values
+
+    def encode(self, values):
+        keys = self._keys(values)
+        new = (~keys.duplicated() & ~keys.isin(self.ids.keys())).values
+        for key, value in zip(keys.values[new], values.values[new]):
+            self.ids[key] = len(self.values)
+            self.values.append(value)
+        return keys.map(self.ids).astype("int32")
+
+    def to_frame(self):
+        return pd.DataFrame({"value_id": range(len(self.values)), "value": self.values})
+
+
+@dataclass
+class EdgeTables:
+    entities: pd.DataFrame  # entity_id, name
+    values: pd.DataFrame    # value_id, value
+    edges: pd.DataFrame     # entity_id, property, value_id
+
+    def edges_for(self, prop):
+        """Edges of one property with the entity name and value text joined back in."""
+        edges = self.edges[self.edges["property"] == prop]
+        return (
+            edges.merge(self.entities, on="entity_id")
+            .merge(self.values, on="value_id")[["entity_id", "name", "value_id", "value"]]
+        )
+
+    def save(self, directory, prefix):
+        os.makedirs(directory, exist_ok=True)
+        for table in ("entities", "values", "edges"):
+            path = os.path.join(directory, f"{prefix}_{table}.csv")
+            getattr(self, table).to_csv(path, index=False)
+        print(f"💾 Saved {prefix} edge tables to {directory} ({len(self.edges)} edges)")
+
+
+def build_edge_tables(df, name_column, list_columns=None, value_columns=None, vocabulary=None):
+    """
+    list_columns / value_columns map a CSV column to the property its values are linked by;
+    list columns are comma-separated, value columns hold one value per row.
+    Pass the same vocabulary to several calls to share value IDs between tables.
+    """
+    vocabulary = vocabulary or Vocabulary()
+    names = normalize_values(df[name_column])
+    entity_ids, unique_names = pd.factorize(names)
+    entity_ids = pd.Series(entity_ids, index=df.index, dtype="int32")
+
+    parts = []
+    for columns, split in ((list_columns or {}, True), (value_columns or {}, False)):
+        for column, prop in columns.items():
+            if column not in df.columns:
+                continue
+            values = explode_list(df[column]) if split else normalize_values(df[column])
+            values = values[values != ""]
+            parts.append(pd.DataFrame({
+                "entity_id": entity_ids.loc[values.index].values,
+                "property": prop,
+                "value_id": vocabulary.encode(values).values
+            }))
+
+    edges = pd.concat(parts, ignore_index=True).drop_duplicates(ignore_index=True) if parts \
+        else pd.DataFrame(columns=["entity_id", "property", "value_id"])
+    edges["property"] = edges["property"].astype("category")
+    entities = pd.DataFrame({"entity_id": range(len(unique_names)), "name": unique_names})
+    return EdgeTables(entities=entities, values=vocabulary.to_frame(), edges=edges)
+
+
+if __name__ == "__main__":
+    vocabulary = Vocabulary()
+    dishes = pd.read_csv(DISH_CSV, quotechar='"', delimiter=',', skipinitialspace=True)
+    beverages = pd.read_csv(BEVERAGE_CSV)
+    build_edge_tables(dishes, "DishName", DISH_LIST_COLUMNS, DISH_VALUE_COLUMNS, vocabulary).save(OUTPUT_DIR, "dishes")
+    build_edge_tables(beverages, "BeverageName", BEVERAGE_LIST_COLUMNS, BEVERAGE_VALUE_COLUMNS, vocabulary).save(OUTPUT_DIR, "beverages")
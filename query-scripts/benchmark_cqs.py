@@ -0,0 +1,151 @@
+import csv
+import os
+import statistics
+import sys
+import time
+
+from competency_questions import COMPETENCY_QUESTIONS, CQEngine
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ont-engineering-scripts"))
+from ontology_snapshot import load_graph
+
+'''
+Benchmark every competency question against every ontology version.
+
+For each (version, question) it records compile time, median / p95 latency
+over REPEATS runs and the result count, writes them to OUTPUT_DIR and
+compares with the baseline file:
+  - EMPTY:   the question returned no rows - a wrong parameter or pattern,
+             not an answer, so the run is never stored as a baseline
+  - SLOWER:  median latency above baseline * (1 + LATENCY_TOLERANCE)
+  - CHANGED: different result count than the baseline for the same version
+v1 and v2 predate the normalization scripts (lower-case individuals, no
+gc:Beverage, no course classes): VERSION_PARAMS gives them parameters that
+exist there, and NOT_APPLICABLE lists the questions they cannot answer, which
+are skipped. Set CQ_UPDATE_BASELINE=1 to store the current run as the new baseline.
+'''
+
+# === CONFIG ===
+VERSIONS = {
+    "v1": "../ontology-owl/v1-ontology.owl",
+    "v2": "../ontology-owl/v2-ontology.owl",
+    "v8": "../ontology-update-scripts/v8-ontology.rdf",
+    "v9": "../ontology-update-scripts/v9-ontology.rdf",
+    "v10": "../ontology-update-scripts/v10-ontology.rdf",
+}
+REPEATS = int(os.environ.get("CQ_REPEATS", "20"))
+WARMUP = 2  # Untimed runs per question before measuring
+OUTPUT_DIR = "../data/cq-benchmarks"
+BASELINE_PATH = os.path.join(OUTPUT_DIR, "baseline.csv")
+LATENCY_TOLERANCE = 0.5  # 50% slower than the baseline counts as a regression
+UPDATE_BASELINE = os.environ.get("CQ_UPDATE_BASELINE", "0") == "1"
+FIELDS = ["version", "cq", "results", "compile_ms", "median_ms", "p95_ms"]
+UNNORMALIZED_PARAMS = {"CQ03": {"meal": "breakfast"}, "CQ05": {"ingredient": "cabbage"}}
+UNNORMALIZED_NOT_APPLICABLE = {
+    "CQ02": "diet types are comma-joined labels (vegetarian,_omnivore)",
+    "CQ06": "diet types are comma-joined labels (vegetarian,_omnivore)",
+    "CQ07": "no gc:Beverage individuals",
+    "CQ08": "no gc:Beverage individuals",
+    "CQ10": "no course classes",
+    "CQ12": "no gc:Beverage individuals",
+}
+VERSION_PARAMS = {"v1": UNNORMALIZED_PARAMS, "v2": UNNORMALIZED_PARAMS}  # version -> cq -> params
+NOT_APPLICABLE = {"v1": UNNORMALIZED_NOT_APPLICABLE, "v2": UNNORMALIZED_NOT_APPLICABLE}  # version -> cq -> reason
+
+
+def benchmark_version(version, path):
+    graph = load_graph(path, format="xml")
+    start = time.perf_counter()
+    engine = CQEngine(graph)
+    compile_ms = (time.perf_counter() - start) * 1000 / len(COMPETENCY_QUESTIONS)
+
+    rows = []
+    for cq in COMPETENCY_QUESTIONS:
+        reason = NOT_APPLICABLE.get(version, {}).get(cq.id)
+        if reason:
+            print(f"  {cq.id} {cq.question:<65}   n/a  ({reason})")
+            continue
+        params = VERSION_PARAMS.get(version, {}).get(cq.id, {})
+        for _ in range(WARMUP):
+            engine.ask(cq.id, **params)
+        timings = []
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            results = engine.ask(cq.id, **params)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        rows.append({
+            "version": version,
+            "cq": cq.id,
+            "results": len(results),
+            "compile_ms": round(compile_ms, 2),
+            "median_ms": round(statistics.median(timings), 2),
+            "p95_ms": round(timings[min(len(timings) - 1, int(0.95 * len(timings)))], 2),
+        })
+        print(f"  {cq.id} {cq.question:<65} {len(results):>5} rows  {rows[-1]['median_ms']:>8.2f}ms")
+    return rows
+
+
+def read_csv(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, newline="", encoding="utf-8") as f:
+        return {(row["version"], row["cq"]): row for row in csv.DictReader(f)}
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def find_empty(rows):
+    return [f"EMPTY   {row['version']} {row['cq']}: no rows" for row in rows if row["results"] == 0]
+
+
+def find_regressions(rows, baseline):
+    regressions = []
+    for row in rows:
+        base = baseline.get((row["version"], row["cq"]))
+        if not base:
+            continue
+        if row["median_ms"] > float(base["median_ms"]) * (1 + LATENCY_TOLERANCE):
+            regressions.append(f"SLOWER  {row['version']} {row['cq']}: {base['median_ms']}ms -> {row['median_ms']}ms")
+        if row["results"] != int(base["results"]):
+            regressions.append(f"CHANGED {row['version']} {row['cq']}: {base['results']} -> {row['results']} results")
+    return regressions
+
+
+def main():
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    rows = []
+    for version, path in VERSIONS.items():
+        if not os.path.exists(path):
+            print(f"⚠️ Skipping {version}: {path} not found")
+            continue
+        print(f"\n📚 {version} ({path})")
+        rows.extend(benchmark_version(version, path))
+
+    run_path = os.path.join(OUTPUT_DIR, f"cq_benchmark_{time.strftime('%Y%m%d-%H%M%S')}.csv")
+    write_csv(run_path, rows)
+    print(f"\n💾 Results written to {run_path}")
+
+    empty = find_empty(rows)
+    baseline = read_csv(BASELINE_PATH)
+    if (UPDATE_BASELINE or not baseline) and not empty:
+        write_csv(BASELINE_PATH, rows)
+        print(f"📌 Baseline stored in {BASELINE_PATH}")
+        return
+    if empty and (UPDATE_BASELINE or not baseline):
+        print(f"⚠️ Baseline not stored: {len(empty)} questions returned no rows")
+    regressions = empty + (find_regressions(rows, baseline) if baseline else [])
+    for regression in regressions:
+        print("❌", regression)
+    if regressions:
+        sys.exit(1)
+    print("✅ No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
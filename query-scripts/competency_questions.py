@@ -0,0 +1,136 @@
+from dataclasses import dataclass, field
+
+from rdflib import Literal, Namespace, URIRef
+from rdflib.namespace import XSD
+from rdflib.plugins.sparql import prepareQuery
+
+'''
+The competency questions (see Competency-Questions.pdf) as executable queries.
+
+Every question is a parameterized SPARQL query: parameters are variables that
+are bound at run time (initBindings), so each query is parsed and translated
+to algebra ONCE when the engine is created and only evaluated per call.
+
+    engine = CQEngine(graph)
+    engine.ask("CQ01", region="Bavaria")
+    engine.ask("CQ09", max_minutes=20)
+'''
+
+GC = Namespace("http://example.org/german-cuisine#")
+NAMESPACES = {"gc": GC, "xsd": XSD}
+
+
+@dataclass
+class CompetencyQuestion:
+    id: str
+    question: str
+    query: str
+    params: dict = field(default_factory=dict)  # variable -> default value; str -> gc: individual, number -> literal
+
+
+COMPETENCY_QUESTIONS = [
+    CompetencyQuestion(
+        "CQ01", "Which dishes come from a given region?",
+        "SELECT ?dish WHERE { ?dish a gc:Dish ; gc:hasRegion ?region . }",
+        {"region": "Bavaria"}
+    ),
+    CompetencyQuestion(
+        "CQ02", "Which dishes fit a given diet type?",
+        "SELECT ?dish WHERE { ?dish a gc:Dish ; gc:hasDietType ?diet . }",
+        {"diet": "Vegetarian"}
+    ),
+    CompetencyQuestion(
+        "CQ03", "Which dishes are eaten at a given part of the day?",
+        "SELECT ?dish WHERE { ?dish a gc:Dish ; gc:hasMealEatenAtPartOfDay ?meal . }",
+        {"meal": "Breakfast"}
+    ),
+    CompetencyQuestion(
+        "CQ04", "Which dishes have a given main ingredient?",
+        "SELECT ?dish WHERE { ?dish a gc:Dish ; gc:hasMainIngredient ?ingredient . }",
+        {"ingredient": "Potato"}
+    ),
+    CompetencyQuestion(
+        "CQ05", "Which dishes contain a given ingredient?",
+        "SELECT ?dish WHERE { ?dish a gc:Dish ; gc:hasIngredient ?ingredient . }",
+        {"ingredient": "Cabbage"}
+    ),
+    CompetencyQuestion(
+        "CQ06", "Which vegetarian dishes from a region are eaten for dinner?",
+        """SELECT ?dish WHERE {
+            ?dish a gc:Dish ; gc:hasRegion ?region ; gc:hasDietType ?diet ; gc:hasMealEatenAtPartOfDay ?meal .
+        }""",
+        {"region": "Bavaria", "diet": "Vegetarian", "meal": "Dinner"}
+    ),
+    CompetencyQuestion(
+        "CQ07", "Which beverages are of a given type, strongest first?",
+        """SELECT ?beverage ?alcohol WHERE {
+            ?beverage a gc:Beverage ; gc:hasBeverageType ?type .
+            OPTIONAL { ?beverage gc:hasAlcoholContent ?alcohol }
+        } ORDER BY DESC(?alcohol)""",
+        {"type": "Beer"}
+    ),
+    CompetencyQuestion(
+        "CQ08", "Which beverages pair with a dish (shared region and flavor)?",
+        """SELECT ?beverage (COUNT(DISTINCT ?shared) AS ?score) WHERE {
+            ?beverage a gc:Beverage .
+            { ?dish gc:hasRegion ?shared . ?beverage gc:hasRegion ?shared . }
+            UNION
+            { ?dish gc:hasFlavorProfile ?shared . ?beverage gc:hasFlavorProfile ?shared . }
+        } GROUP BY ?beverage ORDER BY DESC(?score) LIMIT 10""",
+        {"dish": "Sauerbratenragout"}
+    ),
+    CompetencyQuestion(
+        "CQ09", "Which dishes can be prepared within a given number of minutes?",
+        """SELECT ?dish ?minutes WHERE {
+            ?dish a gc:Dish ; gc:hasPreparationTimeMinutes ?minutes .
+            FILTER(?minutes <= ?max_minutes)
+        } ORDER BY ?minutes""",
+        {"max_minutes": 20}
+    ),
+    CompetencyQuestion(
+        "CQ10", "Which dishes of a given course come from a region?",
+        "SELECT ?dish WHERE { ?dish a ?course ; gc:hasRegion ?region . }",
+        {"course": "Soup", "region": "Bavaria"}
+    ),
+    CompetencyQuestion(
+        "CQ11", "How many dishes does each region have?",
+        """SELECT ?region (COUNT(?dish) AS ?dishes) WHERE {
+            ?dish a gc:Dish ; gc:hasRegion ?region .
+        } GROUP BY ?region ORDER BY DESC(?dishes)"""
+    ),
+    CompetencyQuestion(
+        "CQ12", "Which German staple beverages are not carbonated?",
+        """SELECT ?beverage WHERE {
+            ?beverage a gc:Beverage ; gc:isGermanStaple ?staple ; gc:isCarbonated ?carbonated .
+        }""",
+        {"staple": True, "carbonated": False}
+    ),
+]
+
+
+def to_term(value):
+    if isinstance(value, (URIRef, Literal)):
+        return value
+    if isinstance(value, bool):
+        return Literal(value)
+    if isinstance(value, (int, float)):
+        return Literal(value, datatype=XSD.decimal)
+    return GC[str(value).strip().replace(" ", "_")]
+
+
+class CQEngine:
+    """Competency questions compiled once, evaluated against one graph."""
+
+    def __init__(self, graph, questions=COMPETENCY_QUESTIONS):
+        self.graph = graph
+        self.questions = {cq.id: cq for cq in questions}
+        self.compiled = {cq.id: prepareQuery(cq.query, initNs=NAMESPACES) for cq in questions}
+
+    def bindings(self, cq_id, **params):
+        values = dict(self.questions[cq_id].params, **params)
+        return {name: to_term(value) for name, value in values.items()}
+
+    def ask(self, cq_id, **params):
+        """Rows of a competency question; params override the question's defaults."""
+        result = self.graph.query(self.compiled[cq_id], initBindings=self.bindings(cq_id, **params))
+        return list(result)
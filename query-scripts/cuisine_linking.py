@@ -0,0 +1,153 @@
+import os
+import re
+import sys
+import time
+import unicodedata
+from collections import Counter
+
+from rdflib import Namespace
+from rdflib.namespace import OWL, RDF
+
+from facet_index import local_name
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ont-engineering-scripts"))
+from ntriples_io import save_graph
+from ontology_snapshot import load_graph
+from ontology_versions import ChangeRecorder, VersionStore
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "datapopulation-scripts"))
+from german_text import fold_umlauts
+
+'''
+Link restaurants to the regions and dishes of the graph by fuzzy matching
+their category names ("Bavarian restaurant", "Doner kebab restaurant").
+
+Both sides are normalized (lower case, umlauts folded, generic words such as
+"restaurant" dropped) and the region / dish names go into a trigram index
+(trigram -> name ids). A category is scored only against names sharing at
+least one trigram, by Dice similarity of the trigram sets. Matching runs once
+per distinct category; venues inherit the links of their category, so a
+national dump costs the same number of fuzzy lookups as long as the set of
+categories stays small.
+
+Emits gc:servesCuisineOf (restaurant -> region) and gc:servesDish
+(restaurant -> dish). Needs the restaurants from restaurants.py (v11).
+'''
+
+# === CONFIG ===
+INPUT_ONTOLOGY = "../ontology-update-scripts/v11-ontology.rdf"
+OUTPUT_ONTOLOGY = "../ontology-update-scripts/v12-ontology.rdf"
+MIN_REGION_SIMILARITY = 0.6
+MIN_DISH_SIMILARITY = 0.75
+GENERIC_WORDS = {
+    "restaurant", "restaurants", "takeaway", "takeout", "delivery", "shop", "bar", "cafe", "bistro", "house",
+    "food", "cuisine", "style", "fine", "dining", "and", "stand", "buffet", "grill", "kitchen",
+}
+# Demonyms whose spelling is too far from the region name for trigrams, and
+# categories that look like a region but are not one (None = no region).
+# Targets must be Region individuals of the graph; Germany as a whole is gc:Nationwide.
+ALIASES = {
+    "french": "France", "dutch": "Netherlands", "swiss": "Switzerland", "polish": "Poland",
+    "czech": "Czech Republic", "danish": "Denmark", "hungarian": "Hungary", "turkish": "Turkey",
+    "italian": "Italy", "northern italian": "Italy", "southern italian": "Italy", "german": "Nationwide",
+    "hamburger": None, "middle eastern": None, "western": None,
+}
+GC = Namespace("http://example.org/german-cuisine#")
+
+
+def normalize(text):
+    text = str(text).replace("_", " ").replace("-", " ").lower()
+    text = fold_umlauts(text)
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    words = re.findall(r"[a-z0-9]+", text)
+    return " ".join(w for w in words if w not in GENERIC_WORDS)
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    def __init__(self, names, preferred=()):
+        # Spellings that normalize alike ("Baden-Württemberg", "Baden-Wuerttemberg") are one entry;
+        # the preferred spelling wins, otherwise the first one seen
+        names = list(names)
+        known = set(names)
+        by_key = {}
+        for name in [n for n in preferred if n in known] + names:
+            by_key.setdefault(normalize(name), name)
+        self.names = list(by_key.values())
+        self.sizes = []
+        self.postings = {}  # trigram -> [name ids]
+        for i, name in enumerate(self.names):
+            grams = trigrams(normalize(name))
+            self.sizes.append(len(grams))
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(i)
+        self.exact = {normalize(name): i for i, name in enumerate(self.names)}
+
+    def search(self, query, min_similarity=0.6, limit=3):
+        """(name, similarity) of the best matches of an already normalized query."""
+        if not query:
+            return []
+        if query in self.exact:
+            return [(self.names[self.exact[query]], 1.0)]
+        grams = trigrams(query)
+        shared = Counter(i for gram in grams for i in self.postings.get(gram, ()))
+        scored = [(2 * n / (len(grams) + self.sizes[i]), i) for i, n in shared.items()]
+        scored = sorted((s for s in scored if s[0] >= min_similarity), reverse=True)[:limit]
+        return [(self.names[i], round(score, 3)) for score, i in scored]
+
+
+def link_categories(categories, regions, dishes, preferred_regions=()):
+    """category -> (matched regions, matched dishes)."""
+    region_index, dish_index = TrigramIndex(regions, preferred_regions), TrigramIndex(dishes)
+    links = {}
+    for category in categories:
+        query = normalize(category)
+        region_query = normalize(ALIASES[query] or "") if query in ALIASES else query
+        matched_regions = region_index.search(region_query, MIN_REGION_SIMILARITY, limit=1)
+        links[category] = (matched_regions, dish_index.search(query, MIN_DISH_SIMILARITY))
+    return links
+
+
+def link_restaurants(graph, changes):
+    start = time.perf_counter()
+    regions = sorted({local_name(s) for s in graph.subjects(RDF.type, GC.Region)})
+    dishes = sorted({local_name(s) for s in graph.subjects(RDF.type, GC.Dish)})
+    venue_categories = [(venue, local_name(category))
+                        for venue, category in graph.subject_objects(GC.hasRestaurantCategory)]
+    if not venue_categories:
+        print("⚠️ No restaurants in the graph - run restaurants.py first")
+        return
+    # The states restaurants.py linked the venues to, so servesCuisineOf and hasRegion agree on the individual
+    venue_regions = sorted({local_name(region) for venue, _ in venue_categories
+                            for region in graph.objects(venue, GC.hasRegion)})
+
+    links = link_categories({category for _, category in venue_categories}, regions, dishes, venue_regions)
+    elapsed = time.perf_counter() - start
+    changes.add((GC.servesCuisineOf, RDF.type, OWL.ObjectProperty))
+    changes.add((GC.servesDish, RDF.type, OWL.ObjectProperty))
+    for venue, category in venue_categories:
+        matched_regions, matched_dishes = links[category]
+        for region, _ in matched_regions:
+            changes.add((venue, GC.servesCuisineOf, GC[region]))
+        for dish, _ in matched_dishes:
+            changes.add((venue, GC.servesDish, GC[dish]))
+
+    for category, (matched_regions, matched_dishes) in sorted(links.items()):
+        if matched_regions or matched_dishes:
+            print(f"🔗 {category:<35} -> {', '.join(f'{n} ({s})' for n, s in matched_regions + matched_dishes)}")
+    print(f"⏱️ Matched {len(links)} categories of {len(venue_categories)} venues against "
+          f"{len(regions)} regions and {len(dishes)} dishes in {elapsed * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    graph = load_graph(INPUT_ONTOLOGY, format="xml")
+    changes = ChangeRecorder(graph)
+    link_restaurants(graph, changes)
+    output = save_graph(graph, OUTPUT_ONTOLOGY)
+    print(f"✅ Ontology with cuisine links saved to {output} ({len(changes)} new triples)")
+    store = VersionStore()
+    if "v11" in store and "v12" not in store:
+        store.commit("v12", changes, parent="v11")
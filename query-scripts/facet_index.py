@@ -0,0 +1,147 @@
+import os
+import sys
+import time
+
+from rdflib import RDF, URIRef
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ont-engineering-scripts"))
+from ontology_snapshot import load_graph
+
+'''
+Inverted property indexes for facet queries on dishes and beverages.
+
+Every dish and beverage gets an integer ID. For each object property (and
+rdf:type, as the "type" facet) the index maps value -> bitmap of the IDs that
+have it; a bitmap is a plain Python int with bit i set for entity i. A facet
+query is then a handful of big-int ANDs/ORs instead of walking hasDietType,
+hasRegion, ... for every individual:
+
+    index = FacetIndex(graph)
+    index.query("Dish", hasDietType="Vegetarian", hasMealEatenAtPartOfDay="Dinner",
+                hasRegion="Bavaria", hasFlavorProfile="Savory")
+    index.query("Beverage", hasRegion=["Bavaria", "Saxony"], type="Beer")   # list = any of
+
+Values and property names match case-insensitively, spaces and underscores alike.
+Run directly for a benchmark on the current graph and on 100x synthetic copies.
+'''
+
+# === CONFIG ===
+ONTOLOGY_PATH = os.environ.get("ONTOLOGY_PATH", "../ontology-update-scripts/v10-ontology.rdf")
+GC = "http://example.org/german-cuisine#"
+ENTITY_CLASSES = ("Dish", "Beverage")
+BENCHMARK_QUERY = {"hasDietType": "Vegetarian", "hasMealEatenAtPartOfDay": "Dinner",
+                   "hasRegion": "Bavaria", "hasFlavorProfile": "Savory"}
+BENCHMARK_RUNS = 1000
+SCALE_FACTOR = 100
+
+
+def key(name):
+    return str(name).strip().lower().replace(" ", "_")
+
+
+def local_name(term):
+    return str(term).split("#")[-1]
+
+
+def ids_to_bitmap(ids):
+    if not ids:
+        return 0
+    bits = bytearray(max(ids) // 8 + 1)
+    for i in ids:
+        bits[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(bits, "little")
+
+
+def bitmap_to_ids(bitmap):
+    ids = []
+    while bitmap:
+        low = bitmap & -bitmap
+        ids.append(low.bit_length() - 1)
+        bitmap ^= low
+    return ids
+
+
+class FacetIndex:
+    def __init__(self, graph, entity_classes=ENTITY_CLASSES):
+        start = time.perf_counter()
+        self.names = []  # entity id -> local name
+        ids = {}
+        class_ids = {}
+        for cls in entity_classes:
+            members = sorted(graph.subjects(RDF.type, URIRef(GC + cls)))
+            class_ids[key(cls)] = [ids.setdefault(m, len(ids)) for m in members]
+        self.names = [local_name(m) for m in sorted(ids, key=ids.get)]
+
+        postings = {}  # property -> value -> [ids]
+        for s, p, o in graph:
+            entity_id = ids.get(s)
+            if entity_id is None or not isinstance(o, URIRef):
+                continue
+            prop = "type" if p == RDF.type else local_name(p)
+            postings.setdefault(key(prop), {}).setdefault(key(local_name(o)), []).append(entity_id)
+
+        self.classes = {cls: ids_to_bitmap(members) for cls, members in class_ids.items()}
+        self.facets = {
+            prop: {value: ids_to_bitmap(sorted(set(members))) for value, members in values.items()}
+            for prop, values in postings.items()
+        }
+        print(f"🗂️ Indexed {len(self.names)} entities, {sum(len(v) for v in self.facets.values())} facet values "
+              f"over {len(self.facets)} properties in {(time.perf_counter() - start) * 1000:.0f}ms")
+
+    def values(self, prop):
+        """Facet values of a property with their counts, most common first."""
+        counts = {value: bin(bitmap).count("1") for value, bitmap in self.facets.get(key(prop), {}).items()}
+        return sorted(counts.items(), key=lambda item: -item[1])
+
+    def match(self, entity_class=None, **facets):
+        """Bitmap of the entities matching every facet (a list value matches any of its values)."""
+        result = self.classes.get(key(entity_class), 0) if entity_class else -1
+        for prop, wanted in facets.items():
+            values = self.facets.get(key(prop), {})
+            wanted = wanted if isinstance(wanted, (list, tuple, set)) else [wanted]
+            any_of = 0
+            for value in wanted:
+                any_of |= values.get(key(value), 0)
+            result &= any_of
+            if not result:
+                break
+        return result if result != -1 else 0
+
+    def query(self, entity_class=None, **facets):
+        return [self.names[i] for i in bitmap_to_ids(self.match(entity_class, **facets))]
+
+    def count(self, entity_class=None, **facets):
+        return bin(self.match(entity_class, **facets)).count("1")
+
+    def scaled(self, factor):
+        """Copy of the index with every entity repeated factor times - for scaling benchmarks."""
+        n = len(self.names)
+        copy = object.__new__(FacetIndex)
+        copy.names = self.names * factor
+        repeat = lambda bitmap: sum(bitmap << (k * n) for k in range(factor))
+        copy.classes = {cls: repeat(bitmap) for cls, bitmap in self.classes.items()}
+        copy.facets = {prop: {value: repeat(bitmap) for value, bitmap in values.items()}
+                       for prop, values in self.facets.items()}
+        return copy
+
+
+def benchmark(index, label):
+    start = time.perf_counter()
+    for _ in range(BENCHMARK_RUNS):
+        matches = index.match("Dish", **BENCHMARK_QUERY)
+    per_query = (time.perf_counter() - start) / BENCHMARK_RUNS
+    print(f"⏱️ {label}: {bin(matches).count('1')} matches of {len(index.names)} entities, "
+          f"{per_query * 1e6:.1f}µs per 4-facet query")
+
+
+def main():
+    graph = load_graph(ONTOLOGY_PATH, format="xml")
+    index = FacetIndex(graph)
+    print("🔎", ", ".join(f"{k}={v}" for k, v in BENCHMARK_QUERY.items()))
+    print(index.query("Dish", **BENCHMARK_QUERY))
+    benchmark(index, "current graph")
+    benchmark(index.scaled(SCALE_FACTOR), f"{SCALE_FACTOR}x synthetic")
+
+
+if __name__ == "__main__":
+    main()
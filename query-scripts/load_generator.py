@@ -0,0 +1,137 @@
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from string import Template
+
+import requests
+from requests.adapters import HTTPAdapter
+
+'''
+Concurrent load generator for sparql_endpoint.py.
+
+Sends QUERIES (drawn at random) from CONCURRENCY threads for DURATION_S
+seconds and reports throughput and latency percentiles, overall and per
+query. $region / $ingredient in a query are filled with the IRI of a random
+region or ingredient of the graph (fetched from the endpoint at start), so most
+requests are not repeats of the same text. Cold (result cache miss) and
+cached latencies are reported separately, from the X-Cache response header.
+Start the endpoint first.
+'''
+
+# === CONFIG ===
+ENDPOINT = os.environ.get("SPARQL_ENDPOINT", "http://127.0.0.1:3030/sparql")
+CONCURRENCY = int(os.environ.get("LOAD_CONCURRENCY", "8"))
+DURATION_S = float(os.environ.get("LOAD_DURATION_S", "20"))
+SEED = 42
+
+PREFIX = "PREFIX gc: <http://example.org/german-cuisine#>\n"
+QUERIES = {
+    "all_dishes": PREFIX + "SELECT ?dish WHERE { ?dish a gc:Dish . }",
+    "dishes_from_region": PREFIX + "SELECT ?dish WHERE { ?dish a gc:Dish ; gc:hasRegion $region . }",
+    "dishes_with_ingredient": PREFIX + "SELECT ?dish WHERE { ?dish a gc:Dish ; gc:hasIngredient $ingredient . }",
+    "vegetarian_dinner": PREFIX + """SELECT ?dish WHERE {
+        ?dish a gc:Dish ; gc:hasDietType gc:Vegetarian ; gc:hasMealEatenAtPartOfDay gc:Dinner .
+    }""",
+    "beverages_per_type": PREFIX + """SELECT ?type (COUNT(?bev) AS ?n) WHERE {
+        ?bev a gc:Beverage ; gc:hasBeverageType ?type .
+    } GROUP BY ?type ORDER BY DESC(?n)""",
+    "shared_region_pairs": PREFIX + """SELECT ?bev (COUNT(?dish) AS ?n) WHERE {
+        ?dish a gc:Dish ; gc:hasRegion $region .
+        ?bev a gc:Beverage ; gc:hasRegion $region .
+    } GROUP BY ?bev""",
+}
+# Where the values for each placeholder come from
+BINDING_QUERIES = {
+    "region": PREFIX + "SELECT DISTINCT ?value WHERE { ?s gc:hasRegion ?value . }",
+    "ingredient": PREFIX + "SELECT DISTINCT ?value WHERE { ?s gc:hasIngredient ?value . }",
+}
+HEADERS = {"Content-Type": "application/sparql-query", "Accept": "application/sparql-results+json"}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def fetch_bindings(session):
+    """{placeholder: ["<iri>", ...]} for the BINDING_QUERIES placeholders."""
+    bindings = {}
+    for placeholder, query in BINDING_QUERIES.items():
+        response = session.post(ENDPOINT, data=query.encode("utf-8"), headers=HEADERS)
+        response.raise_for_status()
+        rows = response.json()["results"]["bindings"]
+        bindings[placeholder] = sorted(f"<{row['value']['value']}>" for row in rows if row["value"]["type"] == "uri")
+    return bindings
+
+
+def worker(worker_id, deadline, session, bindings):
+    rng = random.Random(SEED + worker_id)
+    samples = []  # (query name, seconds, ok, served from the result cache)
+    names = list(QUERIES)
+    templates = {name: Template(query) for name, query in QUERIES.items()}
+    while time.perf_counter() < deadline:
+        name = rng.choice(names)
+        query = templates[name].safe_substitute({key: rng.choice(values) for key, values in bindings.items()})
+        start = time.perf_counter()
+        try:
+            response = session.post(ENDPOINT, data=query.encode("utf-8"), headers=HEADERS)
+            ok = response.status_code == 200
+            cached = response.headers.get("X-Cache") == "hit"
+        except requests.RequestException:
+            ok = cached = False
+        samples.append((name, time.perf_counter() - start, ok, cached))
+    return samples
+
+
+def report(label, latencies, elapsed=None):
+    line = (f"{label:<30} n={len(latencies):<6} p50 {percentile(latencies, 50) * 1000:7.1f}ms"
+            f"  p99 {percentile(latencies, 99) * 1000:7.1f}ms  max {max(latencies) * 1000:7.1f}ms")
+    if elapsed:
+        line += f"  {len(latencies) / elapsed:.1f} req/s"
+    print(line)
+
+
+def main():
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=CONCURRENCY))
+    try:
+        bindings = fetch_bindings(session)
+    except requests.RequestException as e:
+        print(f"❌ Could not fetch query bindings - is the endpoint running? ({e})")
+        return
+    print(f"🎲 {', '.join(f'{len(values)} {key} values' for key, values in bindings.items())}")
+    print(f"🔥 {CONCURRENCY} clients for {DURATION_S:.0f}s against {ENDPOINT}")
+
+    start = time.perf_counter()
+    deadline = start + DURATION_S
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as pool:
+        futures = [pool.submit(worker, i, deadline, session, bindings) for i in range(CONCURRENCY)]
+        samples = [sample for future in futures for sample in future.result()]
+    elapsed = time.perf_counter() - start
+
+    errors = sum(1 for _, _, ok, _ in samples if not ok)
+    latencies = [seconds for _, seconds, ok, _ in samples if ok]
+    if not latencies:
+        print("❌ No successful requests - is the endpoint running?")
+        return
+    report("all queries", latencies, elapsed)
+    for label, hit in (("cold (cache miss)", False), ("cached (cache hit)", True)):
+        split = [seconds for _, seconds, ok, cached in samples if ok and cached == hit]
+        if split:
+            report(label, split)
+    for name in QUERIES:
+        cold = [seconds for n, seconds, ok, cached in samples if ok and n == name and not cached]
+        if cold:
+            report(f"{name} (cold)", cold)
+    print(f"❌ {errors} failed requests" if errors else "✅ No failed requests")
+    try:
+        print("📊 Server stats:", session.get(ENDPOINT.rsplit("/", 1)[0] + "/stats").json())
+    except requests.RequestException:
+        pass
+
+
+if __name__ == "__main__":
+    main()
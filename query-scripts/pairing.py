@@ -0,0 +1,144 @@
+import csv
+import json
+import os
+import sys
+import time
+
+import numpy as np
+from rdflib import RDF, URIRef
+from scipy import sparse
+
+from facet_index import GC, local_name
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ont-engineering-scripts"))
+from ontology_snapshot import file_hash, load_graph
+
+'''
+Dish -> beverage pairing recommender.
+
+Every dish and beverage becomes a sparse feature vector over the Region,
+FlavorProfile and Ingredient individuals it links to (weighted per property,
+L2-normalized). One sparse product dishes x beverages^T gives the cosine
+similarity of every pair; the top-k beverages per dish are written to a
+pairing table in CACHE_DIR. The table is keyed by the ontology's sha256 and the
+config below, so serving a dish is a dict lookup:
+
+    pairings = load_pairings()
+    pairings.recommend("Sauerbratenragout", k=5)   # [(beverage, score), ...]
+'''
+
+# === CONFIG ===
+ONTOLOGY_PATH = os.environ.get("ONTOLOGY_PATH", "../ontology-update-scripts/v10-ontology.rdf")
+CACHE_DIR = "../data/pairings"
+TOP_K = 10
+FEATURE_WEIGHTS = {  # Property -> weight of a shared value
+    "hasRegion": 1.0,
+    "hasFlavorProfile": 1.5,
+    "hasIngredient": 0.5,
+}
+
+
+def feature_matrix(graph, entity_class, features):
+    """Entity names and (rows, cols, weights) of their features; grows `features` (key -> column) in place."""
+    entities = sorted(graph.subjects(RDF.type, URIRef(GC + entity_class)))
+    rows, cols, weights = [], [], []
+    for row, entity in enumerate(entities):
+        for prop, weight in FEATURE_WEIGHTS.items():
+            for value in graph.objects(entity, URIRef(GC + prop)):
+                rows.append(row)
+                cols.append(features.setdefault((prop, local_name(value)), len(features)))
+                weights.append(weight)
+    return [local_name(e) for e in entities], (rows, cols, weights)
+
+
+def to_csr(triplets, shape):
+    rows, cols, weights = triplets
+    matrix = sparse.csr_matrix((weights, (rows, cols)), shape=shape, dtype=np.float32)
+    matrix.sum_duplicates()
+    norms = np.sqrt(matrix.multiply(matrix).sum(axis=1)).A1
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms) @ matrix
+
+
+def top_k(similarity, k):
+    """Per row of a CSR similarity matrix: (column indices, scores) of the k best, best first."""
+    similarity = similarity.tocsr()
+    result = []
+    for row in range(similarity.shape[0]):
+        start, end = similarity.indptr[row], similarity.indptr[row + 1]
+        cols, scores = similarity.indices[start:end], similarity.data[start:end]
+        if len(scores) > k:
+            best = np.argpartition(-scores, k - 1)[:k]
+            cols, scores = cols[best], scores[best]
+        order = np.argsort(-scores, kind="stable")
+        result.append((cols[order], scores[order]))
+    return result
+
+
+def compute_pairings(graph, k=TOP_K):
+    start = time.perf_counter()
+    features = {}
+    dishes, dish_triplets = feature_matrix(graph, "Dish", features)
+    beverages, beverage_triplets = feature_matrix(graph, "Beverage", features)
+    dish_matrix = to_csr(dish_triplets, (len(dishes), len(features)))
+    beverage_matrix = to_csr(beverage_triplets, (len(beverages), len(features)))
+
+    similarity = dish_matrix @ beverage_matrix.T
+    table = {}
+    for dish, (cols, scores) in zip(dishes, top_k(similarity, k)):
+        table[dish] = [(beverages[c], round(float(s), 4)) for c, s in zip(cols, scores) if s > 0]
+    print(f"🍷 Paired {len(dishes)} dishes with {len(beverages)} beverages over {len(features)} features "
+          f"in {(time.perf_counter() - start) * 1000:.0f}ms")
+    return table
+
+
+class Pairings:
+    def __init__(self, table):
+        self.table = table
+
+    def recommend(self, dish, k=TOP_K):
+        """Best k beverages for a dish as (beverage, score), best first."""
+        return self.table.get(str(dish).strip().replace(" ", "_"), [])[:k]
+
+
+def cache_key(ontology_path, k):
+    return {"ontology_sha256": file_hash(ontology_path), "k": k, "weights": FEATURE_WEIGHTS}
+
+
+def load_pairings(ontology_path=ONTOLOGY_PATH, k=TOP_K, cache_dir=CACHE_DIR):
+    """Pairing table for an ontology, computed on the first call and read from CACHE_DIR afterwards."""
+    name = os.path.splitext(os.path.basename(ontology_path))[0]
+    table_path = os.path.join(cache_dir, f"{name}_pairings_top{k}.csv")
+    meta_path = table_path.replace(".csv", ".json")
+    key = cache_key(ontology_path, k)
+
+    if os.path.exists(table_path) and os.path.exists(meta_path):
+        with open(meta_path, encoding="utf-8") as f:
+            if json.load(f) == key:
+                table = {}
+                with open(table_path, newline="", encoding="utf-8") as f:
+                    for row in csv.DictReader(f):
+                        table.setdefault(row["dish"], []).append((row["beverage"], float(row["score"])))
+                print(f"📦 Loaded pairings for {len(table)} dishes from {table_path}")
+                return Pairings(table)
+
+    table = compute_pairings(load_graph(ontology_path, format="xml"), k)
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(table_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["dish", "rank", "beverage", "score"])
+        for dish, matches in table.items():
+            for rank, (beverage, score) in enumerate(matches, 1):
+                writer.writerow([dish, rank, beverage, score])
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(key, f, indent=2)
+    print(f"💾 Pairing table written to {table_path}")
+    return Pairings(table)
+
+
+if __name__ == "__main__":
+    pairings = load_pairings()
+    for dish in sys.argv[1:] or ["Sauerbratenragout"]:
+        print(f"\n🍽️ {dish}")
+        for beverage, score in pairings.recommend(dish, k=5):
+            print(f"   {score:.3f}  {beverage}")
@@ -0,0 +1,393 @@
+import csv
+import math
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass, fields, replace
+
+import numpy as np
+import pandas as pd
+from rdflib import Literal, Namespace
+from rdflib.namespace import OWL, RDF, RDFS, XSD
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ont-engineering-scripts"))
+from ntriples_io import save_graph
+from ontology_snapshot import load_graph
+from ontology_versions import ChangeRecorder, VersionStore
+
+'''
+Restaurant dataset (data/german_restaurnts_2024.csv) as columnar arrays with
+prebuilt indexes, and as gc:Restaurant individuals in the graph.
+
+  - Venues:      one typed NumPy array per column; city / category / state are
+                 integer codes into small lookup lists, price "€20–30" -> (20, 30)
+  - Geocoding:   offline, from GAZETTEER_PATH (city -> state, lat, lon). Either a
+                 "city,state,lat,lon" CSV (data/gazetteer_de.csv: approximate
+                 city centres for every city of the dataset, mostly from GeoNames)
+                 or a GeoNames country dump (DE.txt). Venues are
+                 placed at their city's coordinates - the dataset has no house-level
+                 positions.
+  - VenueIndex:  per city / category / state postings, each pre-sorted by rating,
+                 plus a lat/lon grid of distinct positions, each with its own
+                 rating-sorted posting list. Queries scan the shortest posting list
+                 only until k hits are found, and nearest() scores every position
+                 once instead of every venue at it, so latency follows k and the
+                 number of places, not the venue count.
+                 Running the file benchmarks the dataset and a SCALE_FACTOR x
+                 replicated copy of it (Venues.scaled).
+
+    venues = load_venues()
+    index = VenueIndex(venues)
+    index.top_rated(state="Bavaria", city="Ingolstadt", max_price=20)
+    index.top_rated(category="Bavarian restaurant", k=5)
+    index.nearest(48.78, 9.18, k=5, max_price=30)
+'''
+
+# === CONFIG ===
+RESTAURANTS_CSV = "../data/german_restaurnts_2024.csv"
+GAZETTEER_PATH = os.environ.get("GAZETTEER_PATH", "../data/gazetteer_de.csv")
+INPUT_ONTOLOGY = "../ontology-update-scripts/v10-ontology.rdf"
+OUTPUT_ONTOLOGY = "../ontology-update-scripts/v11-ontology.rdf"
+GRID_CELL_DEG = 0.1  # ~11 km cells for nearest-venue search
+SCAN_CHUNK = 256  # Posting entries checked per vectorized step
+BENCHMARK_RUNS = 1000
+SCALE_FACTOR = 100  # Venues replicated this often for the scaling benchmark
+# Google's price symbols as euro bands ($ for €, $$ for €€ ...)
+SYMBOL_BANDS = {1: (1.0, 10.0), 2: (10.0, 30.0), 3: (30.0, 60.0), 4: (60.0, np.nan)}
+GEONAMES_STATES = {  # admin1 code -> state, for GeoNames DE.txt
+    "01": "Baden-Württemberg", "02": "Bavaria", "03": "Bremen", "04": "Hamburg", "05": "Hesse",
+    "06": "Lower Saxony", "07": "North Rhine-Westphalia", "08": "Rhineland-Palatinate", "09": "Saarland",
+    "10": "Schleswig-Holstein", "11": "Brandenburg", "12": "Mecklenburg-Vorpommern", "13": "Saxony",
+    "14": "Saxony-Anhalt", "15": "Thuringia", "16": "Berlin",
+}
+GC = Namespace("http://example.org/german-cuisine#")
+
+
+def parse_price(text):
+    """Price label -> (min, max) in euro; NaN when unknown or not a meal price ("$137" is a room rate)."""
+    text = str(text).strip() if pd.notna(text) else ""
+    match = re.fullmatch(r"€(\d+)[–-](\d+)", text)
+    if match:
+        return float(match.group(1)), float(match.group(2))
+    match = re.fullmatch(r"€(\d+)\+", text)
+    if match:
+        return float(match.group(1)), np.nan
+    if text and set(text) <= {"$", "€", "£"}:
+        return SYMBOL_BANDS.get(min(len(text), 4))
+    return np.nan, np.nan
+
+
+def city_key(city):
+    return str(city).strip().lower()
+
+
+def load_gazetteer(path=GAZETTEER_PATH):
+    """city key -> (state, lat, lon)."""
+    gazetteer = {}
+    if path.endswith(".txt"):
+        # GeoNames dump: the most populous place wins when names repeat
+        population = {}
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                cols = line.rstrip("\n").split("\t")
+                if cols[6] != "P":
+                    continue
+                key, pop = city_key(cols[1]), int(cols[14] or 0)
+                if pop >= population.get(key, -1):
+                    population[key] = pop
+                    gazetteer[key] = (GEONAMES_STATES.get(cols[10], ""), float(cols[4]), float(cols[5]))
+    else:
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                gazetteer[city_key(row["city"])] = (row["state"], float(row["lat"]), float(row["lon"]))
+    return gazetteer
+
+
+def geocode(city, gazetteer):
+    """Gazetteer entry for a city name, trying "Albstadt - Onstmettingen" / "X OT Y" as their main town."""
+    for candidate in (city, re.split(r"\s+-\s+|\s+OT\s+", str(city))[0]):
+        entry = gazetteer.get(city_key(candidate))
+        if entry:
+            return entry
+    return None
+
+
+def categorical(values):
+    """(codes, labels) with -1 for missing values."""
+    codes = pd.Categorical(values.replace("", np.nan))
+    return codes.codes.astype(np.int32), list(codes.categories)
+
+
+@dataclass
+class Venues:
+    title: np.ndarray
+    street: np.ndarray
+    score: np.ndarray  # float32, NaN = no rating
+    reviews: np.ndarray  # int32
+    rank: np.ndarray  # int32
+    price_min: np.ndarray  # float32 euro, NaN = unknown
+    price_max: np.ndarray
+    city: np.ndarray  # int32 codes into cities
+    category: np.ndarray  # int32 codes into categories
+    state: np.ndarray  # int32 codes into states, -1 = not in the gazetteer
+    lat: np.ndarray  # float64, NaN = not in the gazetteer
+    lon: np.ndarray
+    cities: list
+    categories: list
+    states: list
+
+    def __len__(self):
+        return len(self.title)
+
+    def scaled(self, factor):
+        """Copy with every venue repeated factor times (same cities, categories, positions) - for scaling benchmarks."""
+        return replace(self, **{f.name: np.tile(getattr(self, f.name), factor)
+                                for f in fields(self) if isinstance(getattr(self, f.name), np.ndarray)})
+
+
+def load_venues(path=RESTAURANTS_CSV, gazetteer_path=GAZETTEER_PATH):
+    start = time.perf_counter()
+    df = pd.read_csv(path, encoding="utf-8-sig", dtype=str, keep_default_na=False)
+    gazetteer = load_gazetteer(gazetteer_path)
+
+    prices = np.array([parse_price(p) for p in df["price"]], dtype=np.float32).reshape(-1, 2)
+    city_codes, cities = categorical(df["city"].str.strip())
+    category_codes, categories = categorical(df["categoryName"].str.strip())
+    # Geocode each distinct city once, then broadcast through the city codes
+    located = [geocode(city, gazetteer) or ("", np.nan, np.nan) for city in cities]
+    city_states = pd.Series([state for state, _, _ in located], dtype=str)
+    state_of_city, states = categorical(city_states)
+    city_lat = np.array([lat for _, lat, _ in located] + [np.nan])  # Trailing NaN for code -1
+    city_lon = np.array([lon for _, _, lon in located] + [np.nan])
+    state_of_city = np.append(state_of_city, -1)
+
+    venues = Venues(
+        title=df["title"].to_numpy(dtype=object),
+        street=df["street"].to_numpy(dtype=object),
+        score=pd.to_numeric(df["totalScore"], errors="coerce").to_numpy(dtype=np.float32),
+        reviews=pd.to_numeric(df["reviewsCount"], errors="coerce").fillna(0).to_numpy(dtype=np.int32),
+        rank=pd.to_numeric(df["rank"], errors="coerce").fillna(-1).to_numpy(dtype=np.int32),
+        price_min=prices[:, 0],
+        price_max=prices[:, 1],
+        city=city_codes,
+        category=category_codes,
+        state=state_of_city[city_codes],
+        lat=city_lat[city_codes],
+        lon=city_lon[city_codes],
+        cities=cities,
+        categories=categories,
+        states=states,
+    )
+    unlocated = np.isnan(venues.lat)
+    missing = sorted({cities[c] for c in np.unique(city_codes[unlocated]) if c >= 0})
+    print(f"🍴 Loaded {len(venues)} venues in {len(cities)} cities, {len(categories)} categories "
+          f"in {(time.perf_counter() - start) * 1000:.0f}ms")
+    if unlocated.any():
+        print(f"⚠️ {int(unlocated.sum())} of {len(venues)} venues could not be geocoded: "
+              f"{len(missing)} cities not in the gazetteer ({gazetteer_path}), e.g. {', '.join(missing[:5])}")
+    return venues
+
+
+def haversine_km(lat, lon, lats, lons):
+    lat, lon, lats, lons = map(np.radians, (lat, lon, lats, lons))
+    a = np.sin((lats - lat) / 2) ** 2 + np.cos(lat) * np.cos(lats) * np.sin((lons - lon) / 2) ** 2
+    return 6371.0 * 2 * np.arcsin(np.sqrt(a))
+
+
+class VenueIndex:
+    def __init__(self, venues):
+        start = time.perf_counter()
+        self.venues = venues
+        # Best first: rating, then review count; unrated venues last
+        self.order = np.lexsort((-venues.reviews, -np.nan_to_num(venues.score, nan=-1.0))).astype(np.int32)
+        self.by_city = self._postings(venues.city, len(venues.cities))
+        self.by_category = self._postings(venues.category, len(venues.categories))
+        self.by_state = self._postings(venues.state, len(venues.states))
+        self.lookup = {
+            "city": {city_key(c): i for i, c in enumerate(venues.cities)},
+            "category": {city_key(c): i for i, c in enumerate(venues.categories)},
+            "state": {city_key(s): i for i, s in enumerate(venues.states)},
+        }
+
+        # Venues sit at city centroids, so many share a position: the grid holds positions, not venues
+        located = ~np.isnan(venues.lat)
+        points, position = np.unique(np.stack([venues.lat[located], venues.lon[located]], axis=1),
+                                     axis=0, return_inverse=True)
+        codes = np.full(len(venues), -1, dtype=np.int32)
+        codes[located] = position.ravel()
+        self.position_lat, self.position_lon = points[:, 0], points[:, 1]
+        self.by_position = self._postings(codes, len(points))
+        self.grid = {}  # cell -> position ids
+        cells = np.floor(points / GRID_CELL_DEG).astype(int)
+        for pid, cell in enumerate(map(tuple, cells)):
+            self.grid.setdefault(cell, []).append(pid)
+        self.grid = {cell: np.array(pids, dtype=np.int32) for cell, pids in self.grid.items()}
+        print(f"🗂️ Indexed {len(venues)} venues ({len(points)} positions in {len(self.grid)} grid cells) "
+              f"in {(time.perf_counter() - start) * 1000:.0f}ms")
+
+    def _postings(self, codes, size):
+        """code -> venue rows having it, in self.order (best first)."""
+        ranked = codes[self.order]
+        grouping = np.argsort(ranked, kind="stable")
+        rows, ranked = self.order[grouping], ranked[grouping]
+        bounds = np.searchsorted(ranked, np.arange(size + 1))
+        return {code: rows[bounds[code]:bounds[code + 1]] for code in range(size)}
+
+    def _code(self, kind, name):
+        code = self.lookup[kind].get(city_key(name))
+        if code is None:
+            raise KeyError(f"Unknown {kind}: {name}")
+        return code
+
+    def _mask(self, rows, codes, max_price, min_reviews):
+        venues = self.venues
+        mask = np.ones(len(rows), dtype=bool)
+        for column, code in codes:
+            mask &= column[rows] == code
+        if max_price is not None:
+            mask &= venues.price_max[rows] <= max_price  # NaN (unknown price) never matches
+        if min_reviews:
+            mask &= venues.reviews[rows] >= min_reviews
+        return mask
+
+    def _filters(self, city, category, state):
+        filters = []
+        for kind, name, column, postings in (
+            ("city", city, self.venues.city, self.by_city),
+            ("category", category, self.venues.category, self.by_category),
+            ("state", state, self.venues.state, self.by_state),
+        ):
+            if name is not None:
+                code = self._code(kind, name)
+                filters.append((postings[code], column, code))
+        return filters
+
+    def _scan(self, candidates, k, codes, max_price, min_reviews):
+        """First k rows of a best-first posting list that pass the filters."""
+        hits = []
+        for offset in range(0, len(candidates), SCAN_CHUNK):
+            rows = candidates[offset:offset + SCAN_CHUNK]
+            hits.extend(rows[self._mask(rows, codes, max_price, min_reviews)][:k - len(hits)])
+            if len(hits) >= k:
+                break
+        return hits
+
+    def top_rated(self, k=10, city=None, category=None, state=None, max_price=None, min_reviews=0):
+        """Row ids of the k best-rated venues matching all filters."""
+        filters = self._filters(city, category, state)
+        candidates = min((f[0] for f in filters), key=len) if filters else self.order
+        codes = [(column, code) for _, column, code in filters]
+        return self._scan(candidates, k, codes, max_price, min_reviews)
+
+    def nearest(self, lat, lon, k=5, city=None, category=None, state=None, max_price=None, min_reviews=0):
+        """
+        (row id, km) of the k venues closest to a point, searching grid rings outwards. Venues at
+        the same position come best-rated first; at most k of them are read per position.
+        """
+        codes = [(column, code) for _, column, code in self._filters(city, category, state)]
+        ci, cj = math.floor(lat / GRID_CELL_DEG), math.floor(lon / GRID_CELL_DEG)
+        found_rows, found_km = [], []
+        max_ring = max((max(abs(a - ci), abs(b - cj)) for a, b in self.grid), default=0)
+        for ring in range(max_ring + 1):
+            cells = [(ci + di, cj + dj) for di in range(-ring, ring + 1) for dj in range(-ring, ring + 1)
+                     if max(abs(di), abs(dj)) == ring]
+            for cell in cells:
+                pids = self.grid.get(cell)
+                if pids is None:
+                    continue
+                distances = haversine_km(lat, lon, self.position_lat[pids], self.position_lon[pids])
+                for pid, km in zip(pids, distances):
+                    rows = self._scan(self.by_position[pid], k, codes, max_price, min_reviews)
+                    found_rows.extend(rows)
+                    found_km.extend([km] * len(rows))
+            # Venues outside the searched square are at least `ring` cells (in the shorter, longitude direction) away
+            bound_km = ring * GRID_CELL_DEG * 111.0 * math.cos(math.radians(lat))
+            if len(found_km) >= k and sorted(found_km)[k - 1] <= bound_km:
+                break
+        order = np.argsort(found_km, kind="stable")[:k]
+        return [(int(found_rows[i]), float(found_km[i])) for i in order]
+
+    def describe(self, row):
+        v = self.venues
+        price = "?" if np.isnan(v.price_max[row]) else f"≤€{v.price_max[row]:.0f}"
+        score = "-" if np.isnan(v.score[row]) else f"{v.score[row]:.1f}"
+        return f"{score:>4} ★ ({v.reviews[row]:>5})  {price:>6}  {v.title[row]} · {v.cities[v.city[row]]} · " \
+               f"{v.categories[v.category[row]] if v.category[row] >= 0 else '?'}"
+
+
+def benchmark(index, label):
+    for name, run in (("top_rated", lambda: index.top_rated(k=10, state="Bavaria", max_price=20)),
+                      ("nearest", lambda: index.nearest(48.78, 9.18, k=5, max_price=30))):
+        start = time.perf_counter()
+        for _ in range(BENCHMARK_RUNS):
+            run()
+        per_query = (time.perf_counter() - start) / BENCHMARK_RUNS
+        print(f"⏱️ {label}: {name} over {len(index.venues)} venues, {per_query * 1e6:.0f}µs per query")
+
+
+def slug(text):
+    """Local name like the rest of the graph: whitespace -> "_", hyphens kept ("North_Rhine-Westphalia")."""
+    text = re.sub(r"\s+", "_", str(text).strip())
+    return re.sub(r'[<>"{}|\\^`]', "", text)  # Not allowed in IRIs
+
+
+def add_to_graph(venues, changes):
+    """gc:Restaurant individuals (with city, region, category, rating, price, position) via a ChangeRecorder."""
+    for cls, codes, labels in (("City", venues.city, venues.cities), ("Region", venues.state, venues.states),
+                               ("RestaurantCategory", venues.category, venues.categories)):
+        changes.add((GC[cls], RDF.type, OWL.Class))
+        for code in np.unique(codes[codes >= 0]):
+            changes.add((GC[slug(labels[code])], RDF.type, GC[cls]))
+    changes.add((GC.Restaurant, RDF.type, OWL.Class))
+
+    seen = {}
+    triples = []
+    for row in range(len(venues)):
+        name = slug(f"{venues.title[row]} {venues.cities[venues.city[row]] if venues.city[row] >= 0 else ''}")
+        seen[name] = seen.get(name, 0) + 1
+        venue = GC[name if seen[name] == 1 else f"{name}_{seen[name]}"]
+        triples += [(venue, RDF.type, GC.Restaurant), (venue, RDF.type, OWL.NamedIndividual),
+                    (venue, RDFS.label, Literal(venues.title[row]))]
+        if venues.city[row] >= 0:
+            triples.append((venue, GC.locatedInCity, GC[slug(venues.cities[venues.city[row]])]))
+        if venues.state[row] >= 0:
+            triples.append((venue, GC.hasRegion, GC[slug(venues.states[venues.state[row]])]))
+        if venues.category[row] >= 0:
+            triples.append((venue, GC.hasRestaurantCategory, GC[slug(venues.categories[venues.category[row]])]))
+        if venues.street[row]:
+            triples.append((venue, GC.hasStreetAddress, Literal(venues.street[row])))
+        triples.append((venue, GC.hasReviewCount, Literal(int(venues.reviews[row]), datatype=XSD.integer)))
+        for prop, values in (("hasRating", venues.score), ("hasMinPrice", venues.price_min),
+                             ("hasMaxPrice", venues.price_max), ("hasLatitude", venues.lat),
+                             ("hasLongitude", venues.lon)):
+            if not np.isnan(values[row]):
+                triples.append((venue, GC[prop], Literal(round(float(values[row]), 4), datatype=XSD.decimal)))
+    for triple in triples:
+        changes.add(triple)
+    print(f"📥 Added {len(venues)} restaurants ({len(changes)} changed triples)")
+
+
+if __name__ == "__main__":
+    venues = load_venues()
+    index = VenueIndex(venues)
+
+    print("\n🏆 Top-rated in Ingolstadt (Bavaria) up to €20:")
+    for row in index.top_rated(k=5, state="Bavaria", city="Ingolstadt", max_price=20):
+        print("  ", index.describe(row))
+    print("\n📍 Closest to Stuttgart centre up to €30:")
+    for row, km in index.nearest(48.78, 9.18, k=5, max_price=30):
+        print(f"   {km:5.1f} km  {index.describe(row)}")
+
+    print()
+    benchmark(index, "dataset")
+    benchmark(VenueIndex(venues.scaled(SCALE_FACTOR)), f"{SCALE_FACTOR}x replicated")
+
+    graph = load_graph(INPUT_ONTOLOGY, format="xml")
+    changes = ChangeRecorder(graph)
+    add_to_graph(venues, changes)
+    output = save_graph(graph, OUTPUT_ONTOLOGY)
+    print(f"✅ Ontology with restaurants saved to {output}")
+    store = VersionStore()
+    if "v10" in store and "v11" not in store:
+        store.commit("v11", changes, parent="v10")
@@ -0,0 +1,273 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from rdflib.plugins.sparql import prepareQuery, prepareUpdate
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ont-engineering-scripts"))
+from ontology_snapshot import load_graph
+
+'''
+Local SPARQL 1.1 endpoint over the German cuisine graph.
+
+The graph is loaded once and kept in memory. Two caches sit in front of rdflib:
+  - plan cache:   query text -> prepared (parsed + algebra) query
+  - result cache: query text -> serialized result, dropped on every update
+Protocol (SPARQL 1.1 Protocol, the subset rdflib can answer):
+  GET  /sparql?query=...                    POST /sparql  (form "query=" or application/sparql-query)
+  POST /update  (form "update=" or application/sparql-update)
+  GET  /stats                               query and cache counters as JSON
+SELECT/ASK answer with application/sparql-results+json, CONSTRUCT/DESCRIBE with N-Triples.
+Query responses carry "X-Cache: hit" or "X-Cache: miss" (result cache).
+
+Queries share a read lock and run side by side; an update takes the write
+lock, waits for running queries and holds new ones back until it is done.
+Under the GIL evaluations still take turns on one core, but a long query no
+longer makes every other cache miss queue up behind it.
+
+Run:  python sparql_endpoint.py   then   python load_generator.py
+'''
+
+# === CONFIG ===
+ONTOLOGY_PATH = os.environ.get("ONTOLOGY_PATH", "../ontology-update-scripts/v10-ontology.rdf")
+HOST = os.environ.get("SPARQL_HOST", "127.0.0.1")
+PORT = int(os.environ.get("SPARQL_PORT", "3030"))
+PLAN_CACHE_SIZE = 256
+RESULT_CACHE_SIZE = 1024
+NAMESPACES = {
+    "gc": "http://example.org/german-cuisine#",
+    "rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
+    "rdfs": "http://www.w3.org/2000/01/rdf-schema#",
+    "owl": "http://www.w3.org/2002/07/owl#",
+    "xsd": "http://www.w3.org/2001/XMLSchema#",
+}
+
+
+class LRU:
+    """Small thread-safe least-recently-used map."""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+class ReadWriteLock:
+    """Any number of readers or one writer; a waiting writer holds back new readers so updates are not starved."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self):
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
+class QueryService:
+    """Thread-safe query/update front end for one in-memory rdflib graph."""
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.version = 0  # Bumped by every update; cached results belong to one version
+        self.plans = LRU(PLAN_CACHE_SIZE)
+        self.results = LRU(RESULT_CACHE_SIZE)
+        self.stats = {"queries": 0, "updates": 0, "plan_hits": 0, "result_hits": 0, "errors": 0}
+        self._stats_lock = threading.Lock()
+        # rdflib's memory store is not safe for reads during writes: queries read-lock, updates write-lock
+        self._lock = ReadWriteLock()
+        self._parse_lock = threading.Lock()  # rdflib's pyparsing grammar is shared and not thread-safe
+
+    def count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def stats_snapshot(self):
+        with self._stats_lock:
+            return dict(self.stats)
+
+    def prepare(self, query):
+        plan = self.plans.get(query)
+        if plan is None:
+            with self._parse_lock:
+                plan = prepareQuery(query, initNs=NAMESPACES)
+            self.plans.put(query, plan)
+        else:
+            self.count("plan_hits")
+        return plan
+
+    def query(self, query):
+        """Return (content_type, body bytes, cache hit) for a query, from the result cache when possible."""
+        self.count("queries")
+        key = (self.version, query)
+        cached = self.results.get(key)
+        if cached is not None:
+            self.count("result_hits")
+            return cached + (True,)
+        with self._lock.read():
+            version = self.version
+            result = self.graph.query(self.prepare(query))
+            if result.type in ("SELECT", "ASK"):
+                answer = ("application/sparql-results+json", result.serialize(format="json"))
+            else:
+                answer = ("application/n-triples", result.serialize(format="nt"))
+        self.results.put((version, query), answer)
+        return answer + (False,)
+
+    def update(self, update):
+        with self._parse_lock:
+            plan = prepareUpdate(update, initNs=NAMESPACES)
+        with self._lock.write():
+            self.graph.update(plan)
+            self.version += 1
+            self.results.clear()
+        self.count("updates")
+
+
+def make_handler(service):
+    class SparqlHandler(BaseHTTPRequestHandler):
+        def _send(self, status, content_type, body, headers=None):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _error(self, status, message):
+            service.count("errors")
+            self._send(status, "text/plain; charset=utf-8", message.encode("utf-8"))
+
+        def _read_body(self):
+            length = int(self.headers.get("Content-Length", 0))
+            body = self.rfile.read(length).decode("utf-8")
+            content_type = self.headers.get("Content-Type", "").split(";")[0].strip()
+            if content_type == "application/x-www-form-urlencoded":
+                return content_type, parse_qs(body)
+            return content_type, body
+
+        def _run_query(self, query):
+            try:
+                content_type, body, hit = service.query(query)
+            except Exception as e:
+                self._error(400, f"Query failed: {e}")
+                return
+            self._send(200, content_type, body, {"X-Cache": "hit" if hit else "miss"})
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/stats":
+                stats = dict(service.stats_snapshot(), version=service.version, cached_plans=len(service.plans),
+                             cached_results=len(service.results), triples=len(service.graph))
+                self._send(200, "application/json", json.dumps(stats).encode("utf-8"))
+            elif url.path == "/sparql":
+                query = parse_qs(url.query).get("query")
+                if not query:
+                    self._error(400, "Missing 'query' parameter")
+                    return
+                self._run_query(query[0])
+            else:
+                self._error(404, "Not found")
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            content_type, body = self._read_body()
+            if url.path == "/sparql":
+                if content_type == "application/sparql-query":
+                    self._run_query(body)
+                elif isinstance(body, dict) and body.get("query"):
+                    self._run_query(body["query"][0])
+                else:
+                    self._error(400, "Expected application/sparql-query or a form 'query' field")
+            elif url.path == "/update":
+                update = body if content_type == "application/sparql-update" else \
+                    (body.get("update", [None])[0] if isinstance(body, dict) else None)
+                if not update:
+                    self._error(400, "Expected application/sparql-update or a form 'update' field")
+                    return
+                try:
+                    service.update(update)
+                except Exception as e:
+                    self._error(400, f"Update failed: {e}")
+                    return
+                self._send(204, "text/plain", b"")
+            else:
+                self._error(404, "Not found")
+
+        def log_message(self, format, *args):
+            pass  # One line per request would drown the load test output
+
+    return SparqlHandler
+
+
+def main():
+    start = time.perf_counter()
+    graph = load_graph(ONTOLOGY_PATH, format="xml")
+    print(f"✅ Loaded {len(graph)} triples in {time.perf_counter() - start:.2f}s")
+    service = QueryService(graph)
+    server = ThreadingHTTPServer((HOST, PORT), make_handler(service))
+    print(f"🚀 SPARQL endpoint on http://{HOST}:{PORT}/sparql (updates: /update, stats: /stats)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Shutting down")
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
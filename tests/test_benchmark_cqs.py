@@ -0,0 +1,39 @@
+import os
+import sys
+
+import pytest
+from rdflib import Graph, RDF
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "query-scripts"))
+import benchmark_cqs
+import ontology_snapshot
+from competency_questions import COMPETENCY_QUESTIONS, GC
+
+
+@pytest.fixture
+def bench(monkeypatch, tmp_path):
+    graph = Graph()
+    graph.add((GC.Weisswurst, RDF.type, GC.Dish))
+    graph.add((GC.Weisswurst, GC.hasRegion, GC.Bavaria))
+    path = tmp_path / "tiny.rdf"
+    graph.serialize(path, format="xml")
+    monkeypatch.setattr(ontology_snapshot, "SNAPSHOTS_ENABLED", False)
+    monkeypatch.setattr(benchmark_cqs, "VERSIONS", {"tiny": str(path)})
+    monkeypatch.setattr(benchmark_cqs, "OUTPUT_DIR", str(tmp_path / "out"))
+    monkeypatch.setattr(benchmark_cqs, "BASELINE_PATH", str(tmp_path / "out" / "baseline.csv"))
+    monkeypatch.setattr(benchmark_cqs, "REPEATS", 1)
+    return benchmark_cqs
+
+
+def test_empty_answers_fail_and_are_not_stored_as_baseline(bench):
+    with pytest.raises(SystemExit):
+        bench.main()
+    assert not os.path.exists(bench.BASELINE_PATH)
+
+
+def test_not_applicable_questions_are_skipped(bench, monkeypatch):
+    answerable = {"CQ01", "CQ11"}
+    monkeypatch.setattr(bench, "NOT_APPLICABLE", {"tiny": {cq.id: "not in the tiny graph"
+                                                           for cq in COMPETENCY_QUESTIONS if cq.id not in answerable}})
+    bench.main()
+    assert set(key[1] for key in bench.read_csv(bench.BASELINE_PATH)) == answerable
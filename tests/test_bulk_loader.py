@@ -0,0 +1,69 @@
+import io
+import os
+import sys
+
+import pandas as pd
+from owlready2 import DataProperty, Thing, World
+from rdflib import XSD, Graph, Literal
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ontologycreation-scripts"))
+from bulk_loader import TripleBuilder, bulk_insert, to_float, yes_no
+from edge_tables import Vocabulary, build_edge_tables, clean_values
+
+
+def beverages():
+    return pd.DataFrame({
+        "BeverageName": ["Abteibier", "Apfelwein", "Apfelwein"],
+        "Description": ['Dark "abbey" beer\nfrom Bavaria', "Cider", "Hessian cider"],
+        "IsCarbonated": ["yes", "no", "no"],
+        "AlcoholContent": ["7", "5.5", "x"],
+        "Ingredient": ["Malt, Hops", "Apple", "apple"],
+    })
+
+
+def build():
+    df = beverages()
+    world = World()
+    onto = world.get_ontology("http://example.org/german-cuisine#")
+    with onto:
+        class Beverage(Thing): pass
+        class hasDescription(Thing >> str, DataProperty): pass
+        class isCarbonated(Beverage >> bool, DataProperty): pass
+        class hasAlcoholContent(Beverage >> float, DataProperty): pass
+    tables = build_edge_tables(df, "BeverageName", {"Ingredient": "hasIngredient"})
+    builder = TripleBuilder(onto.base_iri)
+    names = builder.add_individuals(df["BeverageName"], "Beverage")
+    builder.add_data_values(names, "hasDescription", clean_values(df["Description"]))
+    builder.add_data_values(names, "isCarbonated", yes_no(df["IsCarbonated"]), "boolean")
+    builder.add_data_values(names, "hasAlcoholContent", to_float(df["AlcoholContent"]), "decimal")
+    builder.add_edges(tables, "hasIngredient", "Ingredient")
+    bulk_insert(onto, builder)
+    return onto, builder
+
+
+def test_bulk_insert_writes_the_quadstore():
+    onto, _ = build()
+    abteibier, apfelwein = onto.Abteibier, onto.Apfelwein
+    assert abteibier.is_a == [onto.Beverage]
+    assert abteibier.hasDescription == ['Dark "abbey" beer\nfrom Bavaria']
+    assert abteibier.isCarbonated == [True] and apfelwein.isCarbonated == [False]
+    assert apfelwein.hasDescription == ["Hessian cider"] and apfelwein.hasAlcoholContent == [0.0]
+    # Case-sensitive by default: "Apple" and "apple" are two individuals
+    assert {i.name for i in onto.Ingredient.instances()} == {"Malt", "Hops", "Apple", "apple"}
+
+
+def test_ntriples_match_the_inserted_triples():
+    onto, builder = build()
+    buffer = io.BytesIO()
+    onto.save(file=buffer, format="ntriples")
+    saved = Graph().parse(data=buffer.getvalue().decode("utf-8"), format="nt")
+    rendered = Graph().parse(data=builder.to_ntriples(), format="nt")
+    # owlready2 writes plain strings as xsd:string literals - the same literal in RDF 1.1
+    plain = {(s, p, Literal(str(o)) if getattr(o, "datatype", None) == XSD.string else o) for s, p, o in saved}
+    assert set(rendered) <= plain
+
+
+def test_vocabulary_fold_case():
+    values = pd.Series(["Beer", "beer", "Wine"])
+    assert list(Vocabulary().encode(values)) == [0, 1, 2]
+    assert list(Vocabulary(fold_case=True).encode(values)) == [0, 0, 1]
@@ -0,0 +1,31 @@
+import os
+import sys
+
+import pandas as pd
+from rdflib import Graph, RDF
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "query-scripts"))
+from cuisine_linking import ALIASES, GC, link_categories, local_name, normalize
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def graph_names():
+    graph = Graph()
+    graph.parse(os.path.join(ROOT, "ontology-update-scripts", "v10-ontology.rdf"), format="xml")
+    return [sorted({local_name(s) for s in graph.subjects(RDF.type, cls)}) for cls in (GC.Region, GC.Dish)]
+
+
+def test_real_categories_link_to_existing_regions():
+    regions, dishes = graph_names()
+    categories = set(pd.read_csv(os.path.join(ROOT, "data", "german_restaurnts_2024.csv"), dtype=str,
+                                 keep_default_na=False)["categoryName"].str.strip()) - {""}
+    normalized_regions = {normalize(r) for r in regions}
+    assert [target for target in ALIASES.values() if target and normalize(target) not in normalized_regions] == []
+
+    links = link_categories(categories, regions, dishes, ["Bavaria", "Baden-Württemberg"])
+    region_links = {category: [name for name, _ in matched] for category, (matched, _) in links.items() if matched}
+    assert region_links["German restaurant"] == ["Nationwide"]
+    assert region_links["Bavarian restaurant"] == ["Bavaria"]
+    assert region_links["Italian restaurant"] == ["Italy"]
+    assert set(name for names in region_links.values() for name in names) <= set(regions)
@@ -0,0 +1,141 @@
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "datapopulation-scripts"))
+from enrichment import DISH_SPEC, MAX_FIELD_RETRIES, Enricher, OllamaBackend
+from llm_cache import LLMCache, NullCache
+from llm_journal import RowJournal
+
+ANSWER = {"Description": "Potato dumplings", "Region": "Bavaria", "PreparationTimeMinutes": 40}
+
+
+class FakeOllama(BaseHTTPRequestHandler):
+    """Answers /api/generate and /api/chat like Ollama; drops the connection for prompts mentioning "Broken"."""
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.paths.append(self.path)
+        prompt = payload.get("prompt") or payload["messages"][-1]["content"]
+        if "Broken" in prompt:
+            self.close_connection = True
+            self.connection.shutdown(2)
+            return
+        text = json.dumps(ANSWER)
+        body = {"message": {"role": "assistant", "content": text}} if self.path == "/api/chat" else {"response": text}
+        body.update(done=True, prompt_eval_count=10, eval_count=5)
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def ollama():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOllama)
+    server.paths = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def dishes():
+    return pd.DataFrame({"DishName": ["Knödel", "Broken dish", "Spätzle"]})
+
+
+@pytest.mark.parametrize("prompt_mode, path", [("generate", "/api/generate"), ("chat", "/api/chat")])
+def test_fill_dataframe_against_fake_server(ollama, prompt_mode, path):
+    server, url = ollama
+    enricher = Enricher(spec=DISH_SPEC, backend=OllamaBackend(base_url=url), cache=NullCache(),
+                        max_in_flight=2, prompt_mode=prompt_mode)
+    df = enricher.fill_dataframe(dishes())
+
+    assert set(server.paths) == {path}
+    assert df.loc[0, "Region"] == "Bavaria" and df.loc[2, "PreparationTimeMinutes"] == "40"
+    # The dropped connection only fails its own row
+    assert pd.isna(df.loc[1, "Region"]) or df.loc[1, "Region"] == ""
+    assert enricher.stats["requests"] == (3 if prompt_mode == "chat" else 2)  # chat mode warms up the prefix
+
+
+def test_journal_is_kept_until_every_row_succeeded(ollama, tmp_path):
+    server, url = ollama
+    output, journal_path = str(tmp_path / "out.csv"), str(tmp_path / "out.csv.journal.jsonl")
+
+    def run(df):
+        enricher = Enricher(spec=DISH_SPEC, backend=OllamaBackend(base_url=url), cache=NullCache())
+        journal = RowJournal(journal_path)
+        df = enricher.fill_dataframe(df, journal=journal)
+        journal.compact(df, output, complete=not enricher.failed_rows, index=False)
+        return enricher
+
+    assert run(dishes()).failed_rows == [1]
+    assert os.path.exists(output) and len(RowJournal(journal_path)) == 2
+
+    requests_before = len(server.paths)
+    assert run(dishes()).failed_rows == [1]
+    assert len(server.paths) == requests_before + 1  # Only the failed row is asked again
+    assert os.path.exists(journal_path)
+
+    assert run(dishes().drop(index=1)).failed_rows == []
+    assert not os.path.exists(journal_path)
+    assert pd.read_csv(output)["Region"].tolist() == ["Bavaria", "Bavaria"]
+
+
+def test_complete_returns_none_when_server_is_down(ollama):
+    server, url = ollama
+    server.shutdown()
+    server.server_close()
+    assert OllamaBackend(base_url=url).complete("hi", "gemma3:12b") is None
+
+
+def test_map_counts_raising_batches_as_failed():
+    enricher = Enricher(spec=DISH_SPEC, backend=object(), cache=NullCache(), max_in_flight=2)
+
+    def work(batch):
+        if "b" in batch:
+            raise requests.ConnectionError("reset")
+        return {item: item.upper() for item in batch}
+
+    assert enricher.map(["a", "b", "c"], work, key=lambda item: item) == {"a": "A", "b": None, "c": "C"}
+
+
+class ScriptedBackend:
+    """Returns the given answers in order, one per complete() call."""
+
+    def __init__(self, *answers):
+        self.answers = list(answers)
+
+    def complete(self, prompt, model, system=None, fmt=None, options=None):
+        return {"text": self.answers.pop(0), "ttft": None, "latency": 0.0}
+
+
+def test_structured_answers_are_validated_before_caching(tmp_path):
+    cache = LLMCache(path=str(tmp_path / "cache.sqlite"))
+    row = pd.Series({"DishName": "Knödel", "PreparationTimeMinutes": None})
+    make_prompt = lambda fields: f"{row['DishName']}: {fields}"
+    schemas = DISH_SPEC.field_schemas
+
+    enricher = Enricher(spec=DISH_SPEC, backend=ScriptedBackend(*['{"PreparationTimeMinutes": "soon"}'] * (MAX_FIELD_RETRIES + 1)),
+                        cache=cache, structured=True)
+    assert enricher.ask_structured(make_prompt, ["PreparationTimeMinutes"], schemas) == {}
+    assert enricher.stats["parse_failures"] == MAX_FIELD_RETRIES + 1
+
+    # Nothing invalid was cached, so the next run asks the model again and caches the valid answer
+    enricher = Enricher(spec=DISH_SPEC, backend=ScriptedBackend('{"PreparationTimeMinutes": 40}'),
+                        cache=cache, structured=True)
+    assert enricher.ask_structured(make_prompt, ["PreparationTimeMinutes"], schemas) == {"PreparationTimeMinutes": 40}
+    enricher.backend = ScriptedBackend()
+    assert enricher.ask_structured(make_prompt, ["PreparationTimeMinutes"], schemas) == {"PreparationTimeMinutes": 40}
@@ -0,0 +1,115 @@
+import importlib.util
+import json
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ontology-update-scripts", "extract-foodatlas-api.py")
+spec = importlib.util.spec_from_file_location("extract_foodatlas_api", SCRIPT)
+atlas = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(atlas)
+
+PAGES = 5  # Full dish pages; page 5 and later are empty
+
+
+class FakeAtlas(BaseHTTPRequestHandler):
+    send_total = True
+    flaky = {}     # page -> requests that fail before it answers
+    broken = set()  # pages that always fail
+    slow = {}      # page -> seconds before it answers
+    hits = Counter()
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        page, kind = int(query["page"][0]), int(query["filters"][0])
+        FakeAtlas.hits[page] += 1
+        time.sleep(self.slow.get(page, 0))
+        if page in self.broken or self.hits[page] <= self.flaky.get(page, 0):
+            self.send_error(503)
+            return
+        items = [{"EntityType": kind, "Name": f"Dish {page}-{i}", "Description": f"<p>Page {page}</p>"}
+                 for i in range(atlas.PAGE_SIZE)] if page < PAGES else []
+        data = {"Data": items}
+        if self.send_total:
+            data["TotalCount"] = PAGES * atlas.PAGE_SIZE
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch, tmp_path):
+    FakeAtlas.send_total, FakeAtlas.flaky, FakeAtlas.broken, FakeAtlas.slow = True, {}, set(), {}
+    FakeAtlas.hits = Counter()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FakeAtlas)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    monkeypatch.setattr(atlas, "BASE_URL", f"http://127.0.0.1:{httpd.server_port}/api/v3/regions/55/data")
+    monkeypatch.setattr(atlas, "PAGE_CACHE_DIR", str(tmp_path / "pages"))
+    monkeypatch.setattr(atlas, "BACKOFF_S", 0)
+    yield FakeAtlas
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def fetch(kind="dishes"):
+    written = []
+    with requests.Session() as session, ThreadPoolExecutor(max_workers=atlas.MAX_WORKERS) as pool:
+        rows, missing = atlas.fetch_stream(session, pool, kind, written.extend)
+    assert written == rows
+    return rows, missing
+
+
+def pages_of(rows):
+    return [int(row["Name"].split()[1].split("-")[0]) for row in rows]
+
+
+@pytest.mark.parametrize("send_total", [True, False])
+def test_rows_are_written_in_page_order(server, send_total):
+    server.send_total = send_total
+    server.slow = {1: 0.2}  # Pages 2.. arrive first and wait for page 1
+    rows, missing = fetch()
+
+    assert missing == []
+    assert pages_of(rows) == sorted(pages_of(rows)) and len(rows) == PAGES * atlas.PAGE_SIZE
+    assert rows[0] == {"Name": "Dish 0-0", "Description": "Page 0"}
+
+
+@pytest.mark.parametrize("send_total", [True, False])
+def test_failed_pages_are_retried_and_reported(server, send_total):
+    server.send_total = send_total
+    server.flaky = {2: atlas.MAX_RETRIES}  # Answers on the last retry
+    server.broken = {3}
+    rows, missing = fetch()
+
+    assert missing == [3]
+    assert server.hits[2] == server.hits[3] == atlas.MAX_RETRIES + 1
+    assert sorted(set(pages_of(rows))) == [0, 1, 2, 4]  # A failed page does not end the stream
+
+
+def test_unreachable_first_page_is_an_error_not_an_empty_stream(server):
+    server.broken = {0}
+    assert fetch() == ([], [0])
+
+
+def test_rerun_only_fetches_missing_pages(server):
+    server.broken = {3}
+    fetch()
+    server.broken = set()
+    server.hits = Counter()
+    rows, missing = fetch()
+
+    assert missing == [] and len(rows) == PAGES * atlas.PAGE_SIZE
+    assert set(server.hits) == {3}  # Full pages come from the page cache
@@ -0,0 +1,43 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "datapopulation-scripts"))
+from german_text import normalize_german_chars, normalize_series, repair_frame, repair_mojibake
+
+
+def test_repair_mojibake():
+    assert repair_mojibake("WÃ¼rttemberg") == "Württemberg"
+    assert repair_mojibake("Württemberg") == "Württemberg"
+    assert repair_mojibake("WÃƒÂ¼rttemberg") == "Württemberg"  # Decoded wrongly twice
+
+
+def test_unrepairable_mojibake_is_left_as_is(capsys):
+    broken = "Knusprige Fisch-Frikadellen mit BÃ\x83Â\x87Ã\x82Â¸chamelkartoffeln"  # data/dishes.csv:362
+    assert repair_mojibake(broken) == broken  # Not "BÇ¸chamelkartoffeln" or "BǸchamelkartoffeln"
+
+    df = pd.DataFrame({"name": [broken, "WÃ¼rttemberg"]})
+    assert repair_frame(df) == 1
+    assert df["name"].tolist() == [broken, "Württemberg"]
+    assert "1 cells look like mojibake but could not be repaired" in capsys.readouterr().out
+
+
+def test_repair_frame_counts_only_changed_cells():
+    df = pd.DataFrame({
+        "object": ["WÃ¼rttemberg", np.nan, "Bayern", None],
+        "string": pd.array(["KÃ¤se", pd.NA, "Brot", "SpÃ¤tzle"], dtype="string"),
+        "number": [1, 2, 3, 4],
+    })
+    assert repair_frame(df) == 3
+    assert df["object"].tolist()[0] == "Württemberg" and df["object"].isna().sum() == 2
+    assert df["string"].tolist() == ["Käse", pd.NA, "Brot", "Spätzle"]
+    assert repair_frame(df) == 0
+
+
+def test_normalize_series():
+    series = pd.Series(["Käsespätzle", "Süß\nund sauer", np.nan, "Bier"])
+    normalized = normalize_series(series)
+    assert normalized.tolist()[:2] == ["Kaesespaetzle", "Suess und sauer"] and pd.isna(normalized[2])
+    assert normalize_german_chars("Straße") == "Strasse"
@@ -0,0 +1,51 @@
+import os
+import sys
+
+from rdflib import XSD, Graph, Literal, Namespace
+from rdflib.compare import isomorphic
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ont-engineering-scripts"))
+from ntriples_io import export_graph, load_ntriples, triple_line
+from ontology_versions import ChangeRecorder, VersionStore
+
+GC = Namespace("http://example.org/german-cuisine#")
+TRICKY = [
+    Literal("Dumplings\nwith \"gravy\"\r\nand a \\ backslash"),
+    Literal("Kloß mit Soße", lang="de"),
+    Literal("40", datatype=XSD.integer),
+    Literal(True),
+]
+
+
+def graph():
+    g = Graph()
+    for i, literal in enumerate(TRICKY):
+        g.add((GC[f"Dish{i}"], GC.hasDescription, literal))
+    g.add((GC.Dish0, GC.hasRegion, GC.Bavaria))
+    return g
+
+
+def test_triple_line_keeps_literals_on_one_line():
+    for literal in TRICKY:
+        line = triple_line(GC.Dish, GC.hasDescription, literal)
+        assert line.count("\n") == 1 and line.endswith(" .\n")
+        assert Graph().parse(data=line, format="nt").value(GC.Dish, GC.hasDescription) == literal
+
+
+def test_export_roundtrip(tmp_path):
+    for name in ("dishes.nt", "dishes.nt.gz"):
+        path = str(tmp_path / name)
+        assert export_graph(graph(), path) == len(graph())
+        assert isomorphic(load_ntriples(path), graph())
+
+
+def test_version_delta_roundtrip(tmp_path):
+    store = VersionStore(str(tmp_path / "store"))
+    g = Graph()
+    g.add((GC.Dish0, GC.hasRegion, GC.Bavaria))
+    store.init_base("v1", g)
+    changes = ChangeRecorder(g)
+    for s, p, o in graph():
+        changes.add((s, p, o))
+    store.commit("v2", changes, parent="v1")
+    assert isomorphic(store.materialize("v2"), graph())
@@ -0,0 +1,77 @@
+import os
+import sys
+
+import numpy as np
+from rdflib import Graph, RDF
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "query-scripts"))
+from cuisine_linking import TrigramIndex, link_restaurants, normalize
+from ontology_versions import ChangeRecorder
+from restaurants import GC, VenueIndex, add_to_graph, haversine_km, load_venues, slug
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+STATES = ["North Rhine-Westphalia", "Rhineland-Palatinate", "Saxony-Anhalt", "Mecklenburg-Vorpommern",
+          "Baden-Württemberg"]
+
+
+def venues():
+    return load_venues(os.path.join(DATA, "german_restaurnts_2024.csv"), os.path.join(DATA, "gazetteer_de.csv"))
+
+
+def test_slug_matches_region_individuals():
+    assert [slug(s) for s in STATES] == ["North_Rhine-Westphalia", "Rhineland-Palatinate", "Saxony-Anhalt",
+                                         "Mecklenburg-Vorpommern", "Baden-Württemberg"]
+    assert slug(' Bed & Breakfast "Zur Post" ') == "Bed_&_Breakfast_Zur_Post"
+
+
+def test_restaurants_reuse_existing_regions():
+    graph = Graph()
+    for state in STATES + ["Bavaria", "Hesse", "Lower Saxony", "Saxony", "Schleswig-Holstein", "Thuringia"]:
+        graph.add((GC[slug(state)], RDF.type, GC.Region))
+    graph.add((GC["Baden-Wuerttemberg"], RDF.type, GC.Region))  # Alternative spelling from the LLM data
+    regions = set(graph.subjects(RDF.type, GC.Region))
+    changes = ChangeRecorder(graph)
+
+    add_to_graph(venues(), changes)
+    assert set(graph.subjects(RDF.type, GC.Region)) == regions
+    assert (None, GC.hasRegion, GC["North_Rhine-Westphalia"]) in graph
+
+    link_restaurants(graph, changes)
+    linked = set(graph.objects(None, GC.servesCuisineOf))
+    assert GC.Bavaria in linked and linked <= regions
+
+
+def test_trigram_index_prefers_given_spelling():
+    names = ["Baden-Wuerttemberg", "Baden-Württemberg", "Bavaria"]
+    assert normalize(names[0]) == normalize(names[1])
+    assert TrigramIndex(names).search("baden wuerttemberg") == [("Baden-Wuerttemberg", 1.0)]
+    assert TrigramIndex(names, ["Baden-Württemberg"]).search("baden wuerttemberg") == [("Baden-Württemberg", 1.0)]
+
+
+def test_scaled_index_returns_replicas():
+    data = venues()
+    scaled = data.scaled(3)
+    assert len(scaled) == 3 * len(data) and scaled.cities is data.cities
+    assert np.array_equal(scaled.city[len(data):2 * len(data)], data.city)
+    best = VenueIndex(data).top_rated(k=1, state="Bavaria")[0]
+    assert {row % len(data) for row in VenueIndex(scaled).top_rated(k=3, state="Bavaria")} == {best}
+
+
+def test_every_city_is_geocoded():
+    data = venues()
+    assert not np.isnan(data.lat).any()
+    assert (data.state >= 0).all()
+
+
+def test_nearest_matches_brute_force_and_scales():
+    data = venues()
+    index = VenueIndex(data)
+    for lat, lon, max_price in ((48.78, 9.18, 30), (50.98, 10.32, None), (54.3, 8.9, 20)):
+        found = index.nearest(lat, lon, k=7, max_price=max_price)
+        km = haversine_km(lat, lon, data.lat, data.lon)
+        if max_price is not None:
+            km[~(data.price_max <= max_price)] = np.inf
+        assert [round(d, 6) for _, d in found] == [round(d, 6) for d in np.sort(km)[:7]]
+        best = index.nearest(lat, lon, k=1, max_price=max_price)[0][0]
+        scaled = VenueIndex(data.scaled(3)).nearest(lat, lon, k=3, max_price=max_price)
+        assert {row % len(data) for row, _ in scaled} == {best}  # Replicas of the best venue at that spot
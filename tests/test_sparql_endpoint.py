@@ -0,0 +1,76 @@
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer
+
+import requests
+from rdflib import Graph, Namespace, RDF
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "query-scripts"))
+from sparql_endpoint import QueryService, ReadWriteLock, make_handler
+
+GC = Namespace("http://example.org/german-cuisine#")
+REGIONS = ["Bavaria", "Saxony", "Hesse", "Berlin"]
+
+
+def graph():
+    g = Graph()
+    for i in range(200):
+        dish = GC[f"Dish{i}"]
+        g.add((dish, RDF.type, GC.Dish))
+        g.add((dish, GC.hasRegion, GC[REGIONS[i % len(REGIONS)]]))
+    return g
+
+
+def region_query(region):
+    return f"SELECT ?dish WHERE {{ ?dish a gc:Dish ; gc:hasRegion gc:{region} . }}"
+
+
+def count(answer):
+    return len(json.loads(answer[1])["results"]["bindings"])
+
+
+def test_concurrent_queries_and_updates():
+    service = QueryService(graph())
+
+    def client(i):
+        for j in range(25):
+            if i == 0 and j % 5 == 0:
+                service.update(f"INSERT DATA {{ gc:New{j} a gc:Dish ; gc:hasRegion gc:Bavaria . }}")
+            else:
+                count(service.query(region_query(REGIONS[(i + j) % len(REGIONS)])))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(client, range(8)))  # Re-raises any query that failed
+
+    stats = service.stats_snapshot()
+    assert stats["updates"] == 5 and stats["queries"] == 8 * 25 - 5 and stats["errors"] == 0
+    assert count(service.query(region_query("Bavaria"))) == 50 + 5
+
+
+def test_write_lock_excludes_readers():
+    lock = ReadWriteLock()
+    inside = []
+    with lock.read():
+        writer = threading.Thread(target=lambda: lock.write().__enter__() or inside.append("writer"))
+        writer.start()
+        writer.join(0.2)
+        assert inside == [] and writer.is_alive()  # Waits for the reader
+    writer.join(1)
+    assert inside == ["writer"]
+
+
+def test_x_cache_header():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(QueryService(graph())))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/sparql"
+    try:
+        first = requests.get(url, params={"query": region_query("Hesse")})
+        second = requests.get(url, params={"query": region_query("Hesse")})
+        assert first.status_code == second.status_code == 200
+        assert (first.headers["X-Cache"], second.headers["X-Cache"]) == ("miss", "hit")
+    finally:
+        server.shutdown()
+        server.server_close()
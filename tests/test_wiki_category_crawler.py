@@ -0,0 +1,96 @@
+import asyncio
+import hashlib
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "webscraping-scripts"))
+from wiki_category_crawler import CategoryCrawler, HttpCache, category_name
+
+# Trimmed de.wikipedia category pages (mw-subcategories / mw-pages / pagination markup kept)
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "wiki")
+PAGES = {
+    "/wiki/Kategorie:Biersorte": "biersorte.html",
+    "/w/index.php?title=Kategorie:Biersorte&pagefrom=Märzen": "biersorte_pagefrom_maerzen.html",
+    "/wiki/Kategorie:Bockbier": "bockbier.html",
+    "/wiki/Kategorie:Obergäriges_Bier": "obergaeriges_bier.html",
+    "/wiki/Kategorie:Doppelbock": "doppelbock.html",
+}
+
+
+class FakeWiki(BaseHTTPRequestHandler):
+    requested = []
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        path = unquote(url.path) + (f"?{unquote(url.query)}" if url.query else "")
+        self.requested.append(path)
+        if path not in PAGES:
+            self.send_error(404)
+            return
+        with open(os.path.join(FIXTURES, PAGES[path]), "rb") as f:
+            body = f.read()
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def wiki():
+    FakeWiki.requested = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeWiki)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def crawl(base_url, cache_dir, max_depth):
+    crawler = CategoryCrawler(cache=HttpCache(cache_dir), rate=1000, burst=100)
+    titles = asyncio.run(crawler.crawl(f"{base_url}/wiki/Kategorie:Biersorte", max_depth=max_depth))
+    return titles, crawler.stats
+
+
+def test_pagination_and_subcategory_depth(wiki, tmp_path):
+    titles, stats = crawl(wiki, tmp_path, max_depth=1)
+
+    assert stats == {"downloaded": 4, "not_modified": 0, "errors": 0}
+    assert "/wiki/Kategorie:Doppelbock" not in FakeWiki.requested  # Depth 2
+    assert titles["Altbier"] == "Biersorte"  # Listed in both, first page wins over the subcategory
+    assert titles["Märzen"] == titles["Rauchbier"] == "Biersorte"  # Second page, index.php?title=... URL
+    assert titles["Maibock"] == "Bockbier"
+    assert titles["Kölsch"] == "Obergäriges Bier"
+    assert "Triumphator" not in titles
+
+    deeper, _ = crawl(wiki, tmp_path / "deeper", max_depth=2)
+    assert deeper["Triumphator"] == "Doppelbock"
+
+
+def test_rerun_revalidates_with_etag(wiki, tmp_path):
+    first, _ = crawl(wiki, tmp_path, max_depth=1)
+    second, stats = crawl(wiki, tmp_path, max_depth=1)
+
+    assert second == first
+    assert stats == {"downloaded": 0, "not_modified": 4, "errors": 0}
+
+
+def test_category_name():
+    assert category_name("https://de.wikipedia.org/wiki/Kategorie:Oberg%C3%A4riges_Bier") == "Obergäriges Bier"
+    assert category_name("https://de.wikipedia.org/w/index.php?title=Kategorie:Deutsche_K%C3%BCche"
+                         "&pagefrom=Kn%C3%B6del#mw-pages") == "Deutsche Küche"
@@ -1,40 +1,21 @@
-import requests
-from bs4 import BeautifulSoup
+import os
+import sys
 import csv
 import re
 
-# Map for replacing German special characters
-CHAR_MAP = {
-    "ä": "ae", "ö": "oe", "ü": "ue",
-    "Ä": "Ae", "Ö": "Oe", "Ü": "Ue",
-    "ß": "ss"
-}
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "datapopulation-scripts"))
+from german_text import fold_umlauts
+from wiki_category_crawler import crawl_category
 
-def normalize(text):
-    for k, v in CHAR_MAP.items():
-        text = text.replace(k, v)
-    return text
+START_CATEGORY = "Deutsche Küche"
+MAX_DEPTH = 1  # Also collect the dishes of direct subcategories (Kategorie:Bayerische Küche, ...)
 
-def scrape_german_dishes():
-    url = "https://de.wikipedia.org/wiki/Kategorie:Deutsche_K%C3%BCche"
-    try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching data: {e}")
-        return []
-
-    soup = BeautifulSoup(response.text, "html.parser")
-    content_div = soup.find("div", id="mw-pages")
+def scrape_german_dishes(category=START_CATEGORY, max_depth=MAX_DEPTH):
     dish_names = []
-
-    if content_div:
-        for ul in content_div.find_all("ul"):
-            for li in ul.find_all("li"):
-                title = li.get_text(strip=True)
-                title = re.sub(r"\s*\[.*?\]$", "", title)  # remove footnotes if any
-                normalized_title = normalize(title)
-                dish_names.append(normalized_title)
+    for title in crawl_category(category, max_depth=max_depth):
+        title = re.sub(r"\s*\[.*?\]$", "", title)  # remove footnotes if any
+        normalized_title = fold_umlauts(title)
+        dish_names.append(normalized_title)
 
     return sorted(set(dish_names))
 
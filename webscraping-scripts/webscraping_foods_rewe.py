@@ -2,23 +2,15 @@ import csv
 import time
 import os
 import random
+import sys
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 
-# German character map for normalization
-CHAR_MAP = {
-    "ä": "ae", "ö": "oe", "ü": "ue",
-    "Ä": "Ae", "Ö": "Oe", "Ü": "Ue",
-    "ß": "ss"
-}
-
-def normalize(text):
-    for k, v in CHAR_MAP.items():
-        text = text.replace(k, v)
-    return text
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "datapopulation-scripts"))
+from german_text import fold_umlauts
 
 def setup_driver():
     chrome_options = Options()
@@ -62,7 +54,7 @@ def scrape_rewe_dishes():
         for tile in recipe_tiles:
             try:
                 link = tile.find_element(By.TAG_NAME, "a")
-                dish_name = normalize(link.text.strip())
+                dish_name = fold_umlauts(link.text.strip())
                 if dish_name:
                     if dish_name not in all_dishes:
                         print("✔ dish parsed:", dish_name)
@@ -0,0 +1,193 @@
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import time
+from urllib.parse import parse_qs, quote, unquote, urljoin, urlparse
+
+import aiohttp
+from bs4 import BeautifulSoup
+
+'''
+Async crawler for Wikipedia category pages.
+
+  - Follows category pagination ("nächste Seite") and subcategories down to
+    max_depth, with a visited set so every page is fetched once per run.
+  - Rate limiting: one token bucket per host (RATE_PER_S, BURST), shared by all
+    CONCURRENCY workers - no fixed sleeps.
+  - HTTP cache in CACHE_DIR: bodies are stored with their ETag / Last-Modified
+    and revalidated with If-None-Match / If-Modified-Since, so a rerun only
+    downloads pages that changed (304 -> cached body).
+
+    titles = crawl_category("Biersorte", max_depth=1)   # {page title: category it was found in}
+
+Set WIKI_BASE_URL to crawl a local copy instead (e.g. saved category pages
+served with "python -m http.server", which answers If-Modified-Since).
+'''
+
+# === CONFIG ===
+BASE_URL = os.environ.get("WIKI_BASE_URL", "https://de.wikipedia.org")
+CACHE_DIR = os.environ.get("WIKI_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".http-cache"))
+RATE_PER_S = float(os.environ.get("WIKI_RATE_PER_S", "2"))  # Sustained requests per second per host
+BURST = 4  # Requests a host may get back to back
+CONCURRENCY = 4
+TIMEOUT_S = 20
+USER_AGENT = "GermanCuisineKG-crawler/1.0 (https://github.com/mfnomad/German-Cuisine-Knowledge-Graph)"
+NEXT_PAGE_TEXT = "nächste Seite"
+
+
+class TokenBucket:
+    """Allow `rate` acquisitions per second on average and up to `burst` at once."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HttpCache:
+    """url -> (validators, body) on disk, one .html and one .json file per URL."""
+
+    def __init__(self, path=CACHE_DIR):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _files(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.path, key + ".html"), os.path.join(self.path, key + ".json")
+
+    def get(self, url):
+        body_path, meta_path = self._files(url)
+        if not (os.path.exists(body_path) and os.path.exists(meta_path)):
+            return None, None
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(body_path, encoding="utf-8") as f:
+            return meta, f.read()
+
+    def put(self, url, headers, body):
+        body_path, meta_path = self._files(url)
+        with open(body_path, "w", encoding="utf-8") as f:
+            f.write(body)
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump({"url": url, "etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified")}, f)
+
+
+def category_url(name):
+    return f"{BASE_URL}/wiki/Kategorie:{quote(name.replace(' ', '_'))}"
+
+
+def category_name(url):
+    """Category of a category page URL, also for paginated /w/index.php?title=Kategorie:X&pagefrom=... URLs."""
+    parsed = urlparse(url)
+    title = parse_qs(parsed.query).get("title", [""])[0] or unquote(parsed.path.rsplit("/", 1)[-1])
+    return title.split(":", 1)[-1].replace("_", " ")
+
+
+def parse_category(html, url):
+    """(page titles, subcategory urls, next-page urls) of one category page."""
+    soup = BeautifulSoup(html, "html.parser")
+    pages = [a.get_text(strip=True) for a in soup.select("#mw-pages li a")]
+    subcategories = [urljoin(url, a["href"]) for a in soup.select("#mw-subcategories a[href]")
+                     if "/wiki/Kategorie:" in a["href"]]
+    next_pages = [urljoin(url, a["href"]) for a in soup.find_all("a", string=NEXT_PAGE_TEXT) if a.get("href")]
+    return [p for p in pages if p], subcategories, next_pages
+
+
+class CategoryCrawler:
+    def __init__(self, cache=None, rate=RATE_PER_S, burst=BURST, concurrency=CONCURRENCY):
+        self.cache = cache or HttpCache()
+        self.rate, self.burst, self.concurrency = rate, burst, concurrency
+        self.buckets = {}  # host -> TokenBucket
+        self.stats = {"downloaded": 0, "not_modified": 0, "errors": 0}
+
+    async def fetch(self, session, url):
+        """Page body, revalidated against the cache; None on errors."""
+        meta, cached = self.cache.get(url)
+        headers = {}
+        if meta:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        host = urlparse(url).netloc
+        bucket = self.buckets.setdefault(host, TokenBucket(self.rate, self.burst))
+        await bucket.acquire()
+        try:
+            async with session.get(url, headers=headers) as response:
+                if response.status == 304 and cached is not None:
+                    self.stats["not_modified"] += 1
+                    return cached
+                response.raise_for_status()
+                body = await response.text()
+                self.cache.put(url, response.headers, body)
+                self.stats["downloaded"] += 1
+                return body
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"❌ {url}: {e}")
+            self.stats["errors"] += 1
+            return None
+
+    async def crawl(self, start_url, max_depth=1):
+        """{page title: category name} for a category and its subcategories down to max_depth."""
+        queue = asyncio.Queue()
+        visited = {start_url}
+        titles = {}
+        queue.put_nowait((start_url, 0))
+
+        async def worker(session):
+            while True:
+                url, depth = await queue.get()
+                try:
+                    html = await self.fetch(session, url)
+                    if html is None:
+                        continue
+                    pages, subcategories, next_pages = parse_category(html, url)
+                    category = category_name(url)
+                    for title in pages:
+                        titles.setdefault(title, category)
+                    follow = [(u, depth) for u in next_pages]
+                    if depth < max_depth:
+                        follow += [(u, depth + 1) for u in subcategories]
+                    for next_url, next_depth in follow:
+                        if next_url not in visited:
+                            visited.add(next_url)
+                            queue.put_nowait((next_url, next_depth))
+                finally:
+                    queue.task_done()
+
+        timeout = aiohttp.ClientTimeout(total=TIMEOUT_S)
+        async with aiohttp.ClientSession(timeout=timeout, headers={"User-Agent": USER_AGENT}) as session:
+            workers = [asyncio.create_task(worker(session)) for _ in range(self.concurrency)]
+            await queue.join()
+            for task in workers:
+                task.cancel()
+        print(f"🕸️ {len(visited)} category pages, {len(titles)} titles "
+              f"({self.stats['downloaded']} downloaded, {self.stats['not_modified']} unchanged, "
+              f"{self.stats['errors']} errors)")
+        return titles
+
+
+def crawl_category(name, max_depth=1):
+    """Blocking entry point for the scraping scripts."""
+    return asyncio.run(CategoryCrawler().crawl(category_url(name), max_depth=max_depth))
+
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or ["Biersorte"]:
+        for title, category in sorted(crawl_category(name).items()):
+            print(f"{title}  ({category})")